@@ -1,24 +1,30 @@
 from os import getenv
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
-from models import db, Ticket, Classifications, Diagnostics, Solutions, Workflow_log, User
-from anthropic import Anthropic
+from flask import Flask, Response, request, stream_with_context
+from models import db, Ticket, Workflow_log
 from redis_client import RedisDB
-from overseer import Overseer
+from job_queue import JobStatus, RedisJobQueue
 from flask_cors import CORS
-from models import TicketAssignments
+from pagination import (
+    DEFAULT_PAGE_SIZE, paginate_tickets, parse_fields, parse_limit, relations_for,
+    stream_tickets_ndjson
+)
+from serializers import configure_json, serialize_list_item, serialize_ticket_detail
+from conditional import conditional_response, listing_validators, ticket_validators
+from change_feed import DEFAULT_FEED_LIMIT, fetch_changes, start_cursor
 
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)
+configure_json(app)
 app.config['SQLALCHEMY_DATABASE_URI'] = getenv('DATABASE_URL')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 
-anthropic_client = Anthropic(api_key=getenv('ANTHROPIC_API_KEY'))
+# The agent pipeline runs in worker processes (see worker.py)
 redis_client = RedisDB(getenv('REDIS_URL'))
-overseer = Overseer(anthropic_client, redis_client)
+job_queue = RedisJobQueue(redis_client)
 
 
 # Create tables
@@ -30,234 +36,149 @@ with app.app_context():
 @app.route('/api/tickets', methods=['GET', 'POST'])
 def tickets():
     if request.method == 'GET':
-        # Fetch all tickets with related data
-        all_tickets = Ticket.query.order_by(Ticket.created_at.desc()).all()
-        tickets_data = []
-
-        for ticket in all_tickets:
-            classification = Classifications.query.filter_by(ticket_id=ticket.id).first()
-            diagnostic = Diagnostics.query.filter_by(ticket_id=ticket.id).first()
-            solution = Solutions.query.filter_by(ticket_id=ticket.id).first()
-
-            # Fetch assignments with user details
-            assignments = TicketAssignments.query.filter_by(ticket_id=ticket.id).all()
-            assigned_people = []
-            for assignment in assignments:
-                user = db.session.get(User, assignment.user_id)
-                if user:
-                    assigned_people.append({
-                        "role": assignment.role,
-                        "name": user.name,
-                        "email": user.email,
-                        "specialization": user.specialization,
-                        "tier_level": user.tier_level,
-                        "assigned_at": assignment.assigned_at.isoformat()
-                    })
-
-            ticket_data = {
-                "id": ticket.id,
-                "user_email": ticket.user_email,
-                "subject": ticket.subject,
-                "description": ticket.description,
-                "status": ticket.status.value,
-                "created_at": ticket.created_at.isoformat(),
-                "updated_at": ticket.updated_at.isoformat(),
-                "classification": {
-                    "category": classification.category,
-                    "urgency": classification.urgency,
-                    "expertise_level": classification.expertise_level,
-                    "reasoning": classification.reasoning
-                } if classification else None,
-                "diagnosis": {
-                    "diagnosis": diagnostic.diagnosis,
-                    "potential_causes": diagnostic.potential_causes,
-                    "recommended_tests": diagnostic.recommended_tests
-                } if diagnostic else None,
-                "solution": {
-                    "solution": solution.solution,
-                    "tools_needed": solution.tools_needed,
-                    "estimated_time": solution.estimated_time,
-                    "confidence": solution.confidence
-                } if solution else None,
-                "assigned_people": assigned_people
-            }
-            tickets_data.append(ticket_data)
-
-        return jsonify(tickets_data), 200
+        try:
+            fields = parse_fields(request.args.get('fields'))
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # Only load the relationships the requested fields need
+        relations = relations_for(fields)
+        query = Ticket.with_details(relations)
+
+        cursor = request.args.get('cursor')
+        if limit is None and cursor is None:
+            # Unpaginated listing (kept for existing dashboard clients)
+            all_tickets = query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).all()
+            etag, last_modified = listing_validators(all_tickets, relations, fields)
+            return conditional_response(
+                lambda: [serialize_list_item(t, fields) for t in all_tickets], etag, last_modified
+            )
+
+        try:
+            page, next_cursor = paginate_tickets(query, limit or DEFAULT_PAGE_SIZE, cursor)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        etag, last_modified = listing_validators(page, relations, fields, cursor, next_cursor)
+        return conditional_response(lambda: {
+            "tickets": [serialize_list_item(t, fields) for t in page],
+            "next_cursor": next_cursor
+        }, etag, last_modified)
 
     # POST method - create ticket
+    return create_ticket()
+
+
 def create_ticket():
-    data = request.get_json()
+    """Persist the raw ticket and queue it for pipeline processing"""
+    data = request.get_json(silent=True)
     if not data or not all(k in data for k in ('user_email', 'subject', 'description')):
         return {"error": "Invalid input"}, 400
 
-    # Process ticket through overseer
-    overseer_result = overseer.process_ticket(data)
-    if not overseer_result or "error" in overseer_result:
-        return {"error": "Failed to process ticket"}, 500
-
-    # Extract results
-    intake_result = overseer_result["intake_result"]
-    classification_result = overseer_result["classification"]
-    diagnosis_result = overseer_result["diagnosis"]
-    fetch_result = overseer_result["fetched_data"]
-    solution_result = overseer_result["solution"]
-    workflow_log = overseer_result["workflow_log"]
-
     try:
-        # Create ticket with cleaned data from intake
         ticket = Ticket(
             id=Ticket.generate_id(),
-            user_email=intake_result['user_email'],
-            subject=intake_result['subject'],
-            description=intake_result['description']
+            user_email=data['user_email'],
+            subject=data['subject'],
+            description=data['description']
         )
         db.session.add(ticket)
-        db.session.flush()
-        
-        # Create classification
-        classification = Classifications(
-            ticket_id=ticket.id,
-            category=classification_result["category"],
-            urgency=classification_result["urgency"],
-            expertise_level=classification_result["expertise_level"],
-            reasoning=classification_result["reasoning"]
-        )
-        db.session.add(classification)
-        
-        # Create diagnostic
-        diagnostic = Diagnostics(
-            ticket_id=ticket.id,
-            diagnosis=diagnosis_result["diagnosis"],
-            potential_causes=diagnosis_result["potential_causes"],
-            recommended_tests=diagnosis_result["recommended_tests"]
-        )
-        db.session.add(diagnostic)
-        
-        # Create solution
-        solution = Solutions(
-            ticket_id=ticket.id,
-            solution=solution_result["solution"],
-            tools_needed=solution_result["tools_needed"],
-            estimated_time=solution_result["estimated_time"],
-            confidence=solution_result["confidence"]
-        )
-        db.session.add(solution)
-
-        assignments = overseer_result.get("assignments", {})
-        if assignments.get('primary'):
-            primary_assignment = TicketAssignments(
-                ticket_id=ticket.id,
-                user_id=assignments['primary']['user_id'],
-                role='primary'
-            )
-            db.session.add(primary_assignment)
-
-        if assignments.get('secondary'):
-            secondary_assignment = TicketAssignments(
-                ticket_id=ticket.id,
-                user_id=assignments['secondary']['user_id'],
-                role='secondary'
-            )
-            db.session.add(secondary_assignment)
-    
-        # Create workflow log
-        log = Workflow_log(
-            ticket_id=ticket.id,
-            log_entries=workflow_log
-        )
-        db.session.add(log)
-        
-        # Commit all changes
         db.session.commit()
-
-        # Store in Redis for learning
-        redis_client.store_resolution(
-            ticket_id=ticket.id,
-            category=classification_result["category"],
-            solution=solution_result["solution"],
-            success=True
-        )
-        
     except Exception as e:
         db.session.rollback()
         print(f"Error: {e}")
         return {"error": "Database error"}, 500
-    
+
+    # Tell change-feed clients about the new ticket
+    redis_client.publish_ticket_events([{"ticket_id": ticket.id, "event": "created"}])
+
+    # Agents run in worker processes (see worker.py)
+    job_id = job_queue.enqueue({
+        "ticket_id": ticket.id,
+        "ticket": {
+            "user_email": data['user_email'],
+            "subject": data['subject'],
+            "description": data['description']
+        }
+    })
+    if not job_id:
+        return {"error": "Failed to queue ticket", "ticket_id": ticket.id}, 503
+
     return {
         "success": True,
         "ticket_id": ticket.id,
-        "status": "processed",
-        "summary": {
-            "category": classification_result['category'],
-            "urgency": classification_result['urgency'],
-            "solution_preview": solution_result['solution'][:100] + "..."
-        }
-    }, 201
+        "job_id": job_id,
+        "status": JobStatus.QUEUED,
+        "status_url": f"/api/jobs/{job_id}"
+    }, 202
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def fetch_job(job_id):
+    """Poll the pipeline status of a submitted ticket"""
+    job = job_queue.get_status(job_id)
+    if not job:
+        return {"error": "Job not found"}, 404
+    return job, 200
+
+
+@app.route('/api/tickets/export', methods=['GET'])
+def export_tickets():
+    """Stream every ticket as NDJSON without materializing the full table"""
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    query = Ticket.with_details(relations_for(fields))
+    return Response(
+        stream_with_context(stream_tickets_ndjson(query, fields)),
+        mimetype='application/x-ndjson'
+    )
+
+
+@app.route('/api/tickets/changes', methods=['GET'])
+def ticket_changes():
+    """Tickets created or updated since a change-feed cursor"""
+    try:
+        fields = parse_fields(request.args.get('fields'))
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    cursor = request.args.get('cursor')
+    if cursor is None:
+        # New session: position the client at "now"
+        return {"tickets": [], "cursor": start_cursor(redis_client), "has_more": False}, 200
+
+    try:
+        changes = fetch_changes(
+            cursor, fields, relations_for(fields),
+            limit=DEFAULT_FEED_LIMIT if limit is None else limit,
+            redis_db=redis_client
+        )
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return changes, 200
 
 
 @app.route('/api/tickets/<ticket_id>', methods=['GET'])
 def fetch_ticket(ticket_id):
-    ticket = db.session.get(Ticket, ticket_id)
-    if not ticket:
+    # Version check first so an unchanged ticket costs one small query
+    validators = ticket_validators(ticket_id)
+    if not validators:
         return {"error": "Ticket not found"}, 404
+    etag, last_modified = validators
 
-    # Fetch related data
-    classification = Classifications.query.filter_by(ticket_id=ticket_id).first()
-    diagnostic = Diagnostics.query.filter_by(ticket_id=ticket_id).first()
-    solution = Solutions.query.filter_by(ticket_id=ticket_id).first()
-    log = Workflow_log.query.filter_by(ticket_id=ticket_id).first()
-
-    # Fetch assignments with user details
-    assignments = TicketAssignments.query.filter_by(ticket_id=ticket_id).all()
-    assigned_people = []
-    for assignment in assignments:
-        user = db.session.get(User, assignment.user_id)
-        if user:
-            assigned_people.append({
-                "role": assignment.role,
-                "name": user.name,
-                "email": user.email,
-                "specialization": user.specialization,
-                "tier_level": user.tier_level,
-                "assigned_at": assignment.assigned_at.isoformat()
-            })
+    def build_body():
+        # Related data is loaded with the ticket
+        ticket = Ticket.with_details().filter(Ticket.id == ticket_id).first()
+        log = Workflow_log.query.filter_by(ticket_id=ticket_id).first()
+        return serialize_ticket_detail(ticket, log)
+
+    return conditional_response(build_body, etag, last_modified)
 
-    return {
-        "id": ticket.id,
-        "user_email": ticket.user_email,
-        "subject": ticket.subject,
-        "description": ticket.description,
-        "status": ticket.status.value,
-        "created_at": ticket.created_at.isoformat(),
-        "updated_at": ticket.updated_at.isoformat(),
-        "classification": {
-            "category": classification.category if classification else None,
-            "urgency": classification.urgency if classification else None,
-            "expertise_level": classification.expertise_level if classification else None,
-            "reasoning": classification.reasoning if classification else None,
-            "created_at": classification.created_at.isoformat() if classification else None,
-            "updated_at": classification.updated_at.isoformat() if classification else None
-        } if classification else None,
-        "diagnosis": {
-            "diagnosis": diagnostic.diagnosis if diagnostic else None,
-            "potential_causes": diagnostic.potential_causes if diagnostic else None,
-            "recommended_tests": diagnostic.recommended_tests if diagnostic else None,
-            "created_at": diagnostic.created_at.isoformat() if diagnostic else None,
-            "updated_at": diagnostic.updated_at.isoformat() if diagnostic else None
-        } if diagnostic else None,
-        "solution": {
-            "solution": solution.solution if solution else None,
-            "tools_needed": solution.tools_needed if solution else None,
-            "estimated_time": solution.estimated_time if solution else None,
-            "confidence": solution.confidence if solution else None,
-            "created_at": solution.created_at.isoformat() if solution else None,
-            "updated_at": solution.updated_at.isoformat() if solution else None
-        } if solution else None,
-        "assigned_people": assigned_people,
-        "workflow_log": log.log_entries if log else []
-    }
-    
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -10,18 +10,303 @@ Design Principles:
 - Testability: Pure functions, no side effects
 - Observability: Comprehensive logging of assignment decisions
 - Performance: Efficient queries, minimal database hits
+
+Rules resolve against an in-memory StaffRoster instead of querying the
+database, so assigning a ticket is a pure in-process lookup. The roster is
+reloaded when users change in this process and at least every
+ROSTER_TTL seconds to pick up changes made elsewhere.
+
+Workload: the roster tracks each user's open assignments (tickets that are
+open or in progress). Rules pick the least-loaded eligible user below their
+tier's capacity; if every eligible user is full the engine overflows to the
+least-loaded user regardless of capacity rather than leave a ticket
+unassigned. A pick is held as a claim until its TicketAssignments rows are
+committed, when it becomes workload; a rolled back save or a failed
+pipeline (release_assignments) drops the claim.
 """
 
-from models import User, db
+from models import User, Ticket, TicketAssignments, TicketStatus, db
+from location_parser import building_for_floor, parse_location
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+from collections import Counter
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
+import threading
+import time
+import weakref
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Wildcard for StaffRoster lookups
+ANY = object()
+
+# Values precompiled into the decision table; unseen combinations are
+# planned per ticket without being stored
+DEVICE_TYPES = (None, 'phone', 'printer')
+CATEGORIES = ('hardware', 'software', 'network', 'access')
+URGENCIES = ('low', 'medium', 'high', 'critical')
+EXPERTISE_LEVELS = ('tier1', 'tier2', 'tier3')
+
+# Tickets in these states count toward their assignees' workload
+OPEN_STATUSES = (TicketStatus.OPEN, TicketStatus.IN_PROGRESS)
+
+# Maximum open assignments per tier before a user is skipped
+TIER_CAPACITY = {
+    'tier1': 8,
+    'tier2': 6,
+    'tier3': 4
+}
+
+# Bumped whenever a User row is written; rosters reload when it changes
+_roster_version = 0
+
+# Live rosters, so committed status changes can adjust their workloads
+_rosters = weakref.WeakSet()
+
+
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_rosters(mapper, connection, target):
+    global _roster_version
+    _roster_version += 1
+
+
+@event.listens_for(Ticket, 'before_update')
+def _track_status_change(mapper, connection, target):
+    """Queue workload changes when a ticket moves between open and closed states"""
+    history = db.inspect(target).attrs.status.history
+    if not history.added:
+        return
+    if history.deleted:
+        old_status = history.deleted[0]
+    else:
+        # Status was set without being loaded first; read the stored value
+        old_status = connection.execute(
+            select(Ticket.status).where(Ticket.id == target.id)
+        ).scalar()
+    was_open = old_status in OPEN_STATUSES
+    is_open = history.added[0] in OPEN_STATUSES
+    if was_open == is_open:
+        return
+
+    user_ids = connection.execute(
+        select(TicketAssignments.user_id).where(TicketAssignments.ticket_id == target.id)
+    ).scalars()
+    # Applied on commit, dropped on rollback
+    deltas = object_session(target).info.setdefault('workload_deltas', Counter())
+    for user_id in user_ids:
+        deltas[user_id] += 1 if is_open else -1
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_new_assignments(orm_execute_state):
+    """Queue workload for TicketAssignments rows written with a bulk INSERT"""
+    if not orm_execute_state.is_insert:
+        return
+    if orm_execute_state.bind_mapper is not TicketAssignments.__mapper__:
+        return
+    rows = orm_execute_state.parameters
+    if not rows:
+        return
+    if isinstance(rows, dict):
+        rows = [rows]
+
+    # Applied on commit; the claims taken when the users were picked are
+    # released either way
+    user_ids = Counter(row['user_id'] for row in rows)
+    orm_execute_state.session.info.setdefault('workload_deltas', Counter()).update(user_ids)
+    orm_execute_state.session.info.setdefault('workload_claims', Counter()).update(user_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_workload_deltas(session):
+    deltas = session.info.pop('workload_deltas', None)
+    claims = session.info.pop('workload_claims', None)
+    for roster in list(_rosters):
+        if deltas:
+            roster.adjust_loads(deltas)
+        if claims:
+            roster.release(claims)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_workload_deltas(session):
+    session.info.pop('workload_deltas', None)
+    claims = session.info.pop('workload_claims', None)
+    if claims:
+        for roster in list(_rosters):
+            roster.release(claims)
+
+
+class StaffMember:
+    """Detached snapshot of a User row, safe to share across sessions/threads"""
+    __slots__ = ('user_id', 'name', 'email', 'role', 'specialization', 'tier_level', 'building')
+
+    def __init__(self, user: User):
+        for attr in self.__slots__:
+            setattr(self, attr, getattr(user, attr))
+
+
+class StaffRoster:
+    """
+    In-memory index of IT staff keyed by (specialization, tier_level, building)
+
+    Every member is indexed under all wildcard combinations of the key, so
+    any lookup the rules need is a dict access. Open assignment counts are
+    loaded alongside the roster and then maintained incrementally: +1 when
+    a user's assignment is committed, -1/+1 when a committed status change
+    closes or reopens one of their tickets. Picks not yet committed are
+    held as claims and count toward load in the meantime; a reload drops
+    them, so a claim that is never settled only lasts until the next one.
+    """
+
+    # Reload at least every 5 minutes (in seconds); also reconciles workloads
+    ROSTER_TTL = 5 * 60
+
+    def __init__(self, ttl: int = ROSTER_TTL, capacity: Optional[Dict[str, int]] = None):
+        self.ttl = ttl
+        self.capacity = dict(TIER_CAPACITY if capacity is None else capacity)
+        self._index: Dict[Tuple, List[StaffMember]] = {}
+        self._loads: Counter = Counter()
+        self._claims: Counter = Counter()
+        self._version = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        _rosters.add(self)
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup"""
+        self._version = None
+
+    def is_stale(self) -> bool:
+        return (
+            self._version != _roster_version
+            or time.monotonic() - self._loaded_at > self.ttl
+        )
+
+    def refresh(self) -> None:
+        """Reload the roster if users changed or the TTL elapsed (needs an app context)"""
+        if not self.is_stale():
+            return
+        with self._lock:
+            if not self.is_stale():
+                return
+            version = _roster_version
+            members = [StaffMember(user) for user in User.query.order_by(User.user_id).all()]
+            # Semi-join so both sides stay on covering indexes
+            open_tickets = select(Ticket.id).where(Ticket.status.in_(OPEN_STATUSES))
+            loads = Counter(dict(
+                db.session.query(TicketAssignments.user_id, db.func.count(TicketAssignments.id))
+                .filter(TicketAssignments.ticket_id.in_(open_tickets))
+                .group_by(TicketAssignments.user_id)
+                .all()
+            ))
+
+            index: Dict[Tuple, List[StaffMember]] = {}
+            for member in members:
+                for specialization in (member.specialization, ANY):
+                    for tier_level in (member.tier_level, ANY):
+                        for building in (member.building, ANY):
+                            key = (specialization, tier_level, building)
+                            index.setdefault(key, []).append(member)
+
+            # Swap in one assignment so concurrent readers see old or new, never partial
+            self._index = index
+            self._loads = loads
+            # Committed picks are now in loads; any claim still open is at
+            # worst one in-flight ticket that goes uncounted until it commits
+            self._claims = Counter()
+            self._version = version
+            self._loaded_at = time.monotonic()
+            logger.info(f"StaffRoster: Loaded {len(members)} staff members")
+
+    def load(self, user_id: int) -> int:
+        """Open assignments held by a user, including uncommitted claims"""
+        return self._loads[user_id] + self._claims[user_id]
+
+    def adjust_loads(self, deltas: Dict[int, int]) -> None:
+        with self._lock:
+            for user_id, delta in deltas.items():
+                self._loads[user_id] = max(0, self._loads[user_id] + delta)
+
+    def claim(self, user_ids: Dict[int, int]) -> None:
+        """Count picks toward load until their assignments are committed"""
+        with self._lock:
+            self._claims.update(user_ids)
+
+    def release(self, user_ids: Dict[int, int]) -> None:
+        with self._lock:
+            for user_id, count in user_ids.items():
+                self._claims[user_id] = max(0, self._claims[user_id] - count)
+
+    def has_capacity(self, member: StaffMember) -> bool:
+        limit = self.capacity.get(member.tier_level)
+        return limit is None or self.load(member.user_id) < limit
+
+    def pick(self, specialization=ANY, tiers=None, building=ANY,
+             enforce_capacity: bool = True) -> Optional[StaffMember]:
+        """
+        Least-loaded member matching the filters (ties go to the lowest user_id)
+
+        Args:
+            specialization: Required specialization (ANY to ignore)
+            tiers: Acceptable tier levels (None to ignore)
+            building: Required building (ANY to ignore)
+            enforce_capacity: Skip members at their tier's capacity
+        """
+        index = self._index
+        candidates = [
+            member
+            for key in ((specialization, tier, building) for tier in (tiers or [ANY]))
+            for member in index.get(key, ())
+            if not enforce_capacity or self.has_capacity(member)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda m: (self.load(m.user_id), m.user_id))
+
+    def pick_first(self, queries: List[Tuple],
+                   enforce_capacity: bool = True) -> Optional[StaffMember]:
+        """First successful pick from (specialization, tiers, building) queries"""
+        for specialization, tiers, building in queries:
+            member = self.pick(specialization, tiers, building, enforce_capacity)
+            if member:
+                return member
+        return None
+
+    def ignoring_capacity(self) -> "OverflowRoster":
+        """View of this roster whose picks ignore capacity limits"""
+        return OverflowRoster(self)
+
+
+class OverflowRoster:
+    """StaffRoster view used when every eligible user is at capacity"""
+
+    def __init__(self, roster: StaffRoster):
+        self.roster = roster
+
+    def pick(self, specialization=ANY, tiers=None, building=ANY) -> Optional[StaffMember]:
+        return self.roster.pick(specialization, tiers, building, enforce_capacity=False)
+
+    def pick_first(self, queries: List[Tuple]) -> Optional[StaffMember]:
+        return self.roster.pick_first(queries, enforce_capacity=False)
+
 
 class AssignmentRule:
-    """Base class for assignment rules - Strategy Pattern"""
+    """
+    Base class for assignment rules - Strategy Pattern
+    
+    Rules that set `table_compatible = True` promise that matches() and
+    candidate_queries() depend only on the TABLE_KEY fields (device_type,
+    category, urgency, expertise_level). The engine then evaluates them once
+    per key at startup; other rules run matches()/get_user() per ticket.
+    """
+    table_compatible = False
+    
     def __init__(self, priority: int):
         self.priority = priority  # Lower number = higher priority
     
@@ -29,48 +314,47 @@ class AssignmentRule:
         """Check if this rule applies to the ticket"""
         raise NotImplementedError
     
-    def get_user(self, ticket_data: Dict) -> Optional[User]:
-        """Return the user to assign based on this rule"""
+    def candidate_queries(self, ticket_data: Dict) -> List[Tuple]:
+        """Roster lookups to try in order, as (specialization, tiers, building) tuples"""
         raise NotImplementedError
+    
+    def get_user(self, ticket_data: Dict, roster: StaffRoster) -> Optional[StaffMember]:
+        """Return the staff member to assign based on this rule"""
+        return roster.pick_first(self.candidate_queries(ticket_data))
 
 
 class DeviceSpecialistRule(AssignmentRule):
     """Assign based on specific device type - Highest Priority"""
+    table_compatible = True
+    
+    # Map device types to specializations
+    DEVICE_SPECIALIZATIONS = {
+        'phone': 'phones',
+        'printer': 'printers'
+    }
+    
     def __init__(self):
         super().__init__(priority=1)
     
     def matches(self, ticket_data: Dict) -> bool:
         device_type = ticket_data.get('extracted_info', {}).get('device_type')
-        return device_type in ['phone', 'printer']
+        return device_type in self.DEVICE_SPECIALIZATIONS
     
-    def get_user(self, ticket_data: Dict) -> Optional[User]:
+    def candidate_queries(self, ticket_data: Dict) -> List[Tuple]:
         device_type = ticket_data.get('extracted_info', {}).get('device_type')
-        
-        # Map device types to specializations
-        specialization_map = {
-            'phone': 'phones',
-            'printer': 'printers'
-        }
-        
-        specialization = specialization_map.get(device_type)
+        specialization = self.DEVICE_SPECIALIZATIONS.get(device_type)
         if not specialization:
-            return None
+            return []
         
         # Find available specialist with appropriate tier
         tier_level = ticket_data.get('classification', {}).get('expertise_level', 'tier1')
-        
-        user = User.query.filter_by(
-            specialization=specialization
-        ).filter(
-            User.tier_level.in_([tier_level, 'tier2', 'tier3'])
-        ).first()
-        
-        logger.info(f"DeviceSpecialistRule: Assigned {user.name if user else 'None'} for {device_type}")
-        return user
+        return [(specialization, (tier_level, 'tier2', 'tier3'), ANY)]
 
 
 class CategorySpecialistRule(AssignmentRule):
     """Assign based on ticket category - Second Priority"""
+    table_compatible = True
+    
     def __init__(self):
         super().__init__(priority=2)
     
@@ -78,18 +362,16 @@ class CategorySpecialistRule(AssignmentRule):
         category = ticket_data.get('classification', {}).get('category')
         return category in ['network', 'software', 'hardware']
     
-    def get_user(self, ticket_data: Dict) -> Optional[User]:
-        category = ticket_data.get('classification', {}).get('category')
-        
+    def candidate_queries(self, ticket_data: Dict) -> List[Tuple]:
         # Direct mapping for most categories
-        user = User.query.filter_by(specialization=category).first()
-        
-        logger.info(f"CategorySpecialistRule: Assigned {user.name if user else 'None'} for {category}")
-        return user
+        category = ticket_data.get('classification', {}).get('category')
+        return [(category, None, ANY)]
 
 
 class UrgencyEscalationRule(AssignmentRule):
     """For critical tickets, assign senior engineers - Third Priority"""
+    table_compatible = True
+    
     def __init__(self):
         super().__init__(priority=3)
     
@@ -97,52 +379,35 @@ class UrgencyEscalationRule(AssignmentRule):
         urgency = ticket_data.get('classification', {}).get('urgency')
         return urgency in ['critical', 'high']
     
-    def get_user(self, ticket_data: Dict) -> Optional[User]:
+    def candidate_queries(self, ticket_data: Dict) -> List[Tuple]:
         category = ticket_data.get('classification', {}).get('category')
-        
-        # Find senior (tier2+) specialist in relevant category
-        user = User.query.filter_by(
-            specialization=category
-        ).filter(
-            User.tier_level.in_(['tier2', 'tier3'])
-        ).order_by(
-            User.tier_level.desc()
-        ).first()
-        
-        # Fallback to any senior engineer
-        if not user:
-            user = User.query.filter(
-                User.tier_level.in_(['tier2', 'tier3'])
-            ).first()
-        
-        logger.info(f"UrgencyEscalationRule: Assigned senior {user.name if user else 'None'}")
-        return user
+        return [
+            # Senior (tier2+) specialist in relevant category, most senior first
+            (category, ('tier3',), ANY),
+            (category, ('tier2',), ANY),
+            # Fallback to any senior engineer
+            (ANY, ('tier2', 'tier3'), ANY)
+        ]
 
 
 class GeneralITRule(AssignmentRule):
     """Default fallback - assign general IT support"""
+    table_compatible = True
+    
     def __init__(self):
         super().__init__(priority=999)  # Lowest priority
     
     def matches(self, ticket_data: Dict) -> bool:
         return True  # Always matches as fallback
     
-    def get_user(self, ticket_data: Dict) -> Optional[User]:
-        # Find general IT with appropriate tier level
+    def candidate_queries(self, ticket_data: Dict) -> List[Tuple]:
         tier_level = ticket_data.get('classification', {}).get('expertise_level', 'tier1')
-        
-        user = User.query.filter_by(
-            specialization='general'
-        ).filter(
-            User.tier_level == tier_level
-        ).first()
-        
-        # Fallback to any general IT
-        if not user:
-            user = User.query.filter_by(specialization='general').first()
-        
-        logger.info(f"GeneralITRule: Assigned {user.name if user else 'None'} as fallback")
-        return user
+        return [
+            # General IT with appropriate tier level
+            ('general', (tier_level,), ANY),
+            # Fallback to any general IT
+            ('general', None, ANY)
+        ]
 
 
 class BuildingSupportRule(AssignmentRule):
@@ -151,40 +416,19 @@ class BuildingSupportRule(AssignmentRule):
         super().__init__(priority=1)
     
     def matches(self, ticket_data: Dict) -> bool:
-        location = ticket_data.get('extracted_info', {}).get('location', '')
-        if not location:
-            return False
-        return 'building' in location.lower() or 'floor' in location.lower()
-    
-    def get_user(self, ticket_data: Dict) -> Optional[User]:
-        location = ticket_data.get('extracted_info', {}).get('location', '')
-        if not location:
-            return None
-        # Extract building identifier (e.g., "3rd floor" -> "building3")
-        # Simple heuristic - can be made more sophisticated
-        building = None
-        if 'building' in location.lower():
-            # Extract building number/name
-            parts = location.lower().split()
-            for i, part in enumerate(parts):
-                if 'building' in part and i + 1 < len(parts):
-                    building = f"building{parts[i+1]}"
-                    break
-        elif 'floor' in location.lower():
-            # Assume floor numbers map to buildings (floor 1-3 = building1, etc.)
-            for char in location:
-                if char.isdigit():
-                    building = f"building{char}"
-                    break
-        
-        if not building:
-            return None
+        building, floor = parse_location(ticket_data.get('extracted_info', {}).get('location'))
+        return building is not None or floor is not None
+    
+    def get_user(self, ticket_data: Dict, roster: StaffRoster) -> Optional[StaffMember]:
+        building, floor = parse_location(ticket_data.get('extracted_info', {}).get('location'))
+        if building is None:
+            if floor is None:
+                return None
+            # No building named - assume floor numbers map to buildings
+            building = building_for_floor(floor)
         
         # Find general IT assigned to that building
-        user = User.query.filter_by(
-            specialization='general',
-            building=building
-        ).first()
+        user = roster.pick('general', building=building)
         
         logger.info(f"BuildingSupportRule: Assigned {user.name if user else 'None'} for {building}")
         return user
@@ -198,9 +442,21 @@ class AssignmentEngine:
     - Each rule evaluates independently
     - First matching rule wins for primary assignment
     - Secondary assignment uses separate rule set
+    - Within a rule, the least-loaded eligible user wins
+    
+    Primary rules are compiled into a decision table keyed by
+    (device_type, category, urgency, expertise_level): each entry holds the
+    matching rules' roster queries in priority order, so a ticket's
+    candidate list is one dict lookup. Keys outside the known vocabularies
+    (free-text values from the classifier) are planned per ticket and not
+    stored, so the table stays a fixed size.
     """
     
-    def __init__(self):
+    def __init__(self, roster: Optional[StaffRoster] = None):
+        self.roster = roster or StaffRoster()
+        # Pick + claim must be atomic so concurrent tickets spread out
+        self._lock = threading.Lock()
+        
         # Primary assignment rules (ordered by priority)
         self.primary_rules = [
             DeviceSpecialistRule(),
@@ -217,28 +473,86 @@ class AssignmentEngine:
         # Sort rules by priority
         self.primary_rules.sort(key=lambda r: r.priority)
         self.secondary_rules.sort(key=lambda r: r.priority)
+        
+        self.compile_rules()
     
-    def assign_primary(self, ticket_data: Dict) -> Optional[User]:
+    def compile_rules(self) -> None:
+        """(Re)build the decision table; call after changing primary_rules"""
+        self._decision_table: Dict[Tuple, Tuple] = {}
+        for device_type in DEVICE_TYPES:
+            for category in CATEGORIES:
+                for urgency in URGENCIES:
+                    for expertise_level in EXPERTISE_LEVELS:
+                        key = (device_type, category, urgency, expertise_level)
+                        self._decision_table[key] = self._compile_key(key)
+    
+    @staticmethod
+    def table_key(ticket_data: Dict) -> Tuple:
+        classification = ticket_data.get('classification', {})
+        return (
+            ticket_data.get('extracted_info', {}).get('device_type'),
+            classification.get('category'),
+            classification.get('urgency'),
+            classification.get('expertise_level', 'tier1')
+        )
+    
+    def _compile_key(self, key: Tuple) -> Tuple:
+        """
+        Plan for one key: (rule, queries) in priority order
+        
+        queries is None for rules that must be evaluated per ticket.
+        """
+        device_type, category, urgency, expertise_level = key
+        ticket_data = {
+            'extracted_info': {'device_type': device_type},
+            'classification': {
+                'category': category,
+                'urgency': urgency,
+                'expertise_level': expertise_level
+            }
+        }
+        plan = []
+        for rule in self.primary_rules:
+            if not rule.table_compatible:
+                plan.append((rule, None))
+            elif rule.matches(ticket_data):
+                plan.append((rule, tuple(rule.candidate_queries(ticket_data))))
+        
+        return tuple(plan)
+    
+    def assign_primary(self, ticket_data: Dict, roster=None) -> Optional[StaffMember]:
         """
         Find primary assignee using rule chain
         
         Args:
             ticket_data: Combined data from intake and classification
+            roster: Roster to resolve against (default: self.roster)
         
         Returns:
-            User object or None
+            StaffMember or None
         """
-        for rule in self.primary_rules:
-            if rule.matches(ticket_data):
-                user = rule.get_user(ticket_data)
-                if user:
-                    logger.info(f"Primary assignment: {user.name} via {rule.__class__.__name__}")
-                    return user
+        roster = roster or self.roster
+        key = self.table_key(ticket_data)
+        plan = self._decision_table.get(key)
+        if plan is None:
+            plan = self._compile_key(key)
+        
+        for rule, queries in plan:
+            if queries is None:
+                if not rule.matches(ticket_data):
+                    continue
+                user = rule.get_user(ticket_data, roster)
+            else:
+                user = roster.pick_first(queries)
+            if user:
+                logger.info(f"Primary assignment: {user.name} via {rule.__class__.__name__}")
+                return user
         
-        logger.warning("No primary assignee found - this should not happen (GeneralITRule should catch all)")
+        logger.warning("No primary assignee with free capacity found")
         return None
     
-    def assign_secondary(self, ticket_data: Dict, primary_user: Optional[User]) -> Optional[User]:
+    def assign_secondary(self, ticket_data: Dict,
+                         primary_user: Optional[StaffMember]) -> Optional[StaffMember]:
         """
         Find secondary assignee (building support, backup, etc.)
         
@@ -247,11 +561,11 @@ class AssignmentEngine:
             primary_user: Already assigned primary user (to avoid duplicates)
         
         Returns:
-            User object or None
+            StaffMember or None
         """
         for rule in self.secondary_rules:
             if rule.matches(ticket_data):
-                user = rule.get_user(ticket_data)
+                user = rule.get_user(ticket_data, self.roster)
                 if user and (not primary_user or user.user_id != primary_user.user_id):
                     logger.info(f"Secondary assignment: {user.name} via {rule.__class__.__name__}")
                     return user
@@ -280,13 +594,85 @@ class AssignmentEngine:
             'classification': classification_result
         }
         
-        # Find primary assignee
+        # Only touches the database when the roster needs reloading
+        self.roster.refresh()
+        
+        with self._lock:
+            primary_user, secondary_user = self._pick_assignees(ticket_data)
+        
+        return self._format_result(primary_user, secondary_user)
+    
+    def assign_batch(self, tickets: List[Dict],
+                     persist: bool = True) -> Dict[str, Dict[str, Optional[Dict]]]:
+        """
+        Assign many tickets in one pass (backlog replays, imports)
+        
+        Rules run against a single roster snapshot and every pick counts
+        toward workload before the next ticket is evaluated, so load is
+        balanced across the batch. Assignment rows are written with one
+        bulk INSERT in the current session; the caller commits, and the
+        picks become workload then (or are released on rollback). With
+        persist=False (dry runs, previews) the picks are released before
+        returning and leave workload unchanged.
+        
+        Args:
+            tickets: Dicts with ticket_id, intake_result and classification
+            persist: Write TicketAssignments rows
+        
+        Returns:
+            Dictionary of ticket_id to primary and secondary user assignments
+        """
+        self.roster.refresh()
+        
+        results = {}
+        rows = []
+        assigned_at = datetime.utcnow()
+        with self._lock:
+            for ticket in tickets:
+                ticket_data = {
+                    **ticket['intake_result'],
+                    'classification': ticket['classification']
+                }
+                primary_user, secondary_user = self._pick_assignees(ticket_data)
+                results[ticket['ticket_id']] = self._format_result(primary_user, secondary_user)
+                
+                for role, user in (('primary', primary_user), ('secondary', secondary_user)):
+                    if user:
+                        rows.append({
+                            'ticket_id': ticket['ticket_id'],
+                            'user_id': user.user_id,
+                            'role': role,
+                            'assigned_at': assigned_at
+                        })
+        
+        if persist and rows:
+            db.session.execute(db.insert(TicketAssignments), rows)
+        elif rows:
+            # No INSERT will settle these claims
+            self.roster.release(Counter(row['user_id'] for row in rows))
+        
+        logger.info(f"Batch assignment complete: {len(results)} tickets, {len(rows)} assignments")
+        return results
+    
+    def _pick_assignees(self,
+                        ticket_data: Dict) -> Tuple[Optional[StaffMember], Optional[StaffMember]]:
+        """Pick primary and secondary users and claim their capacity (caller holds the lock)"""
+        # Find primary assignee, overflowing past capacity if everyone is full
         primary_user = self.assign_primary(ticket_data)
+        if not primary_user:
+            primary_user = self.assign_primary(ticket_data, self.roster.ignoring_capacity())
         
         # Find secondary assignee
         secondary_user = self.assign_secondary(ticket_data, primary_user)
         
-        # Format response
+        # Claim capacity now; it becomes workload when the assignment commits
+        self.roster.claim(Counter(
+            user.user_id for user in (primary_user, secondary_user) if user
+        ))
+        return primary_user, secondary_user
+    
+    def _format_result(self, primary_user: Optional[StaffMember],
+                       secondary_user: Optional[StaffMember]) -> Dict[str, Optional[Dict]]:
         result = {
             'primary': self._format_user(primary_user) if primary_user else None,
             'secondary': self._format_user(secondary_user) if secondary_user else None
@@ -297,7 +683,7 @@ class AssignmentEngine:
         
         return result
     
-    def _format_user(self, user: User) -> Dict:
+    def _format_user(self, user: StaffMember) -> Dict:
         """Format user object for API response"""
         return {
             'user_id': user.user_id,
@@ -321,6 +707,15 @@ def get_assignment_engine() -> AssignmentEngine:
     return _assignment_engine
 
 
+def release_assignments(assignments: Optional[Dict]) -> None:
+    """Drop the claims of assignments that will never be saved (failed pipeline)"""
+    if _assignment_engine is None or not assignments:
+        return
+    _assignment_engine.roster.release(Counter(
+        assignments[role]['user_id'] for role in ('primary', 'secondary') if assignments.get(role)
+    ))
+
+
 def assign_ticket(intake_result: Dict, classification_result: Dict) -> Dict:
     try:
         engine = get_assignment_engine()
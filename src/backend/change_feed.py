@@ -0,0 +1,196 @@
+"""
+Ticket Change Feed
+------------------
+Lets dashboards ask "what changed since cursor X" instead of re-polling the
+full ticket list.
+
+Ticket writes append an event to a Redis stream (RedisDB.TICKET_EVENTS_STREAM):
+"created" from the web tier and "processed" from workers, after commit. The
+feed reads events after the client's stream position and loads just those
+tickets by primary key.
+
+Cursors also carry the newest (updated_at, id) the client has seen. If
+Redis is unavailable, or the stream was trimmed past the client's position,
+the feed falls back to a keyset scan over ix_tickets_updated_at_id, so no
+change is lost. The client keeps the returned cursor either way.
+
+Start a session with a request without a cursor. It returns no tickets and a
+cursor at "now"; take it before loading the full list (seeing a ticket
+twice is harmless, missing one is not).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import db, Ticket
+from serializers import serialize_list_item
+
+DEFAULT_FEED_LIMIT = 100
+MAX_FEED_LIMIT = 500
+
+# Stream position that precedes every event
+STREAM_START = "0-0"
+
+
+def encode_feed_cursor(stream_id: Optional[str], updated_at: Optional[datetime],
+                       ticket_id: Optional[str]) -> str:
+    """Encode a stream position and updated_at high-water mark as an opaque cursor"""
+    raw = json.dumps({
+        "s": stream_id,
+        "u": updated_at.isoformat() if updated_at else None,
+        "i": ticket_id
+    }, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_feed_cursor(cursor: str) -> Tuple[Optional[str], Optional[datetime], Optional[str]]:
+    """
+    Decode a cursor produced by encode_feed_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        stream_id = data["s"]
+        if stream_id is not None:
+            _stream_key(stream_id)
+        updated_at = datetime.fromisoformat(data["u"]) if data["u"] else None
+        return stream_id, updated_at, data["i"]
+    except (ValueError, KeyError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _stream_key(stream_id: str) -> Tuple[int, int]:
+    milliseconds, sequence = stream_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+def _high_water(tickets: List[Ticket], updated_at: Optional[datetime], ticket_id: Optional[str]):
+    mark = (updated_at, ticket_id) if updated_at else None
+    for ticket in tickets:
+        if mark is None or (ticket.updated_at, ticket.id) > mark:
+            mark = (ticket.updated_at, ticket.id)
+    return mark or (None, None)
+
+
+def start_cursor(redis_db=None) -> str:
+    """Cursor positioned after every change made so far"""
+    stream_id = None
+    if redis_db is not None:
+        bounds = redis_db.ticket_events_bounds()
+        if bounds is not None:
+            stream_id = bounds[1] or STREAM_START
+    latest = db.session.execute(
+        db.select(Ticket.updated_at, Ticket.id)
+        .order_by(Ticket.updated_at.desc(), Ticket.id.desc())
+        .limit(1)
+    ).first()
+    return encode_feed_cursor(stream_id, *(latest or (None, None)))
+
+
+def fetch_changes(
+    cursor: str,
+    fields: List[str],
+    relations,
+    limit: int = DEFAULT_FEED_LIMIT,
+    redis_db=None
+) -> Dict[str, Any]:
+    """
+    Tickets created or updated after a cursor
+
+    Args:
+        cursor: Cursor from start_cursor or a previous fetch_changes
+        fields: Fields to serialize for each ticket ("id" is always included)
+        relations: Relationships to eager-load (see pagination.relations_for)
+        limit: Maximum events (stream) or tickets (fallback) per call
+        redis_db: RedisDB with the event stream (None = always use the database)
+
+    Returns:
+        {"tickets": [...], "cursor": next cursor, "has_more": bool}
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    stream_id, updated_at, ticket_id = decode_feed_cursor(cursor)
+    limit = max(1, min(limit, MAX_FEED_LIMIT))
+    if "id" not in fields:
+        fields = ["id"] + list(fields)
+
+    if redis_db is not None and stream_id is not None:
+        changes = _stream_changes(redis_db, stream_id, updated_at, ticket_id, relations, limit)
+        if changes is not None:
+            tickets, next_cursor, has_more = changes
+            return _response(tickets, fields, next_cursor, has_more)
+
+    tickets, next_cursor, has_more = _keyset_changes(
+        redis_db, updated_at, ticket_id, relations, limit
+    )
+    return _response(tickets, fields, next_cursor, has_more)
+
+
+def _response(tickets, fields, next_cursor, has_more):
+    return {
+        "tickets": [serialize_list_item(ticket, fields) for ticket in tickets],
+        "cursor": next_cursor,
+        "has_more": has_more
+    }
+
+
+def _stream_changes(redis_db, stream_id, updated_at, ticket_id, relations, limit):
+    """Changes from the event stream, or None if the stream can't answer"""
+    bounds = redis_db.ticket_events_bounds()
+    if bounds is None:
+        return None
+    first_id, _ = bounds
+    if first_id is None or _stream_key(first_id) > _stream_key(stream_id):
+        # Events after the cursor may have been trimmed away (or the stream
+        # is empty); the database has the full picture
+        return None
+
+    events = redis_db.read_ticket_events(stream_id, limit)
+    if events is None:
+        return None
+
+    # Latest event per ticket decides its position in the response
+    order = {}
+    for _, event in events:
+        order.pop(event["ticket_id"], None)
+        order[event["ticket_id"]] = True
+    ticket_ids = list(order)
+
+    tickets = []
+    if ticket_ids:
+        query = Ticket.with_details(relations).filter(Ticket.id.in_(ticket_ids))
+        rows = {t.id: t for t in query.all()}
+        tickets = [rows[tid] for tid in ticket_ids if tid in rows]
+
+    next_stream_id = events[-1][0] if events else stream_id
+    next_cursor = encode_feed_cursor(next_stream_id, *_high_water(tickets, updated_at, ticket_id))
+    return tickets, next_cursor, len(events) == limit
+
+
+def _keyset_changes(redis_db, updated_at, ticket_id, relations, limit):
+    """Changes from the database, ordered by (updated_at, id)"""
+    # Read the stream head first so events during the query are replayed, not lost
+    head = None
+    if redis_db is not None:
+        bounds = redis_db.ticket_events_bounds()
+        if bounds is not None:
+            head = bounds[1] or STREAM_START
+
+    query = Ticket.with_details(relations).order_by(Ticket.updated_at, Ticket.id)
+    if updated_at is not None:
+        query = query.filter(
+            db.tuple_(Ticket.updated_at, Ticket.id) > db.tuple_(updated_at, ticket_id)
+        )
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    tickets = rows[:limit]
+
+    # Stay on the database until it has caught up, then resume the stream
+    next_stream_id = None if has_more else head
+    next_cursor = encode_feed_cursor(next_stream_id, *_high_water(tickets, updated_at, ticket_id))
+    return tickets, next_cursor, has_more
@@ -0,0 +1,149 @@
+"""
+Conditional GET for Ticket Endpoints
+------------------------------------
+Weak ETags and Last-Modified headers so the dashboard, browsers and the
+reverse proxy can revalidate instead of re-downloading unchanged tickets.
+
+A ticket's version is its own updated_at plus the updated_at of each
+pipeline row (classification, diagnosis, solution, workflow log) and its
+assignments, and the assigned users' fields shown in assigned_people.
+Users have no timestamp, so an edit to an assigned user changes the ETag
+but not Last-Modified. The detail endpoint reads that version with one
+small query before loading anything else, so a 304 costs a single indexed
+lookup.
+Listings derive validators from the rows they already loaded, which
+skips serialization and transfer.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from flask import make_response, request
+
+from models import (
+    db, Ticket, Classifications, Diagnostics, Solutions, TicketAssignments, User, Workflow_log
+)
+
+# Clients may reuse a response only after revalidating it
+CACHE_CONTROL = "no-cache"
+
+# User columns serialized in assigned_people (see serializers._assigned_people)
+ASSIGNED_USER_FIELDS = ("name", "email", "specialization", "tier_level")
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """Opaque tag for a sequence of version values"""
+    return hashlib.sha1(repr(tuple(parts)).encode("utf-8")).hexdigest()
+
+
+def _latest(timestamps: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    return max((t for t in timestamps if t is not None), default=None)
+
+
+def ticket_validators(ticket_id: str) -> Optional[Tuple[str, Optional[datetime]]]:
+    """
+    Version a ticket and its pipeline output with one query
+
+    Returns:
+        (etag, last_modified), or None if the ticket does not exist
+    """
+    def latest(column, ticket_column):
+        return db.select(db.func.max(column)).where(ticket_column == ticket_id).scalar_subquery()
+
+    # One row per assignment (or one row without any), each carrying the
+    # ticket-level versions plus that assignment's user fields
+    rows = db.session.execute(
+        db.select(
+            Ticket.updated_at,
+            latest(Classifications.updated_at, Classifications.ticket_id),
+            latest(Diagnostics.updated_at, Diagnostics.ticket_id),
+            latest(Solutions.updated_at, Solutions.ticket_id),
+            latest(Workflow_log.updated_at, Workflow_log.ticket_id),
+            latest(TicketAssignments.assigned_at, TicketAssignments.ticket_id),
+            db.select(db.func.count(TicketAssignments.id))
+            .where(TicketAssignments.ticket_id == ticket_id).scalar_subquery(),
+            *(getattr(User, field) for field in ASSIGNED_USER_FIELDS)
+        )
+        .select_from(Ticket)
+        .outerjoin(TicketAssignments, TicketAssignments.ticket_id == Ticket.id)
+        .outerjoin(User, User.user_id == TicketAssignments.user_id)
+        .where(Ticket.id == ticket_id)
+        .order_by(TicketAssignments.id)
+    ).all()
+    if not rows:
+        return None
+    user_count = len(ASSIGNED_USER_FIELDS)
+    versions = tuple(rows[0][:-user_count])
+    users = tuple(tuple(row[-user_count:]) for row in rows)
+    return make_etag((ticket_id,) + versions + users), _latest(versions[:-1])
+
+
+def ticket_row_version(ticket: Ticket, relations: Set[str]) -> List[Any]:
+    """Version values of a loaded ticket, limited to the relations that were loaded"""
+    version = [ticket.id, ticket.updated_at]
+    for relation in ("classification", "diagnostic", "solution"):
+        if relation in relations:
+            child = getattr(ticket, relation)
+            version.append(child.updated_at if child else None)
+    if "assignments" in relations:
+        for assignment in ticket.assignments:
+            version.extend((assignment.id, assignment.user_id, assignment.assigned_at))
+            if assignment.user:
+                version.extend(getattr(assignment.user, field) for field in ASSIGNED_USER_FIELDS)
+    return version
+
+
+def listing_validators(tickets: List[Ticket], relations: Set[str],
+                       *extra: Any) -> Tuple[str, Optional[datetime]]:
+    """
+    Validators for a list response
+
+    Args:
+        tickets: Tickets in the response, with `relations` loaded
+        relations: Relationships that were eager-loaded (see relations_for)
+        extra: Anything else that shapes the response (fields, cursors)
+
+    Returns:
+        (etag, last_modified)
+    """
+    versions = [ticket_row_version(ticket, relations) for ticket in tickets]
+    last_modified = _latest(
+        value for version in versions for value in version if isinstance(value, datetime)
+    )
+    return make_etag([extra, versions]), last_modified
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """True if the request's validators show the client already has this version"""
+    if request.if_none_match:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return request.if_modified_since >= _http_time(last_modified)
+    return False
+
+
+def conditional_response(build_body, etag: str, last_modified: Optional[datetime]):
+    """
+    Respond 304 if the client's copy is current, otherwise build the body
+
+    Args:
+        build_body: Zero-argument callable returning the JSON body
+        etag: Tag from ticket_validators or listing_validators
+        last_modified: Latest change time (naive UTC), if any
+    """
+    if is_not_modified(etag, last_modified):
+        response = make_response("", 304)
+    else:
+        response = make_response(build_body())
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = _http_time(last_modified)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def _http_time(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC; HTTP dates have whole seconds
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
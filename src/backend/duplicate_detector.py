@@ -0,0 +1,215 @@
+"""
+Near-Duplicate Ticket Detection
+-------------------------------
+During incidents hundreds of near-identical tickets arrive ("printer on 3rd
+floor down"). Each processed ticket is fingerprinted with a MinHash
+signature over character shingles of its normalized subject + description,
+and indexed with LSH banding so a new ticket only compares against
+candidates that share a band. If the estimated Jaccard similarity of the
+best candidate clears the threshold, the Overseer reuses that ticket's
+classification, diagnosis and solution instead of calling Claude again,
+along with the device and location intake extracted from it.
+
+Index tiers:
+- In-memory (per process, always on)
+- Redis via RedisDB (optional, shared between workers)
+
+Both tiers are searched for every ticket, so a weaker local candidate
+never hides a closer one another worker indexed.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Mersenne prime for the universal hash family
+_PRIME = (1 << 61) - 1
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace"""
+    return " ".join(re.findall(r"[a-z0-9]+", (text or "").lower()))
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """Overlapping character n-grams of normalized text"""
+    text = normalize(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class MinHasher:
+    """MinHash signatures with a fixed seed, so they match across processes"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Set[str]) -> Tuple[int, ...]:
+        if not features:
+            return tuple([_PRIME] * self.num_perm)
+        hashes = [_hash64(feature) for feature in features]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._params)
+
+    @staticmethod
+    def similarity(sig_a, sig_b) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class DuplicateDetector:
+    """Finds recently processed tickets that are near-duplicates of a new one"""
+
+    # "Recent" duplicates: 2 hours (in seconds)
+    DEFAULT_TTL = 2 * 60 * 60
+    DEFAULT_THRESHOLD = 0.8
+    DEFAULT_MAX_ENTRIES = 5000
+
+    # 32 bands x 4 rows: pairs at the 0.8 threshold become candidates with
+    # near certainty, unrelated tickets (similarity < 0.3) almost never do
+    BANDS = 32
+    ROWS = 4
+
+    # Pipeline results a duplicate may reuse
+    REUSED_STAGES = ("classification", "diagnosis", "fetched_data", "solution")
+
+    def __init__(
+        self,
+        redis_db=None,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl: int = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Args:
+            redis_db: RedisDB instance for the shared index (None = memory only)
+            threshold: Minimum estimated Jaccard similarity to count as duplicate
+            ttl: Seconds a processed ticket stays eligible for reuse
+            max_entries: Size of the in-memory index
+        """
+        self.redis_db = redis_db
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm=self.BANDS * self.ROWS)
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[int, ...], Dict]]" = OrderedDict()
+        self._bands: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def signature(self, raw_ticket: Dict[str, Any]) -> Tuple[int, ...]:
+        """MinHash signature of a ticket's subject and description"""
+        text = f"{raw_ticket.get('subject', '')} {raw_ticket.get('description', '')}"
+        return self.hasher.signature(shingles(text))
+
+    def band_keys(self, signature: Tuple[int, ...]) -> List[str]:
+        """LSH bucket keys; tickets sharing any bucket are candidates"""
+        keys = []
+        for band in range(self.BANDS):
+            rows = signature[band * self.ROWS:(band + 1) * self.ROWS]
+            digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+
+    def find(self, raw_ticket: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar recent ticket above the threshold
+
+        Returns:
+            {"ticket_id", "similarity", "results"} or None
+        """
+        signature = self.signature(raw_ticket)
+        bands = self.band_keys(signature)
+
+        candidates = self._memory_candidates(bands)
+        if self.redis_db is not None:
+            candidates.update(self._redis_candidates(bands, known=candidates))
+
+        best = None
+        for ticket_id, (candidate_sig, results) in candidates.items():
+            similarity = self.hasher.similarity(signature, candidate_sig)
+            if similarity >= self.threshold and (best is None or similarity > best["similarity"]):
+                best = {"ticket_id": ticket_id, "similarity": similarity, "results": results}
+        return best
+
+    def remember(self, ticket_id: str, raw_ticket: Dict[str, Any],
+                 overseer_result: Dict[str, Any]) -> None:
+        """Index a successfully processed ticket for reuse by later duplicates"""
+        signature = self.signature(raw_ticket)
+        bands = self.band_keys(signature)
+        results = {stage: overseer_result[stage] for stage in self.REUSED_STAGES}
+        # Assignment reruns for each duplicate and routes on device and location
+        intake_result = overseer_result.get("intake_result", {})
+        results["extracted_info"] = intake_result.get("extracted_info", {})
+
+        self._memory_add(ticket_id, signature, bands, results)
+        if self.redis_db is not None:
+            data = json.dumps({
+                "signature": signature, "results": results, "expires_at": time.time() + self.ttl
+            })
+            self.redis_db.store_ticket_signature(ticket_id, bands, data, self.ttl)
+
+    def _memory_candidates(self, bands: List[str]) -> Dict[str, Tuple]:
+        now = time.monotonic()
+        with self._lock:
+            ids = set()
+            for band in bands:
+                ids.update(self._bands.get(band, ()))
+            candidates = {}
+            for ticket_id in ids:
+                expires_at, signature, results = self._entries[ticket_id]
+                if expires_at > now:
+                    candidates[ticket_id] = (signature, results)
+            return candidates
+
+    def _redis_candidates(self, bands: List[str], known=()) -> Dict[str, Tuple]:
+        """Candidates from the shared index, skipping ticket IDs already in `known`"""
+        candidates = {}
+        for ticket_id, raw in self.redis_db.fetch_signature_candidates(bands).items():
+            if ticket_id in known:
+                continue
+            data = json.loads(raw)
+            # Entries indexed before expiry times were stored get a full TTL
+            ttl = data.get("expires_at", time.time() + self.ttl) - time.time()
+            if ttl <= 0:
+                continue
+            signature = tuple(data["signature"])
+            candidates[ticket_id] = (signature, data["results"])
+            # Promote for the rest of its lifetime, so local lookups stay warm
+            self._memory_add(ticket_id, signature, self.band_keys(signature), data["results"], ttl)
+        return candidates
+
+    def _memory_add(self, ticket_id: str, signature, bands: List[str], results: Dict,
+                    ttl: Optional[float] = None) -> None:
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            if ticket_id in self._entries:
+                self._memory_remove(ticket_id)
+            self._entries[ticket_id] = (time.monotonic() + ttl, signature, results)
+            for band in bands:
+                self._bands.setdefault(band, set()).add(ticket_id)
+            while len(self._entries) > self.max_entries:
+                self._memory_remove(next(iter(self._entries)))
+
+    def _memory_remove(self, ticket_id: str) -> None:
+        # Caller holds the lock
+        _, signature, _ = self._entries.pop(ticket_id)
+        for band in self.band_keys(signature):
+            members = self._bands.get(band)
+            if members is not None:
+                members.discard(ticket_id)
+                if not members:
+                    del self._bands[band]
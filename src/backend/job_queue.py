@@ -0,0 +1,227 @@
+"""
+Ticket Pipeline Job Queue
+-------------------------
+Decouples ticket submission from the multi-agent pipeline. The web tier
+persists the raw ticket and enqueues a job; worker processes (see worker.py)
+pull jobs, run the Overseer and record the outcome for status polling.
+
+Two interchangeable backends:
+- RedisJobQueue: shares the existing RedisDB connection (production)
+- InMemoryJobQueue: in-process stand-in for tests and local development
+"""
+
+import json
+import queue
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+
+class JobStatus:
+    """Job lifecycle states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobQueue:
+    """Base class for pipeline job queues"""
+
+    @staticmethod
+    def generate_id() -> str:
+        """Generate unique job ID"""
+        return f"JOB-{uuid.uuid4().hex[:12].upper()}"
+
+    def enqueue(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Queue a job and return its ID (None if the queue is unavailable)"""
+        raise NotImplementedError
+
+    def dequeue(self, timeout: int = 5) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Block up to `timeout` seconds for the next (job_id, payload)"""
+        raise NotImplementedError
+
+    def dequeue_batch(self, max_jobs: int, timeout: int = 5) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Block up to `timeout` seconds for one job, then take up to
+        `max_jobs - 1` more without waiting
+        """
+        raise NotImplementedError
+
+    def set_status(self, job_id: str, status: str, **fields) -> None:
+        """Record a status transition plus any extra result fields"""
+        raise NotImplementedError
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record or None if unknown/expired"""
+        raise NotImplementedError
+
+
+class RedisJobQueue(JobQueue):
+    """Redis list as the work queue, one hash per job for status"""
+
+    PENDING_KEY = "jobs:pending"
+    JOB_PREFIX = "job:"
+
+    # Keep finished job records for 1 day (in seconds)
+    DEFAULT_TTL = 24 * 60 * 60
+
+    def __init__(self, redis_db, ttl: int = DEFAULT_TTL):
+        """
+        Args:
+            redis_db: Connected RedisDB instance (its client is reused)
+            ttl: Seconds to keep job records
+        """
+        self.client = redis_db.client
+        self.ttl = ttl
+
+    def enqueue(self, payload: Dict[str, Any]) -> Optional[str]:
+        job_id = self.generate_id()
+        job_key = f"{self.JOB_PREFIX}{job_id}"
+        now = datetime.utcnow().isoformat()
+
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(job_key, mapping={
+                "id": job_id,
+                "status": JobStatus.QUEUED,
+                "ticket_id": payload.get("ticket_id", ""),
+                "payload": json.dumps(payload),
+                "created_at": now,
+                "updated_at": now
+            })
+            pipe.expire(job_key, self.ttl)
+            pipe.lpush(self.PENDING_KEY, job_id)
+            pipe.execute()
+            return job_id
+        except redis.RedisError as e:
+            print(f"Error enqueuing job: {e}")
+            return None
+
+    def dequeue(self, timeout: int = 5) -> Optional[Tuple[str, Dict[str, Any]]]:
+        try:
+            item = self.client.brpop(self.PENDING_KEY, timeout=timeout)
+            if not item:
+                return None
+            _, job_id = item
+            raw_payload = self.client.hget(f"{self.JOB_PREFIX}{job_id}", "payload")
+            if raw_payload is None:
+                # Job record expired before a worker reached it
+                return None
+            return job_id, json.loads(raw_payload)
+        except redis.RedisError as e:
+            print(f"Error dequeuing job: {e}")
+            return None
+
+    def dequeue_batch(self, max_jobs: int, timeout: int = 5) -> List[Tuple[str, Dict[str, Any]]]:
+        first = self.dequeue(timeout=timeout)
+        if first is None:
+            return []
+        jobs = [first]
+        if max_jobs <= 1:
+            return jobs
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            for _ in range(max_jobs - 1):
+                pipe.rpop(self.PENDING_KEY)
+            job_ids = [job_id for job_id in pipe.execute() if job_id is not None]
+            if not job_ids:
+                return jobs
+
+            pipe = self.client.pipeline(transaction=False)
+            for job_id in job_ids:
+                pipe.hget(f"{self.JOB_PREFIX}{job_id}", "payload")
+            for job_id, raw_payload in zip(job_ids, pipe.execute()):
+                # Skip jobs whose record expired before a worker reached them
+                if raw_payload is not None:
+                    jobs.append((job_id, json.loads(raw_payload)))
+        except redis.RedisError as e:
+            print(f"Error dequeuing job batch: {e}")
+        return jobs
+
+    def set_status(self, job_id: str, status: str, **fields) -> None:
+        mapping = {"status": status, "updated_at": datetime.utcnow().isoformat()}
+        for key, value in fields.items():
+            mapping[key] = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+        try:
+            self.client.hset(f"{self.JOB_PREFIX}{job_id}", mapping=mapping)
+        except redis.RedisError as e:
+            print(f"Error updating job {job_id}: {e}")
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = self.client.hgetall(f"{self.JOB_PREFIX}{job_id}")
+        except redis.RedisError as e:
+            print(f"Error fetching job {job_id}: {e}")
+            return None
+        if not data:
+            return None
+
+        data.pop("payload", None)
+        if "result" in data:
+            data["result"] = json.loads(data["result"])
+        return data
+
+
+class InMemoryJobQueue(JobQueue):
+    """Thread-safe in-process queue with the same interface as RedisJobQueue"""
+
+    def __init__(self):
+        self._pending = queue.Queue()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, payload: Dict[str, Any]) -> Optional[str]:
+        job_id = self.generate_id()
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": JobStatus.QUEUED,
+                "ticket_id": payload.get("ticket_id", ""),
+                "payload": payload,
+                "created_at": now,
+                "updated_at": now
+            }
+        self._pending.put(job_id)
+        return job_id
+
+    def dequeue(self, timeout: int = 5) -> Optional[Tuple[str, Dict[str, Any]]]:
+        try:
+            job_id = self._pending.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        with self._lock:
+            return job_id, self._jobs[job_id]["payload"]
+
+    def dequeue_batch(self, max_jobs: int, timeout: int = 5) -> List[Tuple[str, Dict[str, Any]]]:
+        first = self.dequeue(timeout=timeout)
+        if first is None:
+            return []
+        job_ids = []
+        while len(job_ids) < max_jobs - 1:
+            try:
+                job_ids.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            return [first] + [(job_id, self._jobs[job_id]["payload"]) for job_id in job_ids]
+
+    def set_status(self, job_id: str, status: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            job["status"] = status
+            job["updated_at"] = datetime.utcnow().isoformat()
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: v for k, v in job.items() if k != "payload"}
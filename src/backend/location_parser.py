@@ -0,0 +1,106 @@
+"""
+Location Normalizer
+-------------------
+Turns free-text ticket locations ("Bldg 2, 3rd floor", "floor 12",
+"second floor of building B") into a (building, floor) pair once per
+string. Patterns are compiled at import and results are cached, since
+the same handful of locations repeats across tickets.
+
+Buildings are normalized to the `User.building` format ("building2").
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Spelled-out numbers seen in tickets
+CARDINAL_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+}
+ORDINAL_WORDS = {
+    'ground': 0, 'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5,
+    'sixth': 6, 'seventh': 7, 'eighth': 8, 'ninth': 9, 'tenth': 10
+}
+
+# Named locations that map straight to a building ID
+BUILDING_ALIASES = {
+    'main building': 'building1',
+    'hq': 'building1',
+    'headquarters': 'building1'
+}
+
+_CARDINAL = r"(\d+|" + "|".join(CARDINAL_WORDS) + r")\b"
+_ORDINAL = r"(\d+(?:st|nd|rd|th)|" + "|".join(ORDINAL_WORDS) + r")\b"
+
+# Building letter: uppercase as written ("building B"), or lowercase only
+# when a floor/room follows ("bldg b, floor 2"), so "building a new lab"
+# isn't read as building A
+_BUILDING_LETTER = (r"(?-i:([A-Z]))\b"
+                    r"|(?-i:([a-z]))(?=[\s,#.-]*(?:floor|flr|fl|level|lvl|room|rm)\b)")
+# "building 2", "bldg. B", "bld #3", "building-2", "building one"; matched
+# against the original text so the letter's case is known
+_BUILDING_PREFIX = re.compile(
+    r"\b(?:building|bldg|bld)\.?\s*[#-]?\s*(?:" + _CARDINAL + "|" + _BUILDING_LETTER + ")",
+    re.IGNORECASE
+)
+# "2nd building", "second building"
+_BUILDING_SUFFIX = re.compile(r"\b" + _ORDINAL + r"\s+building\b")
+_BUILDING_ALIAS = re.compile(r"\b(" + "|".join(map(re.escape, BUILDING_ALIASES)) + r")\b")
+
+# "3rd floor", "12th fl", "second floor", "ground floor"
+_FLOOR_SUFFIX = re.compile(r"\b" + _ORDINAL + r"\s*(?:floor|flr|fl)\b")
+# "floor 12", "fl. 3", "level 2", "lvl four", "L3"
+_FLOOR_PREFIX = re.compile(r"\b(?:floor|flr|fl|level|lvl)\.?\s*#?\s*" + _CARDINAL + r"|\bl(\d+)\b")
+
+
+def _to_number(token: str) -> int:
+    digits = token.rstrip("stndrh")
+    if digits.isdigit():
+        return int(digits)
+    return CARDINAL_WORDS.get(token, ORDINAL_WORDS.get(token))
+
+
+def _first_group(match) -> str:
+    return next(group for group in match.groups() if group is not None)
+
+
+@lru_cache(maxsize=1024)
+def parse_location(location: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Extract building and floor from a free-text location
+
+    Args:
+        location: Location as written in the ticket
+
+    Returns:
+        (building, floor): building as "building<id>" and floor as int;
+        either is None when not present
+    """
+    if not location:
+        return None, None
+    text = location.lower()
+
+    building = None
+    match = _BUILDING_PREFIX.search(location) or _BUILDING_SUFFIX.search(text)
+    if match:
+        token = _first_group(match).lower()
+        # Lettered buildings ("building B") keep their letter
+        building_id = token if len(token) == 1 and token.isalpha() else _to_number(token)
+        building = f"building{building_id}"
+    else:
+        alias = _BUILDING_ALIAS.search(text)
+        if alias:
+            building = BUILDING_ALIASES[alias.group(1)]
+
+    floor = None
+    match = _FLOOR_SUFFIX.search(text) or _FLOOR_PREFIX.search(text)
+    if match:
+        floor = _to_number(_first_group(match))
+
+    return building, floor
+
+
+def building_for_floor(floor: int) -> str:
+    """Building serving a floor when the ticket names no building (floor N -> buildingN)"""
+    return f"building{floor}"
@@ -0,0 +1,100 @@
+"""
+Add indexes on hot lookup columns, and columns added to existing tables,
+to an existing database.
+
+New databases get these from db.create_all(); databases created before they
+were added to models.py need this migration (create_all never alters a
+table that already exists). Columns are only added when missing and every
+index is created with IF NOT EXISTS semantics, so it is safe to run more
+than once:
+
+    python src/backend/migrate_db_indexes.py            # upgrade
+    python src/backend/migrate_db_indexes.py downgrade  # drop the indexes again
+
+Downgrade keeps added columns: they hold data, and SQLite cannot drop a
+column with a foreign key.
+
+On a large Postgres table, run it outside peak hours - CREATE INDEX holds a
+write lock on the table while it builds.
+"""
+
+import sys
+
+from models import db
+
+# Revisions in order as (name, columns, indexes); each is frozen once
+# released. Columns are "table.column" and, like index names, match
+# models.py
+REVISIONS = [
+    ("0001_hot_column_indexes", [], [
+        "ix_tickets_created_at_id",
+        "ix_tickets_status_id",
+        "ix_ticket_assignments_ticket_id_user_id",
+        "ix_ticket_assignments_user_id_ticket_id",
+        "ix_workflow_log_ticket_id",
+        "ix_users_specialization_tier_building",
+        "ix_users_building",
+    ]),
+    ("0002_ticket_change_feed", [], [
+        "ix_tickets_updated_at_id",
+    ]),
+    # Nullable, so existing rows need no backfill
+    ("0003_ticket_duplicate_of", [
+        "tickets.duplicate_of",
+    ], []),
+]
+revision = REVISIONS[-1][0]
+
+COLUMNS = [name for _, columns, _ in REVISIONS for name in columns]
+INDEXES = [name for _, _, names in REVISIONS for name in names]
+
+
+def _model_indexes():
+    return {index.name: index for table in db.metadata.tables.values() for index in table.indexes}
+
+
+def _existing_columns(bind, table_name):
+    return {column["name"] for column in db.inspect(bind).get_columns(table_name)}
+
+
+def _add_column_sql(bind, column):
+    """ALTER TABLE ... ADD COLUMN for a model column, with its foreign key"""
+    sql = (f"ALTER TABLE {column.table.name} ADD COLUMN {column.name} "
+           f"{column.type.compile(dialect=bind.dialect)}")
+    for foreign_key in column.foreign_keys:
+        sql += f" REFERENCES {foreign_key.column.table.name} ({foreign_key.column.name})"
+    return sql
+
+
+def upgrade(bind):
+    """Add any of the revisions' columns and indexes that are missing"""
+    for name in COLUMNS:
+        table_name, column_name = name.split(".")
+        if column_name not in _existing_columns(bind, table_name):
+            column = db.metadata.tables[table_name].c[column_name]
+            bind.exec_driver_sql(_add_column_sql(bind, column))
+            print(f"  added {name}")
+
+    indexes = _model_indexes()
+    for name in INDEXES:
+        indexes[name].create(bind, checkfirst=True)
+        print(f"  created {name}")
+
+
+def downgrade(bind):
+    """Drop the revisions' indexes (columns are kept)"""
+    indexes = _model_indexes()
+    for name in reversed(INDEXES):
+        indexes[name].drop(bind, checkfirst=True)
+        print(f"  dropped {name}")
+
+
+if __name__ == "__main__":
+    from app import app
+
+    step = downgrade if sys.argv[1:] == ["downgrade"] else upgrade
+    with app.app_context():
+        print(f"Running {step.__name__} to {revision}...")
+        with db.engine.begin() as connection:
+            step(connection)
+        print("\nDone!")
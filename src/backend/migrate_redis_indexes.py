@@ -0,0 +1,21 @@
+"""
+Convert set-based Redis category indexes to time-ordered sorted sets.
+
+Run once after upgrading, with the web app and workers stopped:
+
+    python src/backend/migrate_redis_indexes.py
+"""
+
+from os import getenv
+from dotenv import load_dotenv
+
+from redis_client import RedisDB
+
+load_dotenv()
+
+
+if __name__ == "__main__":
+    print("Migrating Redis category indexes...")
+    redis_client = RedisDB(getenv('REDIS_URL'))
+    migrated = redis_client.migrate_category_indexes()
+    print(f"\nSuccessfully migrated {migrated} indexes!")
@@ -15,6 +15,14 @@ class TicketStatus(Enum):
 #Define Ticket Model
 class Ticket(db.Model):
     __tablename__ = 'tickets'
+    __table_args__ = (
+        # Backs keyset pagination: ORDER BY created_at DESC, id DESC
+        db.Index('ix_tickets_created_at_id', 'created_at', 'id'),
+        # Open-workload counts filter on status before joining assignments
+        db.Index('ix_tickets_status_id', 'status', 'id'),
+        # Change feed keyset: updated_at, id > cursor
+        db.Index('ix_tickets_updated_at_id', 'updated_at', 'id'),
+    )
 
     id = db.Column(db.String, primary_key=True)    
     user_email = db.Column(db.String, nullable=False)
@@ -23,6 +31,14 @@ class Ticket(db.Model):
     status = db.Column(db.Enum(TicketStatus), default=TicketStatus.OPEN)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Earlier ticket whose pipeline results were reused (near-duplicate)
+    duplicate_of = db.Column(db.String, db.ForeignKey('tickets.id'), nullable=True)
+
+    # Related pipeline output - loaded eagerly via with_details()
+    classification = db.relationship('Classifications', uselist=False)
+    diagnostic = db.relationship('Diagnostics', uselist=False)
+    solution = db.relationship('Solutions', uselist=False)
+    assignments = db.relationship('TicketAssignments', order_by='TicketAssignments.id')
 
     #Generate Ticked ID
     @staticmethod
@@ -30,9 +46,42 @@ class Ticket(db.Model):
         """Generate unique ticket ID"""
         return f"TKT-{uuid.uuid4().hex[:8].upper()}"   
 
+    @staticmethod
+    def with_details(relations=None):
+        """
+        Ticket query that loads related pipeline output up front
+
+        One-to-one children are joined into the ticket SELECT and assignments
+        (with their users) are fetched in a single extra IN query, so the
+        number of round trips stays constant regardless of result size.
+
+        Args:
+            relations: Optional subset of {"classification", "diagnostic",
+                       "solution", "assignments"} to load (default: all)
+        """
+        if relations is None:
+            relations = {"classification", "diagnostic", "solution", "assignments"}
+
+        options = []
+        if "classification" in relations:
+            options.append(db.joinedload(Ticket.classification))
+        if "diagnostic" in relations:
+            options.append(db.joinedload(Ticket.diagnostic))
+        if "solution" in relations:
+            options.append(db.joinedload(Ticket.solution))
+        if "assignments" in relations:
+            options.append(db.selectinload(Ticket.assignments).joinedload(TicketAssignments.user))
+        return Ticket.query.options(*options)
+
 #Define User Model
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Matches assignment lookups: specialization, then tier, then building
+        db.Index('ix_users_specialization_tier_building',
+                 'specialization', 'tier_level', 'building'),
+        db.Index('ix_users_building', 'building'),
+    )
 
     user_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     email = db.Column(db.String, unique=True, nullable=False)
@@ -51,6 +100,12 @@ class User(db.Model):
 #Define TicketAssignments Model 
 class TicketAssignments(db.Model):
     __tablename__ = 'ticket_assignments'
+    __table_args__ = (
+        # Assignments for a ticket; covers the user_id read for workload changes
+        db.Index('ix_ticket_assignments_ticket_id_user_id', 'ticket_id', 'user_id'),
+        # Per-user workload counts group by user_id and join on ticket_id
+        db.Index('ix_ticket_assignments_user_id_ticket_id', 'user_id', 'ticket_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     ticket_id = db.Column(db.String, db.ForeignKey('tickets.id'), nullable=False)
@@ -58,6 +113,8 @@ class TicketAssignments(db.Model):
     role = db.Column(db.String, nullable=False)
     assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    user = db.relationship('User')
+
 
 class Classifications(db.Model):
     __tablename__ = 'classifications'
@@ -96,7 +153,7 @@ class Workflow_log(db.Model):
     __tablename__ = 'workflow_log'
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    ticket_id = db.Column(db.String, db.ForeignKey('tickets.id'), nullable=False)
+    ticket_id = db.Column(db.String, db.ForeignKey('tickets.id'), nullable=False, index=True)
     log_entries = db.Column(db.JSON, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,149 @@
+"""
+Keyset Pagination and Streaming for Ticket Listings
+---------------------------------------------------
+Cursor-based paging over (created_at, id) so every page is an index range
+scan instead of an OFFSET that re-reads all previous rows, plus a row-by-row
+NDJSON exporter for full-table dumps.
+"""
+
+import base64
+from datetime import datetime
+from typing import Iterator, List, Optional, Set, Tuple
+
+from models import db, Ticket
+from serializers import LIST_FIELDS, dumps, serialize_list_item
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Rows fetched per server-side cursor batch when exporting
+EXPORT_BATCH_SIZE = 500
+
+# Response fields backed by a Ticket relationship (see Ticket.with_details)
+FIELD_RELATIONS = {
+    "classification": "classification",
+    "diagnosis": "diagnostic",
+    "solution": "solution",
+    "assigned_people": "assignments"
+}
+
+
+def encode_cursor(ticket: Ticket) -> str:
+    """Encode the sort key of the last ticket on a page as an opaque cursor"""
+    raw = f"{ticket.created_at.isoformat()}|{ticket.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, ticket_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), ticket_id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_fields(fields_param: Optional[str]) -> List[str]:
+    """
+    Parse a comma separated ?fields= value
+
+    Returns:
+        Requested fields in response order (all fields when not given)
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields_param:
+        return list(LIST_FIELDS)
+
+    requested = {f.strip() for f in fields_param.split(",") if f.strip()}
+    unknown = requested - set(LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [f for f in LIST_FIELDS if f in requested]
+
+
+def parse_limit(limit_param: Optional[str]) -> Optional[int]:
+    """
+    Parse a ?limit= value
+
+    Returns:
+        The limit, or None when not given
+
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    if limit_param is None:
+        return None
+    try:
+        return int(limit_param)
+    except ValueError as e:
+        raise ValueError(f"Invalid limit: {limit_param}") from e
+
+
+def relations_for(fields: List[str]) -> Set[str]:
+    """Relationships that must be eager-loaded to serialize the given fields"""
+    return {FIELD_RELATIONS[f] for f in fields if f in FIELD_RELATIONS}
+
+
+def paginate_tickets(
+    query,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Tuple[List[Ticket], Optional[str]]:
+    """
+    Fetch one page of tickets, newest first
+
+    Args:
+        query: Ticket query (e.g. Ticket.with_details())
+        limit: Page size, clamped to MAX_PAGE_SIZE
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Tuple of (tickets, next_cursor); next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = query.order_by(Ticket.created_at.desc(), Ticket.id.desc())
+
+    if cursor:
+        created_at, ticket_id = decode_cursor(cursor)
+        query = query.filter(
+            db.tuple_(Ticket.created_at, Ticket.id) < db.tuple_(created_at, ticket_id)
+        )
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1])
+    return rows, None
+
+
+def stream_tickets_ndjson(
+    query,
+    fields: List[str],
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Serialize tickets one JSON line at a time, oldest first
+
+    Rows are pulled with yield_per so the database driver uses a server-side
+    cursor and only `batch_size` tickets (plus their eager-loaded relations)
+    are held in memory at once.
+
+    Args:
+        query: Ticket query (e.g. Ticket.with_details())
+        fields: Fields to include in each line
+        batch_size: Rows per fetch
+
+    Yields:
+        One newline-terminated JSON document per ticket
+    """
+    rows = query.order_by(Ticket.created_at, Ticket.id).yield_per(batch_size)
+    for ticket in rows:
+        yield dumps(serialize_list_item(ticket, fields)) + "\n"
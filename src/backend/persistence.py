@@ -0,0 +1,121 @@
+"""
+Pipeline Result Persistence
+---------------------------
+Writes Overseer output for processed tickets. Rows for every ticket in a
+batch are collected first and written with one executemany statement per
+table (UPDATE tickets, then INSERT into classifications, diagnostics,
+solutions, ticket_assignments and workflow_log), so the number of round
+trips stays constant regardless of batch size. On Postgres, SQLAlchemy
+sends each INSERT as a single multi-row VALUES statement.
+
+Nothing is committed here; the caller owns the transaction.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from models import (
+    db, Ticket, Classifications, Diagnostics, Solutions, Workflow_log, TicketAssignments
+)
+
+# Insert order respects foreign keys (all reference tickets)
+TABLES = (Classifications, Diagnostics, Solutions, TicketAssignments, Workflow_log)
+
+
+def pipeline_rows(ticket_id: str, overseer_result: Dict[str, Any],
+                  now: datetime) -> Dict[Any, List[Dict]]:
+    """
+    Build the rows one processed ticket contributes to each table
+
+    Args:
+        ticket_id: ID of the ticket row created at submission time
+        overseer_result: Successful result from Overseer.process_ticket
+        now: Timestamp for created_at/updated_at columns
+
+    Returns:
+        Dictionary of model class to list of column dicts
+    """
+    intake_result = overseer_result["intake_result"]
+    classification_result = overseer_result["classification"]
+    diagnosis_result = overseer_result["diagnosis"]
+    solution_result = overseer_result["solution"]
+
+    ticket = {"id": ticket_id, "duplicate_of": overseer_result.get("duplicate_of"),
+              "updated_at": now}
+    # Replace raw submission text with cleaned data from intake
+    for field in ("subject", "description"):
+        if field in intake_result:
+            ticket[field] = intake_result[field]
+
+    rows = {
+        Ticket: [ticket],
+        Classifications: [{
+            "ticket_id": ticket_id,
+            "category": classification_result["category"],
+            "urgency": classification_result["urgency"],
+            "expertise_level": classification_result["expertise_level"],
+            "reasoning": classification_result["reasoning"],
+            "created_at": now,
+            "updated_at": now
+        }],
+        Diagnostics: [{
+            "ticket_id": ticket_id,
+            "diagnosis": diagnosis_result["diagnosis"],
+            "potential_causes": diagnosis_result["potential_causes"],
+            "recommended_tests": diagnosis_result["recommended_tests"],
+            "created_at": now,
+            "updated_at": now
+        }],
+        Solutions: [{
+            "ticket_id": ticket_id,
+            "solution": solution_result["solution"],
+            "tools_needed": solution_result["tools_needed"],
+            "estimated_time": solution_result["estimated_time"],
+            "confidence": solution_result["confidence"],
+            "created_at": now,
+            "updated_at": now
+        }],
+        TicketAssignments: [],
+        Workflow_log: [{
+            "ticket_id": ticket_id,
+            "log_entries": overseer_result["workflow_log"],
+            "created_at": now,
+            "updated_at": now
+        }]
+    }
+
+    assignments = overseer_result.get("assignments") or {}
+    for role in ('primary', 'secondary'):
+        if assignments.get(role):
+            rows[TicketAssignments].append({
+                "ticket_id": ticket_id,
+                "user_id": assignments[role]["user_id"],
+                "role": role,
+                "assigned_at": now
+            })
+    return rows
+
+
+def save_pipeline_results(results: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """
+    Persist Overseer output for a batch of already persisted tickets
+
+    Args:
+        results: (ticket_id, overseer_result) pairs; every result must be
+                 a successful Overseer.process_ticket result
+    """
+    if not results:
+        return
+
+    now = datetime.utcnow()
+    batch = {model: [] for model in (Ticket,) + TABLES}
+    for ticket_id, overseer_result in results:
+        for model, rows in pipeline_rows(ticket_id, overseer_result, now).items():
+            batch[model].extend(rows)
+
+    # ORM bulk UPDATE by primary key: one executemany per distinct column set
+    db.session.execute(db.update(Ticket), batch[Ticket])
+    for model in TABLES:
+        if batch[model]:
+            db.session.execute(db.insert(model), batch[model])
+
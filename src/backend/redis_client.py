@@ -4,7 +4,7 @@ Redis Memory Service for IT Support Ticket Resolution Storage
 
 import redis
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class RedisDB:
@@ -13,12 +13,28 @@ class RedisDB:
     # Key prefixes for organization
     TICKET_PREFIX = "ticket:"
     CATEGORY_INDEX_PREFIX = "category:"
+    SUCCESS_INDEX_SUFFIX = ":successful"
+    LLM_CACHE_PREFIX = "llm_cache:"
+    SIGNATURE_PREFIX = "dup:ticket:"
+    SIGNATURE_BAND_PREFIX = "dup:band:"
+    TICKET_EVENTS_STREAM = "ticket_events"
+    
+    # Approximate number of ticket events kept for the change feed
+    TICKET_EVENTS_MAXLEN = 100000
     
     # Default TTL: 90 days (in seconds)
     DEFAULT_TTL = 90 * 24 * 60 * 60
     
-    def __init__(self, connection_url: str):
-        """Initialize Redis connection"""
+    def __init__(self, connection_url: str, index_retention: int = DEFAULT_TTL):
+        """
+        Initialize Redis connection
+        
+        Args:
+            connection_url: Redis URL
+            index_retention: Seconds a resolution stays in its category index;
+                             older members are trimmed on every read and write
+        """
+        self.index_retention = index_retention
         try:
             self.client = redis.from_url(
                 connection_url,
@@ -63,6 +79,8 @@ class RedisDB:
         try:
             ticket_key = f"{self.TICKET_PREFIX}{ticket_id}"
             category_index_key = f"{self.CATEGORY_INDEX_PREFIX}{category.lower()}"
+            timestamp = datetime.utcnow()
+            score = self._index_score(timestamp)
             
             # Use pipeline for atomic operations
             pipe = self.client.pipeline()
@@ -73,13 +91,19 @@ class RedisDB:
                 "category": category.lower(),
                 "solution": solution,
                 "success": int(success),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamp.isoformat()
             })
             pipe.expire(ticket_key, ttl)
             
-            # Add to category index for fast retrieval
-            pipe.sadd(category_index_key, ticket_id)
-            pipe.expire(category_index_key, ttl)
+            # Add to time-ordered category indexes (score = storage time),
+            # dropping members past the retention window while we're here
+            success_index_key = f"{category_index_key}{self.SUCCESS_INDEX_SUFFIX}"
+            pipe.zadd(category_index_key, {ticket_id: score})
+            if success:
+                pipe.zadd(success_index_key, {ticket_id: score})
+            for index_key in (category_index_key, success_index_key):
+                self._trim_index(pipe, index_key, score)
+                pipe.expire(index_key, max(ttl, self.index_retention))
             
             pipe.execute()
             return True
@@ -95,7 +119,7 @@ class RedisDB:
         only_successful: bool = False
     ) -> List[Dict[str, Any]]:
         """
-        Fetch similar ticket resolutions by category using indexed lookup
+        Fetch the newest ticket resolutions for a category
         
         Args:
             category: Category to search for
@@ -103,38 +127,46 @@ class RedisDB:
             only_successful: Only return successful resolutions
         
         Returns:
-            List of resolution dictionaries
+            List of resolution dictionaries, newest first
         """
         try:
-            category_index_key = f"{self.CATEGORY_INDEX_PREFIX}{category.lower()}"
-            
-            # Get ticket IDs from category index (O(1) lookup)
-            ticket_ids = self.client.smembers(category_index_key)
+            index_key = f"{self.CATEGORY_INDEX_PREFIX}{category.lower()}"
+            if only_successful:
+                index_key = f"{index_key}{self.SUCCESS_INDEX_SUFFIX}"
             
-            if not ticket_ids:
-                return []
-            
-            # Fetch ticket data using pipeline for efficiency
-            pipe = self.client.pipeline()
-            for ticket_id in ticket_ids:
-                pipe.hgetall(f"{self.TICKET_PREFIX}{ticket_id}")
-            
-            results = pipe.execute()
-            
-            # Filter and collect results
             similar_resolutions = []
-            for data in results:
-                if not data:  # Skip expired/deleted tickets
-                    continue
-                
-                # Filter by success if requested
-                if only_successful and data.get("success") != "1":
-                    continue
+            dead_ids = []
+            start = 0
+            while len(similar_resolutions) < limit:
+                pipe = self.client.pipeline()
+                if start == 0:
+                    # Trim members past retention in the same round trip
+                    self._trim_index(pipe, index_key, self._index_score(datetime.utcnow()))
+                # Read only the next `limit` newest IDs (O(log N + limit))
+                pipe.zrevrange(index_key, start, start + limit - 1)
+                ticket_ids = pipe.execute()[-1]
+                if not ticket_ids:
+                    break
+                start += len(ticket_ids)
                 
-                similar_resolutions.append(data)
+                # Fetch ticket data using pipeline for efficiency
+                pipe = self.client.pipeline()
+                for ticket_id in ticket_ids:
+                    pipe.hgetall(f"{self.TICKET_PREFIX}{ticket_id}")
                 
-                if len(similar_resolutions) >= limit:
-                    break
+                for ticket_id, data in zip(ticket_ids, pipe.execute()):
+                    if not data:  # Expired early (short TTL) or deleted
+                        dead_ids.append(ticket_id)
+                        continue
+                    similar_resolutions.append(data)
+                    if len(similar_resolutions) >= limit:
+                        break
+            
+            if dead_ids:
+                # Unlink so later lookups never touch them again
+                pipe = self.client.pipeline()
+                self._remove_from_indexes(pipe, category.lower(), dead_ids)
+                pipe.execute()
             
             return similar_resolutions
             
@@ -180,16 +212,230 @@ class RedisDB:
             
             category = data.get("category")
             
-            # Delete ticket and remove from category index
+            # Delete ticket and remove from category indexes
             pipe = self.client.pipeline()
             pipe.delete(ticket_key)
             if category:
-                category_index_key = f"{self.CATEGORY_INDEX_PREFIX}{category}"
-                pipe.srem(category_index_key, ticket_id)
+                self._remove_from_indexes(pipe, category, [ticket_id])
             pipe.execute()
             
             return True
             
         except redis.RedisError as e:
             print(f"Error deleting ticket {ticket_id}: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def migrate_category_indexes(self) -> int:
+        """
+        Convert set-based category indexes to time-ordered sorted sets
+
+        Each member is scored by its ticket's stored timestamp; members whose
+        ticket hash has expired are dropped. Run with workers stopped, since
+        writes to a key that is still a set fail until it is converted.
+
+        Returns:
+            Number of indexes migrated
+        """
+        migrated = 0
+        try:
+            for index_key in self.client.scan_iter(match=f"{self.CATEGORY_INDEX_PREFIX}*"):
+                if self.client.type(index_key) != "set":
+                    continue
+                
+                ticket_ids = list(self.client.smembers(index_key))
+                pipe = self.client.pipeline()
+                for ticket_id in ticket_ids:
+                    pipe.hmget(f"{self.TICKET_PREFIX}{ticket_id}", "timestamp", "success")
+                
+                scores, successful = {}, {}
+                for ticket_id, (timestamp, success) in zip(ticket_ids, pipe.execute()):
+                    if not timestamp:  # Ticket hash expired
+                        continue
+                    scores[ticket_id] = self._index_score(datetime.fromisoformat(timestamp))
+                    if success == "1":
+                        successful[ticket_id] = scores[ticket_id]
+                
+                ttl = self.client.ttl(index_key)
+                success_index_key = f"{index_key}{self.SUCCESS_INDEX_SUFFIX}"
+                
+                # MULTI/EXEC so readers never see a half-built index
+                pipe = self.client.pipeline(transaction=True)
+                pipe.delete(index_key)
+                for key, members in ((index_key, scores), (success_index_key, successful)):
+                    if not members:
+                        continue
+                    pipe.zadd(key, members)
+                    if ttl > 0:
+                        pipe.expire(key, ttl)
+                pipe.execute()
+                
+                migrated += 1
+                print(f"Migrated {index_key}: {len(scores)} tickets ({len(successful)} successful)")
+            
+            return migrated
+            
+        except redis.RedisError as e:
+            print(f"Error migrating category indexes: {e}")
+            return migrated
+
+    @staticmethod
+    def _index_score(timestamp: datetime) -> float:
+        """Sorted set score for a naive UTC timestamp"""
+        return timestamp.replace(tzinfo=timezone.utc).timestamp()
+
+    def _trim_index(self, pipe, index_key: str, now_score: float) -> None:
+        """Queue removal of index members older than the retention window"""
+        pipe.zremrangebyscore(index_key, "-inf", f"({now_score - self.index_retention}")
+
+    def _remove_from_indexes(self, pipe, category: str, ticket_ids: List[str]) -> None:
+        """Queue removal of tickets from a category's indexes"""
+        category_index_key = f"{self.CATEGORY_INDEX_PREFIX}{category}"
+        pipe.zrem(category_index_key, *ticket_ids)
+        pipe.zrem(f"{category_index_key}{self.SUCCESS_INDEX_SUFFIX}", *ticket_ids)
+
+    def get_cached_response(self, key: str) -> Optional[str]:
+        """
+        Get a cached Claude response
+
+        Args:
+            key: Content hash from ResponseCache.make_key
+
+        Returns:
+            Response text or None if missing/expired
+        """
+        try:
+            return self.client.get(f"{self.LLM_CACHE_PREFIX}{key}")
+        except redis.RedisError as e:
+            print(f"Error fetching cached response {key}: {e}")
+            return None
+
+    def cache_response(self, key: str, text: str, ttl: int) -> bool:
+        """
+        Cache a Claude response
+
+        Args:
+            key: Content hash from ResponseCache.make_key
+            text: Response text
+            ttl: Time to live in seconds
+
+        Returns:
+            bool: True if stored successfully
+        """
+        try:
+            self.client.set(f"{self.LLM_CACHE_PREFIX}{key}", text, ex=ttl)
+            return True
+        except redis.RedisError as e:
+            print(f"Error caching response {key}: {e}")
+            return False
+
+    def store_ticket_signature(self, ticket_id: str, bands: List[str], data: str, ttl: int) -> bool:
+        """
+        Index a processed ticket's MinHash signature for duplicate detection
+
+        Args:
+            ticket_id: Ticket ID
+            bands: LSH band keys of the signature
+            data: Serialized signature and reusable pipeline results
+            ttl: Time to live in seconds
+
+        Returns:
+            bool: True if stored successfully
+        """
+        try:
+            now = self._index_score(datetime.utcnow())
+            pipe = self.client.pipeline()
+            pipe.set(f"{self.SIGNATURE_PREFIX}{ticket_id}", data, ex=ttl)
+            for band in bands:
+                # Band members are scored by expiry so stale ones can be trimmed
+                band_key = f"{self.SIGNATURE_BAND_PREFIX}{band}"
+                pipe.zadd(band_key, {ticket_id: now + ttl})
+                pipe.zremrangebyscore(band_key, "-inf", now)
+                pipe.expire(band_key, ttl)
+            pipe.execute()
+            return True
+        except redis.RedisError as e:
+            print(f"Error storing signature for {ticket_id}: {e}")
+            return False
+
+    def fetch_signature_candidates(self, bands: List[str]) -> Dict[str, str]:
+        """
+        Fetch tickets sharing at least one LSH band
+
+        Args:
+            bands: LSH band keys of the new ticket's signature
+
+        Returns:
+            Dict of ticket ID to serialized signature data
+        """
+        try:
+            now = self._index_score(datetime.utcnow())
+            pipe = self.client.pipeline()
+            for band in bands:
+                # Only members that haven't expired yet
+                pipe.zrangebyscore(f"{self.SIGNATURE_BAND_PREFIX}{band}", now, "+inf")
+            ticket_ids = list(set().union(*pipe.execute()))
+            if not ticket_ids:
+                return {}
+
+            values = self.client.mget([f"{self.SIGNATURE_PREFIX}{tid}" for tid in ticket_ids])
+            # Skip expired entries still listed in a band
+            return {tid: value for tid, value in zip(ticket_ids, values) if value}
+        except redis.RedisError as e:
+            print(f"Error fetching signature candidates: {e}")
+            return {}
+
+    def publish_ticket_events(self, events: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Append ticket change events to the change-feed stream
+
+        Args:
+            events: Dicts with "ticket_id" and "event" (e.g. created, processed)
+
+        Returns:
+            ID of the last appended entry, or None on error
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for event in events:
+                pipe.xadd(self.TICKET_EVENTS_STREAM, event,
+                          maxlen=self.TICKET_EVENTS_MAXLEN, approximate=True)
+            ids = pipe.execute()
+            return ids[-1] if ids else None
+        except redis.RedisError as e:
+            print(f"Error publishing ticket events: {e}")
+            return None
+
+    def read_ticket_events(self, after_id: str, count: int) -> Optional[List[tuple]]:
+        """
+        Read change-feed events newer than `after_id`, oldest first
+
+        Args:
+            after_id: Stream ID of the last event the caller has seen ("0-0" for all)
+            count: Maximum number of events
+
+        Returns:
+            List of (event_id, fields) tuples, or None on error
+        """
+        try:
+            # Exclusive start: "(" skips the event the caller already has
+            return self.client.xrange(self.TICKET_EVENTS_STREAM, min=f"({after_id}", count=count)
+        except redis.RedisError as e:
+            print(f"Error reading ticket events: {e}")
+            return None
+
+    def ticket_events_bounds(self) -> Optional[tuple]:
+        """
+        First and last retained change-feed event IDs
+
+        Returns:
+            (first_id, last_id), both None when the stream is empty; None on error
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.xrange(self.TICKET_EVENTS_STREAM, count=1)
+            pipe.xrevrange(self.TICKET_EVENTS_STREAM, count=1)
+            first, last = pipe.execute()
+            return (first[0][0] if first else None, last[0][0] if last else None)
+        except redis.RedisError as e:
+            print(f"Error reading ticket event bounds: {e}")
+            return None
@@ -0,0 +1,166 @@
+"""
+Ticket Serialization
+--------------------
+Turns Ticket rows (with eager-loaded relations) into API responses for the
+list, detail and export endpoints. Each schema is compiled once into a
+tuple of (field, getter) pairs, so serializing a ticket is a single pass
+with no per-field branching.
+
+JSON encoding uses orjson when it is installed (`pip install orjson`),
+both for Flask responses (see configure_json) and for NDJSON exports, and
+falls back to the standard library otherwise.
+"""
+
+import json
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from flask.json.provider import DefaultJSONProvider
+
+from models import Ticket, Workflow_log
+
+try:
+    import orjson
+except ImportError:  # Optional speedup
+    orjson = None
+
+# Fields a client may request through ?fields=
+LIST_FIELDS = (
+    "id", "user_email", "subject", "description", "status", "created_at",
+    "updated_at", "classification", "diagnosis", "solution", "assigned_people"
+)
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class RowSchema:
+    """Precompiled column-to-dict mapping for one model"""
+
+    __slots__ = ("columns", "timestamps", "_get")
+
+    def __init__(self, columns: Sequence[str], timestamps: bool = False):
+        """
+        Args:
+            columns: Attributes copied as-is, in response order
+            timestamps: Also emit created_at/updated_at as ISO 8601 strings
+        """
+        self.columns = tuple(columns)
+        self.timestamps = timestamps
+        self._get = attrgetter(*self.columns)
+
+    def dump(self, row) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        data = dict(zip(self.columns, self._get(row)))
+        if self.timestamps:
+            data["created_at"] = _iso(row.created_at)
+            data["updated_at"] = _iso(row.updated_at)
+        return data
+
+
+CLASSIFICATION = RowSchema(("category", "urgency", "expertise_level", "reasoning"))
+DIAGNOSIS = RowSchema(("diagnosis", "potential_causes", "recommended_tests"))
+SOLUTION = RowSchema(("solution", "tools_needed", "estimated_time", "confidence"))
+
+# Detail view also reports when each stage ran
+CLASSIFICATION_DETAIL = RowSchema(CLASSIFICATION.columns, timestamps=True)
+DIAGNOSIS_DETAIL = RowSchema(DIAGNOSIS.columns, timestamps=True)
+SOLUTION_DETAIL = RowSchema(SOLUTION.columns, timestamps=True)
+
+
+def _assigned_people(ticket: Ticket):
+    # Assignments arrive with their users already loaded
+    return [
+        {
+            "role": assignment.role,
+            "name": assignment.user.name,
+            "email": assignment.user.email,
+            "specialization": assignment.user.specialization,
+            "tier_level": assignment.user.tier_level,
+            "assigned_at": _iso(assignment.assigned_at)
+        }
+        for assignment in ticket.assignments if assignment.user
+    ]
+
+
+# Getter for every field a ticket response can contain
+TICKET_FIELDS: Dict[str, Callable[[Ticket], Any]] = {
+    "id": attrgetter("id"),
+    "user_email": attrgetter("user_email"),
+    "subject": attrgetter("subject"),
+    "description": attrgetter("description"),
+    "status": lambda ticket: ticket.status.value,
+    "created_at": lambda ticket: _iso(ticket.created_at),
+    "updated_at": lambda ticket: _iso(ticket.updated_at),
+    "duplicate_of": attrgetter("duplicate_of"),
+    "classification": lambda ticket: CLASSIFICATION.dump(ticket.classification),
+    "diagnosis": lambda ticket: DIAGNOSIS.dump(ticket.diagnostic),
+    "solution": lambda ticket: SOLUTION.dump(ticket.solution),
+    "assigned_people": _assigned_people
+}
+
+DETAIL_FIELDS = {
+    **TICKET_FIELDS,
+    "classification": lambda ticket: CLASSIFICATION_DETAIL.dump(ticket.classification),
+    "diagnosis": lambda ticket: DIAGNOSIS_DETAIL.dump(ticket.diagnostic),
+    "solution": lambda ticket: SOLUTION_DETAIL.dump(ticket.solution)
+}
+
+
+@lru_cache(maxsize=128)
+def compile_ticket_schema(fields: Tuple[str, ...]) -> Tuple[Tuple[str, Callable], ...]:
+    """(field, getter) pairs for a list response projection, built once per field set"""
+    return tuple((field, TICKET_FIELDS[field]) for field in fields)
+
+
+def serialize_list_item(ticket: Ticket, fields: Sequence[str]) -> Dict[str, Any]:
+    """Serialize a ticket for the list endpoint, building only requested fields"""
+    return {field: get(ticket) for field, get in compile_ticket_schema(tuple(fields))}
+
+
+_DETAIL_SCHEMA = tuple(
+    (field, DETAIL_FIELDS[field]) for field in (
+        "id", "user_email", "subject", "description", "status", "created_at", "updated_at",
+        "duplicate_of", "classification", "diagnosis", "solution", "assigned_people"
+    )
+)
+
+
+def serialize_ticket_detail(ticket: Ticket, log: Optional[Workflow_log]) -> Dict[str, Any]:
+    """Serialize a ticket with its pipeline output for the detail endpoint"""
+    data = {field: get(ticket) for field, get in _DETAIL_SCHEMA}
+    data["workflow_log"] = log.log_entries if log else []
+    return data
+
+
+def dumps(obj: Any) -> str:
+    """Encode compact JSON with the fastest available backend"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; encodes values the same way as the default provider"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Dates and dataclasses go through Flask's hook so they encode as before
+        option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                  | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def configure_json(app) -> None:
+    """Use orjson for Flask responses and request parsing when installed"""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,251 @@
+"""
+Ticket Pipeline Worker
+----------------------
+Pulls queued tickets from the job queue, runs them through the Overseer
+and persists the results. Jobs already waiting in the queue are drained
+in batches and saved in one transaction per batch. Runs independently of
+the web tier so worker pools can be scaled separately:
+
+    python src/backend/worker.py
+
+Pass --batch to drain large backlogs through the Message Batches API
+(half price, results within hours instead of seconds), or --async to run
+each batch's pipelines concurrently on an event loop with AsyncOverseer.
+"""
+
+import asyncio
+import sys
+from typing import Any, Dict, List, Tuple
+
+from models import db, Ticket
+from job_queue import JobQueue, JobStatus
+from persistence import save_pipeline_results
+
+# Jobs drained from the queue per transaction
+DEFAULT_BATCH_SIZE = 50
+# With --batch, jobs drained per round of Message Batches
+MESSAGE_BATCH_SIZE = 1000
+# With --async, jobs drained per round (matches AsyncOverseer's default concurrency)
+ASYNC_BATCH_SIZE = 100
+
+
+def process_job(job_id: str, payload: Dict[str, Any], overseer, redis_client,
+                job_queue: JobQueue) -> bool:
+    """
+    Run one queued ticket through the pipeline (requires an app context)
+
+    Args:
+        job_id: ID returned by JobQueue.enqueue
+        payload: {"ticket_id": ..., "ticket": raw submission}
+        overseer: Overseer instance
+        redis_client: RedisDB used for resolution learning (may be None)
+        job_queue: Queue to report status to
+
+    Returns:
+        bool: True if the ticket was processed and saved
+    """
+    return process_jobs([(job_id, payload)], overseer, redis_client, job_queue) == 1
+
+
+def process_jobs(jobs: List[Tuple[str, Dict[str, Any]]], overseer, redis_client,
+                 job_queue: JobQueue) -> int:
+    """
+    Run a batch of queued tickets through the pipeline and save them together
+
+    Tickets go through Overseer.process_many (one by one, or as Message
+    Batches with a BatchOverseer); the successful results are then written
+    in a single transaction with one statement per table. If that
+    transaction fails, tickets are saved one at a time so only the
+    offending jobs fail.
+
+    Args:
+        jobs: (job_id, payload) pairs from JobQueue.dequeue_batch
+        overseer: Overseer instance
+        redis_client: RedisDB used for resolution learning (may be None)
+        job_queue: Queue to report status to
+
+    Returns:
+        int: Number of tickets processed and saved
+    """
+    ticket_ids = [payload["ticket_id"] for _, payload in jobs]
+    existing = set(db.session.scalars(db.select(Ticket.id).where(Ticket.id.in_(ticket_ids))))
+
+    runnable = []
+    for job_id, payload in jobs:
+        job_queue.set_status(job_id, JobStatus.RUNNING)
+        if payload["ticket_id"] not in existing:
+            job_queue.set_status(job_id, JobStatus.FAILED, error="Ticket not found")
+            continue
+        runnable.append((job_id, payload))
+
+    processed = []
+    overseer_results = overseer.process_many([payload["ticket"] for _, payload in runnable])
+    for (job_id, payload), overseer_result in zip(runnable, overseer_results):
+        if not overseer_result or "error" in overseer_result:
+            error = overseer_result.get("error") if overseer_result else "Failed to process ticket"
+            job_queue.set_status(job_id, JobStatus.FAILED, error=error)
+            continue
+        processed.append((job_id, payload, overseer_result))
+
+    processed = save_processed(processed, job_queue)
+    if not processed:
+        return 0
+
+    # Tell change-feed clients, one round trip for the whole batch
+    if redis_client:
+        redis_client.publish_ticket_events([
+            {"ticket_id": payload["ticket_id"], "event": "processed"} for _, payload, _ in processed
+        ])
+
+    for job_id, payload, overseer_result in processed:
+        ticket_id = payload["ticket_id"]
+        classification_result = overseer_result["classification"]
+        solution_result = overseer_result["solution"]
+        duplicate_of = overseer_result.get("duplicate_of")
+        overseer.remember(ticket_id, payload["ticket"], overseer_result)
+
+        # Store in Redis for learning (a duplicate adds nothing new)
+        if redis_client and not duplicate_of:
+            redis_client.store_resolution(
+                ticket_id=ticket_id,
+                category=classification_result["category"],
+                solution=solution_result["solution"],
+                success=True
+            )
+
+        job_queue.set_status(job_id, JobStatus.COMPLETED, result={
+            "ticket_id": ticket_id,
+            "category": classification_result['category'],
+            "urgency": classification_result['urgency'],
+            "solution_preview": solution_result['solution'][:100] + "...",
+            "duplicate_of": duplicate_of
+        })
+    return len(processed)
+
+
+def save_processed(processed: List[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+                   job_queue: JobQueue) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Save pipeline results in one transaction, falling back to one per ticket
+
+    Args:
+        processed: (job_id, payload, overseer_result) triples
+        job_queue: Queue to report failed saves to
+
+    Returns:
+        The triples that were saved
+    """
+    if not processed:
+        return []
+
+    try:
+        save_pipeline_results([(payload["ticket_id"], result) for _, payload, result in processed])
+        db.session.commit()
+        return processed
+    except Exception as e:
+        db.session.rollback()
+        if len(processed) == 1:
+            print(f"Error: {e}")
+            job_queue.set_status(processed[0][0], JobStatus.FAILED, error="Database error")
+            return []
+        print(f"Error saving batch, retrying one ticket at a time: {e}")
+
+    saved = []
+    for job in processed:
+        saved.extend(save_processed([job], job_queue))
+    return saved
+
+
+class EventLoopOverseer:
+    """
+    Drives an AsyncOverseer from the synchronous worker loop
+
+    Every batch runs on the same event loop, so the async client's pooled
+    connections (which belong to the loop that opened them) are reused.
+    """
+
+    def __init__(self, overseer, loop: asyncio.AbstractEventLoop):
+        self.overseer = overseer
+        self.loop = loop
+
+    def process_many(self, raw_tickets: List[Dict]) -> List[Dict]:
+        return self.loop.run_until_complete(self.overseer.process_many(raw_tickets))
+
+    def remember(self, ticket_id: str, raw_ticket, overseer_result) -> None:
+        self.overseer.remember(ticket_id, raw_ticket, overseer_result)
+
+    def token_usage(self) -> Dict[str, Dict[str, Any]]:
+        return self.overseer.token_usage()
+
+
+def print_token_usage(overseer) -> None:
+    """Print cumulative token usage and prompt-cache hit rate per agent"""
+    for name, usage in overseer.token_usage().items():
+        if usage["calls"]:
+            print(f"[{name}] calls={usage['calls']} input={usage['input_tokens']} "
+                  f"cache_write={usage['cache_creation_input_tokens']} "
+                  f"cache_read={usage['cache_read_input_tokens']} "
+                  f"output={usage['output_tokens']} "
+                  f"cache_read_ratio={usage['cache_read_ratio']:.0%}")
+
+
+def run_worker(app, overseer, redis_client, job_queue: JobQueue, poll_timeout: int = 5,
+               batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """Process jobs forever, saving up to `batch_size` already queued jobs per transaction"""
+    print("Worker started, waiting for jobs...")
+    while True:
+        jobs = job_queue.dequeue_batch(batch_size, timeout=poll_timeout)
+        if not jobs:
+            continue
+
+        print(f"Processing {len(jobs)} job(s): {', '.join(job_id for job_id, _ in jobs)}")
+        with app.app_context():
+            try:
+                process_jobs(jobs, overseer, redis_client, job_queue)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Unexpected error in batch: {e}")
+                for job_id, _ in jobs:
+                    job = job_queue.get_status(job_id)
+                    if job and job["status"] not in (JobStatus.COMPLETED, JobStatus.FAILED):
+                        job_queue.set_status(job_id, JobStatus.FAILED, error=str(e))
+            finally:
+                db.session.remove()
+        print_token_usage(overseer)
+
+
+if __name__ == '__main__':
+    from app import app, redis_client, job_queue
+    from duplicate_detector import DuplicateDetector
+    from mas_agents.clients import async_warm_up, get_async_client, get_client, warm_up
+    from mas_agents.response_cache import ResponseCache
+    from overseer import AsyncOverseer, BatchOverseer, Overseer
+
+    # Shared by every mode; the web tier only enqueues
+    response_cache = ResponseCache(redis_db=redis_client)
+    duplicate_detector = DuplicateDetector(redis_db=redis_client)
+
+    # Each mode warms up the pooled client it calls Claude with
+    if sys.argv[1:] == ["--async"]:
+        loop = asyncio.new_event_loop()
+        async_client = get_async_client()
+        loop.run_until_complete(async_warm_up(async_client))
+        async_overseer = AsyncOverseer(async_client, redis_client, max_concurrency=ASYNC_BATCH_SIZE,
+                                       response_cache=response_cache,
+                                       duplicate_detector=duplicate_detector)
+        run_worker(app, EventLoopOverseer(async_overseer, loop), redis_client, job_queue,
+                   batch_size=ASYNC_BATCH_SIZE)
+    elif sys.argv[1:] == ["--batch"]:
+        anthropic_client = get_client()
+        warm_up(anthropic_client)
+        # Backlog mode: cheaper, but each round waits for its batches to end
+        batch_overseer = BatchOverseer(anthropic_client, redis_client,
+                                       response_cache=response_cache,
+                                       duplicate_detector=duplicate_detector)
+        run_worker(app, batch_overseer, redis_client, job_queue, batch_size=MESSAGE_BATCH_SIZE)
+    else:
+        anthropic_client = get_client()
+        warm_up(anthropic_client)
+        overseer = Overseer(anthropic_client, redis_client, response_cache=response_cache,
+                            duplicate_detector=duplicate_detector)
+        run_worker(app, overseer, redis_client, job_queue)
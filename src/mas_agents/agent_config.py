@@ -0,0 +1,98 @@
+"""
+Per-agent request settings
+
+Each agent's Messages API call is shaped by an AgentConfig looked up by
+agent name: model tier, max_tokens, default temperature, stop sequences,
+read timeout and how long its responses stay in the ResponseCache.
+Intake and classification sit on the critical path of every ticket and
+return a few hundred tokens of JSON, so they default to the fast tier
+(FAST_MODEL) with tight output caps. Diagnosis and the solution use the
+default tier (MODEL). Without FAST_MODEL set, every tier falls back to
+MODEL.
+
+Read timeouts are sized roughly in proportion to each agent's output.
+Intake and classification depend only on the ticket text, so their
+responses are cached longer than diagnosis and solutions, which should
+pick up prompt or knowledge changes sooner.
+
+Models are resolved from the environment when an agent is constructed, not
+on every call. Change a setting for new agents with configure_agent().
+"""
+
+from dataclasses import dataclass, replace
+from os import getenv
+from typing import Dict, Optional, Tuple
+
+# Read timeout and response cache TTL for unregistered agents (in seconds)
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_CACHE_TTL = 60 * 60
+
+# Environment variable naming the model for each tier
+MODEL_TIERS = {
+    "default": "MODEL",
+    "fast": "FAST_MODEL"
+}
+
+
+@dataclass(frozen=True)
+class AgentConfig:
+    """
+    Messages API settings for one agent
+
+    Args:
+        tier: Key of MODEL_TIERS used when `model` isn't set
+        model: Explicit model ID (overrides the tier)
+        max_tokens: Output token cap
+        temperature: Default temperature (a call may pass its own)
+        stop_sequences: Strings that end generation early
+        timeout: Read timeout in seconds for one call
+        cache_ttl: Seconds a response stays in the ResponseCache
+    """
+    tier: str = "default"
+    model: Optional[str] = None
+    max_tokens: int = 4096
+    temperature: float = 1.0
+    stop_sequences: Tuple[str, ...] = ()
+    timeout: float = DEFAULT_TIMEOUT
+    cache_ttl: int = DEFAULT_CACHE_TTL
+
+    def __post_init__(self):
+        if self.tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model tier: {self.tier}")
+        # Accept any sequence but keep the config hashable
+        object.__setattr__(self, "stop_sequences", tuple(self.stop_sequences))
+
+    def resolve_model(self) -> Optional[str]:
+        """Model ID to send: the explicit model, the tier's, or MODEL"""
+        return self.model or getenv(MODEL_TIERS[self.tier]) or getenv(MODEL_TIERS["default"])
+
+
+DEFAULT_CONFIG = AgentConfig()
+
+# Output caps leave headroom over each agent's JSON response
+AGENT_CONFIGS: Dict[str, AgentConfig] = {
+    "IntakeAgent": AgentConfig(tier="fast", max_tokens=1024, temperature=0.2,
+                               timeout=30.0, cache_ttl=6 * 60 * 60),
+    "ClassifierAgent": AgentConfig(tier="fast", max_tokens=512, temperature=0.2,
+                                   timeout=30.0, cache_ttl=6 * 60 * 60),
+    "ClassifierAgentLite": AgentConfig(tier="fast", max_tokens=256, temperature=0.3,
+                                       timeout=20.0, cache_ttl=6 * 60 * 60),
+    "DiagnosticAgent": AgentConfig(max_tokens=1536, timeout=60.0),
+    "SolutionAgent": AgentConfig(max_tokens=4096, timeout=90.0)
+}
+
+
+def agent_config(agent_name: str) -> AgentConfig:
+    """Settings registered for an agent (DEFAULT_CONFIG if none)"""
+    return AGENT_CONFIGS.get(agent_name, DEFAULT_CONFIG)
+
+
+def configure_agent(agent_name: str, **changes) -> AgentConfig:
+    """
+    Change an agent's registered settings; applies to agents built afterwards
+
+    Example:
+        configure_agent("SolutionAgent", max_tokens=6000, temperature=0.7)
+    """
+    AGENT_CONFIGS[agent_name] = replace(agent_config(agent_name), **changes)
+    return AGENT_CONFIGS[agent_name]
@@ -1,16 +1,45 @@
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
+import json
 import os
+import threading
 from dotenv import load_dotenv
-from os import getenv
+from typing import List, Optional
+
+from .agent_config import agent_config
+from .clients import request_timeout
+from .request_governor import RequestGovernor, shared_governor
+from .response_cache import ResponseCache
 
 load_dotenv()
 
+# Token counters reported by Messages API responses
+USAGE_FIELDS = (
+    "input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"
+)
+
+
 class BaseAgent:
-    def __init__(self, client: Anthropic, name: str = "BaseAgent"):
+    # Mark the system prompt as a prompt-cache breakpoint. Prompts shorter
+    # than the model's minimum cacheable length are sent uncached by the API.
+    cache_system_prompt = True
+
+    def __init__(self, client: Anthropic, name: str = "BaseAgent",
+                 cache: Optional[ResponseCache] = None,
+                 governor: Optional[RequestGovernor] = None):
         self.client = client
         self.name = name
-    
-    def call_claude(self, messages: list, system_prompt: str, temperature: float = 1.0) -> str:
+        self.cache = cache
+        # Shared by every agent in the process unless one is passed in
+        self.governor = governor or shared_governor()
+        # Model, token cap, sampling, timeout and cache TTL (see agent_config.AGENT_CONFIGS)
+        self.config = agent_config(name)
+        self.model = self.config.resolve_model()
+        self.timeout = request_timeout(self.config.timeout)
+        self._usage = dict.fromkeys(("calls",) + USAGE_FIELDS, 0)
+        self._usage_lock = threading.Lock()
+
+    def call_claude(self, messages: list, system_prompt: str,
+                    temperature: Optional[float] = None) -> str:
         """
         Call Claude API and return response text
 
@@ -18,29 +47,227 @@ class BaseAgent:
             messages: List of message dictionaries for the conversation
             system_prompt: System prompt defining agent behavior
             temperature: Controls randomness (0.0-1.0). Lower = more deterministic.
-                        Default is 1.0 for creative responses.
+                        Defaults to the agent's configured temperature.
                         Use 0.2-0.3 for consistent, factual outputs.
 
         Returns:
-            Response text from Claude or None if error occurs
+            Response text from Claude or None if error occurs (after the
+            governor's retries, or straight away while its circuit is open).
+            The response is not cached; process() caches it once it parses.
+        """
+        text, _ = self._complete(self._request_params(messages, system_prompt, temperature))
+        return text
+
+    def _complete(self, params: dict):
         """
+        Answer a request from the cache or Claude
+
+        Returns:
+            (text, cache key): the key to store the text under once it
+            parses; None when not caching, on a cache hit, or when the reply
+            was cut off at max_tokens
+        """
+        cache_key, cached = self._cache_lookup(params)
+        if cached is not None:
+            return cached, None
+
         try:
-            response = self.client.messages.create(
-                model=getenv('MODEL'),
-                max_tokens=4096,
-                temperature=temperature,
-                system=system_prompt,
-                messages=messages
+            response = self.governor.call(
+                lambda: self.client.messages.create(**params, timeout=self.timeout),
+                self._estimate_tokens(params)
             )
-            return response.content[0].text
+            text = response.content[0].text
         except Exception as e:
             self.log_action(f"Error: {e}")
+            return None, None
+
+        self._record_usage(response)
+        return text, self._storable_key(cache_key, response)
+
+    def _request_params(self, messages: list, system_prompt: str,
+                        temperature: Optional[float] = None) -> dict:
+        """Build keyword arguments for messages.create (shared by sync and async agents)"""
+        params = {
+            "model": self.model,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature if temperature is None else temperature,
+            "system": self._system_blocks(system_prompt),
+            "messages": messages
+        }
+        if self.config.stop_sequences:
+            params["stop_sequences"] = list(self.config.stop_sequences)
+        return params
+
+    def _system_blocks(self, system_prompt: str):
+        """System prompt as a content block the API can cache between calls"""
+        if not self.cache_system_prompt:
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+    @staticmethod
+    def _estimate_tokens(params: dict) -> int:
+        """Rough input token count (~4 characters per token) for rate pacing"""
+        return len(json.dumps(params["system"])) // 4 + len(json.dumps(params["messages"])) // 4
+
+    def _record_usage(self, response) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        with self._usage_lock:
+            self._usage["calls"] += 1
+            for field in USAGE_FIELDS:
+                self._usage[field] += getattr(usage, field, None) or 0
+
+    def get_usage(self) -> dict:
+        """
+        Token usage of this agent's Claude calls so far
+
+        Returns:
+            Counters for calls, input/output tokens, prompt-cache writes
+            (cache_creation_input_tokens) and reads (cache_read_input_tokens),
+            plus cache_read_ratio: share of prompt tokens served from cache
+        """
+        with self._usage_lock:
+            usage = dict(self._usage)
+        prompt_tokens = (usage["input_tokens"] + usage["cache_creation_input_tokens"]
+                         + usage["cache_read_input_tokens"])
+        usage["cache_read_ratio"] = (
+            usage["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        )
+        return usage
+
+    def _cache_lookup(self, params: dict):
+        """Return (cache key, cached text); key is None when not caching"""
+        if self.cache is None:
+            return None, None
+        cache_key, cached = self.cache.lookup(params)
+        if cached is not None:
+            self.log_action("Using cached response")
+        return cache_key, cached
+
+    def _storable_key(self, cache_key: Optional[str], response) -> Optional[str]:
+        """Cache key for a fresh response, or None if it was truncated"""
+        if getattr(response, "stop_reason", None) == "max_tokens":
+            self.log_action("Response hit max_tokens; not caching it")
             return None
-    
+        return cache_key
+
+    def _cache_store(self, cache_key: Optional[str], text: str) -> None:
+        if cache_key is not None and text:
+            self.cache.store(cache_key, text, self.config.cache_ttl)
+
+    def _parse_and_cache(self, text: str, cache_key: Optional[str]):
+        """Parse a response, caching it only if parsing succeeded"""
+        output = self.parse_response(text)
+        if output is not None:
+            self._cache_store(cache_key, text)
+        return output
+
     def log_action(self, action: str):
         """Log agent actions"""
         print(f"[{self.name}] {action}")
-    
-    def process(self, input_data):
-        """Must be implemented by subclasses"""
-        raise NotImplementedError(f"{self.name} must implement process()")
\ No newline at end of file
+
+    def build_request(self, *input_data) -> dict:
+        """
+        Build the Claude request for one input
+
+        Returns:
+            dict with messages, system_prompt and optional temperature
+        """
+        raise NotImplementedError(f"{self.name} must implement build_request()")
+
+    def parse_response(self, response: str):
+        """Turn Claude's response text into the agent's output"""
+        raise NotImplementedError(f"{self.name} must implement parse_response()")
+
+    def process(self, *input_data):
+        """Run one input through Claude"""
+        params = self._request_params(**self.build_request(*input_data))
+        response, cache_key = self._complete(params)
+        if not response:
+            self.log_action("Failed to get response from Claude")
+            return None
+        return self._parse_and_cache(response, cache_key)
+
+    def process_batch(self, inputs: List[tuple], batch_runner) -> List:
+        """
+        Run many inputs through Claude as a Message Batch
+
+        Inputs with a cached response are answered from the cache and left
+        out of the batch.
+
+        Args:
+            inputs: Argument tuples for build_request, one per input
+            batch_runner: MessageBatchRunner that submits and polls the batch
+
+        Returns:
+            Parsed output per input, in order (None where the request failed)
+        """
+        outputs = [None] * len(inputs)
+        requests, pending = {}, {}
+        for index, args in enumerate(inputs):
+            params = self._request_params(**self.build_request(*args))
+            cache_key, cached = self._cache_lookup(params)
+            if cached is not None:
+                outputs[index] = self.parse_response(cached)
+                continue
+            custom_id = f"{self.name}-{index}"
+            requests[custom_id] = params
+            pending[custom_id] = (index, cache_key)
+
+        for custom_id, message in batch_runner.run(requests).items():
+            index, cache_key = pending[custom_id]
+            if message is None:
+                self.log_action(f"Batch request {custom_id} failed")
+                continue
+            self._record_usage(message)
+            outputs[index] = self._parse_and_cache(
+                message.content[0].text, self._storable_key(cache_key, message)
+            )
+        return outputs
+
+
+class AsyncBaseAgent(BaseAgent):
+    """
+    Asyncio variant of BaseAgent backed by AsyncAnthropic
+
+    Combine with a concrete agent to reuse its prompt and parsing, e.g.
+    `class AsyncIntakeAgent(AsyncBaseAgent, IntakeAgent)` constructed with an
+    AsyncAnthropic client. In-flight calls wait on the event loop instead of
+    pinning an OS thread each. Cache lookups stay synchronous: the memory
+    tier is a dict access and the Redis tier a single GET.
+    """
+
+    async def call_claude(self, messages: list, system_prompt: str,
+                          temperature: Optional[float] = None) -> str:
+        """Async counterpart of BaseAgent.call_claude"""
+        text, _ = await self._complete(self._request_params(messages, system_prompt, temperature))
+        return text
+
+    async def _complete(self, params: dict):
+        """Async counterpart of BaseAgent._complete"""
+        cache_key, cached = self._cache_lookup(params)
+        if cached is not None:
+            return cached, None
+
+        try:
+            response = await self.governor.acall(
+                lambda: self.client.messages.create(**params, timeout=self.timeout),
+                self._estimate_tokens(params)
+            )
+            text = response.content[0].text
+        except Exception as e:
+            self.log_action(f"Error: {e}")
+            return None, None
+
+        self._record_usage(response)
+        return text, self._storable_key(cache_key, response)
+
+    async def process(self, *input_data):
+        """Run one input through Claude without blocking the event loop"""
+        params = self._request_params(**self.build_request(*input_data))
+        response, cache_key = await self._complete(params)
+        if not response:
+            self.log_action("Failed to get response from Claude")
+            return None
+        return self._parse_and_cache(response, cache_key)
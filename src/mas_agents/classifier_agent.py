@@ -1,15 +1,7 @@
-from .base_agent import BaseAgent
+from .base_agent import AsyncBaseAgent, BaseAgent
 import json
 
-#Agent used to classify tickets into categories, urgency levels, and expertise levels
-class ClassifierAgent(BaseAgent):
-    def __init__(self, client):
-        super().__init__(client, name="ClassifierAgent")
-    
-    def process(self, parsed_ticket):
-        self.log_action("Classifying ticket")
-        
-        system_prompt = """
+CLASSIFIER_SYSTEM_PROMPT = """
 You are an IT Diagnostic Agent. Analyze the classified ticket and return ONLY valid JSON.
 
 Provide technical diagnosis based on:
@@ -34,16 +26,22 @@ Output: {
 }
 """
 
+
+#Agent used to classify tickets into categories, urgency levels, and expertise levels
+class ClassifierAgent(BaseAgent):
+    def __init__(self, client, cache=None):
+        super().__init__(client, name="ClassifierAgent", cache=cache)
+    
+    def build_request(self, parsed_ticket):
+        self.log_action("Classifying ticket")
+        
         messages = [
             {"role": "user", "content": f"Ticket Data: {json.dumps(parsed_ticket)}"}
         ]
         
-        response = self.call_claude(messages, system_prompt)
-        
-        if not response:
-            self.log_action("Failed to get response from Claude")
-            return None
-        
+        return {"messages": messages, "system_prompt": CLASSIFIER_SYSTEM_PROMPT}
+    
+    def parse_response(self, response):
         try:
             classification = json.loads(response)
             self.log_action(f"Classified as: {classification.get('category')} - {classification.get('urgency')}")
@@ -51,4 +49,8 @@ Output: {
         except json.JSONDecodeError as e:
             self.log_action(f"Failed to parse JSON: {e}")
             self.log_action(f"Raw response: {response}")
-            return None
\ No newline at end of file
+            return None
+
+
+class AsyncClassifierAgent(AsyncBaseAgent, ClassifierAgent):
+    """ClassifierAgent driven by an AsyncAnthropic client"""
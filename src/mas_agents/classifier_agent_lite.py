@@ -3,6 +3,28 @@ import json
 import time
 from typing import Optional, Dict, Any
 
+CLASSIFIER_LITE_SYSTEM_PROMPT = """You are an IT support classifier. Return ONLY valid JSON.
+
+Categories: "hardware" (devices), "software" (apps/OS), "network" (connectivity), "access" (login/permissions)
+Urgency: "low" (requests), "medium" (workarounds exist), "high" (blocking work), "critical" (outages/security)
+Expertise: "tier1" (common), "tier2" (technical), "tier3" (complex/custom)
+
+Examples:
+1. Input: {"subject": "Printer not working", "description": "Office printer won't print"}
+   Output: {"category": "hardware", "urgency": "medium", "expertise_level": "tier1", "reasoning": "Hardware issue, has workarounds"}
+
+2. Input: {"subject": "Email server down", "description": "Company-wide email outage"}
+   Output: {"category": "network", "urgency": "critical", "expertise_level": "tier2", "reasoning": "Critical outage affecting all users"}
+
+Return:
+{
+    "category": "hardware|software|network|access",
+    "urgency": "low|medium|high|critical",
+    "expertise_level": "tier1|tier2|tier3",
+    "reasoning": "brief explanation"
+}"""
+
+
 class ClassifierAgentLite(BaseAgent):
     """
     Lightweight Classifier Agent with optimized prompt for cost/performance.
@@ -20,8 +42,8 @@ class ClassifierAgentLite(BaseAgent):
     - Lower volumes where cost is acceptable
     """
 
-    def __init__(self, client):
-        super().__init__(client, name="ClassifierAgentLite")
+    def __init__(self, client, cache=None):
+        super().__init__(client, name="ClassifierAgentLite", cache=cache)
         self.metrics = {
             "total_requests": 0,
             "successful_parses": 0,
@@ -43,26 +65,7 @@ class ClassifierAgentLite(BaseAgent):
         - Reasoning process section
         - Extended edge case discussion
         """
-        return """You are an IT support classifier. Return ONLY valid JSON.
-
-Categories: "hardware" (devices), "software" (apps/OS), "network" (connectivity), "access" (login/permissions)
-Urgency: "low" (requests), "medium" (workarounds exist), "high" (blocking work), "critical" (outages/security)
-Expertise: "tier1" (common), "tier2" (technical), "tier3" (complex/custom)
-
-Examples:
-1. Input: {"subject": "Printer not working", "description": "Office printer won't print"}
-   Output: {"category": "hardware", "urgency": "medium", "expertise_level": "tier1", "reasoning": "Hardware issue, has workarounds"}
-
-2. Input: {"subject": "Email server down", "description": "Company-wide email outage"}
-   Output: {"category": "network", "urgency": "critical", "expertise_level": "tier2", "reasoning": "Critical outage affecting all users"}
-
-Return:
-{
-    "category": "hardware|software|network|access",
-    "urgency": "low|medium|high|critical",
-    "expertise_level": "tier1|tier2|tier3",
-    "reasoning": "brief explanation"
-}"""
+        return CLASSIFIER_LITE_SYSTEM_PROMPT
 
     def _validate_classification(self, classification: Dict[str, Any]) -> tuple[bool, Optional[str]]:
         """Quick validation - only checks essentials"""
@@ -107,8 +110,8 @@ Return:
         system_prompt = self._build_optimized_prompt()
         messages = [{"role": "user", "content": f"{json.dumps(parsed_ticket)}"}]
 
-        # Still use lower temperature for consistency
-        response = self.call_claude(messages, system_prompt, temperature=0.3)
+        # Low temperature and a tight token cap come from AGENT_CONFIGS
+        response, cache_key = self._complete(self._request_params(messages, system_prompt))
         response_time = time.time() - start_time
 
         if not response:
@@ -127,4 +130,5 @@ Return:
             return None
 
         self._update_metrics(response_time, True)
+        self._cache_store(cache_key, response)
         return classification
@@ -0,0 +1,140 @@
+"""
+Anthropic client factory
+
+One client per process, shared by every agent, so all Claude calls reuse a
+single tuned httpx connection pool instead of each caller setting up its
+own TCP/TLS connections:
+
+- Keep-alive connections survive idle gaps between worker batches
+  (keepalive_expiry), and the pool is sized for the worker's concurrency
+- HTTP/2 when the h2 package is installed (`pip install httpx[http2]`),
+  which multiplexes concurrent calls over one connection; HTTP/1.1 otherwise
+- A short connect timeout and per-agent read timeouts (see
+  agent_config.AGENT_CONFIGS) instead of the SDK's 10 minute default, so a stuck call fails and is
+  retried by the RequestGovernor instead of holding a worker
+- max_retries=0: retries belong to the RequestGovernor
+- warm_up() opens the connection at startup, so the first ticket doesn't
+  pay for the handshake
+
+Configure with CLAUDE_MAX_CONNECTIONS (default 100).
+"""
+
+import asyncio
+import importlib.util
+import threading
+from os import getenv
+from typing import Optional
+
+import httpx
+from anthropic import Anthropic, AsyncAnthropic, DefaultAsyncHttpxClient, DefaultHttpxClient
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_MAX_CONNECTIONS = 100
+# Seconds an idle connection stays open for reuse
+KEEPALIVE_EXPIRY = 120.0
+CONNECT_TIMEOUT = 5.0
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=CONNECT_TIMEOUT)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def request_timeout(read_timeout: float) -> httpx.Timeout:
+    """Per-call timeout: the given read budget with the pool's connect timeout"""
+    return httpx.Timeout(read_timeout, connect=CONNECT_TIMEOUT)
+
+
+def connection_limits(max_connections: Optional[int] = None) -> httpx.Limits:
+    """Pool limits; every pooled connection may be kept alive between calls"""
+    if max_connections is None:
+        max_connections = int(getenv("CLAUDE_MAX_CONNECTIONS") or DEFAULT_MAX_CONNECTIONS)
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+def create_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                  max_connections: Optional[int] = None) -> Anthropic:
+    """
+    Build a synchronous client with a tuned connection pool
+
+    Args:
+        api_key: API key (default: ANTHROPIC_API_KEY)
+        base_url: API endpoint (default: the SDK's, or ANTHROPIC_BASE_URL)
+        max_connections: Pool size (default: CLAUDE_MAX_CONNECTIONS or 100)
+    """
+    http_client = DefaultHttpxClient(
+        http2=HTTP2_AVAILABLE,
+        limits=connection_limits(max_connections),
+        timeout=DEFAULT_TIMEOUT
+    )
+    return Anthropic(api_key=api_key, base_url=base_url, max_retries=0,
+                     timeout=DEFAULT_TIMEOUT, http_client=http_client)
+
+
+def create_async_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                        max_connections: Optional[int] = None) -> AsyncAnthropic:
+    """Asyncio counterpart of create_client"""
+    http_client = DefaultAsyncHttpxClient(
+        http2=HTTP2_AVAILABLE,
+        limits=connection_limits(max_connections),
+        timeout=DEFAULT_TIMEOUT
+    )
+    return AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=0,
+                          timeout=DEFAULT_TIMEOUT, http_client=http_client)
+
+
+def get_client() -> Anthropic:
+    """Process-wide synchronous client (created on first use)"""
+    return _shared("sync", create_client)
+
+
+def get_async_client() -> AsyncAnthropic:
+    """
+    Process-wide async client (created on first use)
+
+    An async client's connections belong to the event loop that opened
+    them; call this from the loop that will use it.
+    """
+    return _shared("async", create_async_client)
+
+
+def _shared(kind: str, factory):
+    with _clients_lock:
+        if kind not in _clients:
+            _clients[kind] = factory()
+        return _clients[kind]
+
+
+def warm_up(client: Anthropic) -> bool:
+    """
+    Open a pooled connection (DNS, TCP, TLS) with a free models request
+
+    Returns:
+        bool: True if the API answered; failures are logged, never raised
+    """
+    try:
+        client.models.list(limit=1)
+        return True
+    except Exception as e:
+        print(f"Claude client warm-up failed: {e}")
+        return False
+
+
+async def async_warm_up(client: AsyncAnthropic, connections: int = 1) -> bool:
+    """
+    Open `connections` pooled connections concurrently
+
+    With HTTP/2 one connection carries every call; over HTTP/1.1 open as
+    many as the calls expected to be in flight at once.
+    """
+    results = await asyncio.gather(
+        *(client.models.list(limit=1) for _ in range(connections)), return_exceptions=True
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        print(f"Claude client warm-up failed: {failures[0]}")
+    return not failures
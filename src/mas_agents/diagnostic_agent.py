@@ -1,14 +1,7 @@
-from .base_agent import BaseAgent
+from .base_agent import AsyncBaseAgent, BaseAgent
 import json
 
-class DiagnosticAgent(BaseAgent):
-    def __init__(self, client):
-        super().__init__(client, name="DiagnosticAgent")
-    
-    def process(self, classified_ticket):
-        self.log_action("Diagnosing ticket")
-        
-        system_prompt = """
+DIAGNOSTIC_SYSTEM_PROMPT = """
 You are a Diagnostic Agent for IT support. Analyze the classified ticket and return ONLY valid JSON.
 
 Based on the category and issue details, provide a detailed diagnosis of the problem.
@@ -22,18 +15,19 @@ Return this exact JSON structure:
 """
 
 
-
+class DiagnosticAgent(BaseAgent):
+    def __init__(self, client, cache=None):
+        super().__init__(client, name="DiagnosticAgent", cache=cache)
+    
+    def build_request(self, classified_ticket):
+        self.log_action("Diagnosing ticket")
         
         messages = [
             {"role": "user", "content": f"Classified Ticket Data: {json.dumps(classified_ticket)}"}
         ]
-        
-        response = self.call_claude(messages, system_prompt)
-        
-        if not response:
-            self.log_action("Failed to get response from Claude")
-            return None
-        
+        return {"messages": messages, "system_prompt": DIAGNOSTIC_SYSTEM_PROMPT}
+    
+    def parse_response(self, response):
         try:
             diagnosis = json.loads(response)
             self.log_action("Successfully diagnosed the issue")
@@ -41,4 +35,8 @@ Return this exact JSON structure:
         except json.JSONDecodeError as e:
             self.log_action(f"Failed to parse JSON: {e}")
             self.log_action(f"Raw response: {response}")
-            return None
\ No newline at end of file
+            return None
+
+
+class AsyncDiagnosticAgent(AsyncBaseAgent, DiagnosticAgent):
+    """DiagnosticAgent driven by an AsyncAnthropic client"""
@@ -1,15 +1,7 @@
-from .base_agent import BaseAgent
+from .base_agent import AsyncBaseAgent, BaseAgent
 import json
 
-# Agent used to intake and parse new tickets
-class IntakeAgent(BaseAgent):
-    def __init__(self, client):
-        super().__init__(client, name="IntakeAgent")
-    
-    def process(self, ticket_data):
-        self.log_action("Processing new ticket")
-        
-        system_prompt = """
+INTAKE_SYSTEM_PROMPT = """
 You are an Intake Agent for IT support. Analyze the ticket and return ONLY valid JSON (no markdown, no backticks).
 
 Extract and structure the following:
@@ -23,17 +15,22 @@ Return this exact JSON structure:
     "description": "improved description"
 }
 """
+
+
+# Agent used to intake and parse new tickets
+class IntakeAgent(BaseAgent):
+    def __init__(self, client, cache=None):
+        super().__init__(client, name="IntakeAgent", cache=cache)
+    
+    def build_request(self, ticket_data):
+        self.log_action("Processing new ticket")
         
         messages = [
             {"role": "user", "content": f"Ticket Data: {json.dumps(ticket_data)}"}
         ]
-        
-        response = self.call_claude(messages, system_prompt)
-        
-        if not response:
-            self.log_action("Failed to get response from Claude")
-            return None
-        
+        return {"messages": messages, "system_prompt": INTAKE_SYSTEM_PROMPT}
+    
+    def parse_response(self, response):
         try:
             # Parse JSON response
             parsed = json.loads(response)
@@ -42,4 +39,8 @@ Return this exact JSON structure:
         except json.JSONDecodeError as e:
             self.log_action(f"Failed to parse JSON: {e}")
             self.log_action(f"Raw response: {response}")
-            return None
\ No newline at end of file
+            return None
+
+
+class AsyncIntakeAgent(AsyncBaseAgent, IntakeAgent):
+    """IntakeAgent driven by an AsyncAnthropic client"""
@@ -0,0 +1,128 @@
+"""
+Message Batches runner
+
+Backlogs (reprocessing old tickets, draining a large queue) don't need an
+answer within seconds. The Message Batches API takes up to 100,000
+Messages API requests in one call, processes them asynchronously (usually
+well within an hour, at most 24h) and bills them at half the standard
+price. Prompt caching applies inside a batch as well.
+
+MessageBatchRunner submits requests keyed by custom_id, polls until every
+batch has ended and returns the resulting messages by custom_id. Agents
+build the requests themselves (see BaseAgent.process_batch). Every API
+call goes through the RequestGovernor, so a transient 429/5xx or dropped
+connection while submitting or polling is retried instead of failing the
+whole stage.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from .request_governor import RequestGovernor, shared_governor
+
+
+class MessageBatchRunner:
+    """Submit Messages API requests as Message Batches and wait for the results"""
+
+    # API limit on requests per batch
+    MAX_REQUESTS = 100_000
+    DEFAULT_POLL_INTERVAL = 60.0
+    # Batches expire after 24 hours; give up a little earlier and cancel
+    DEFAULT_TIMEOUT = 23 * 60 * 60
+
+    def __init__(
+        self,
+        client,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_requests: int = MAX_REQUESTS,
+        governor: Optional[RequestGovernor] = None
+    ):
+        """
+        Args:
+            client: Anthropic client (synchronous)
+            poll_interval: Seconds between status checks
+            timeout: Seconds to wait before cancelling unfinished requests
+            max_requests: Requests per submitted batch (larger inputs are split)
+            governor: Retries and rate limits API calls (default: shared_governor())
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_requests = max_requests
+        self.governor = governor or shared_governor()
+
+    def run(self, requests: Dict[str, Dict[str, Any]]) -> Dict[str, Optional[Any]]:
+        """
+        Process requests through the Message Batches API
+
+        Args:
+            requests: messages.create kwargs keyed by custom_id
+                      (1-64 characters: letters, digits, '-' and '_')
+
+        Returns:
+            Message for each custom_id, or None where the request errored,
+            expired or was cancelled
+
+        Raises:
+            anthropic.APIError: If a batch can't be submitted or polled
+        """
+        if not requests:
+            return {}
+
+        items = list(requests.items())
+        batch_ids = [
+            self.submit(dict(items[start:start + self.max_requests]))
+            for start in range(0, len(items), self.max_requests)
+        ]
+
+        messages = dict.fromkeys(requests)
+        for batch_id in batch_ids:
+            self.wait(batch_id)
+            messages.update(self.results(batch_id))
+        return messages
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        """Create one batch and return its ID"""
+        batch_requests = [
+            {"custom_id": custom_id, "params": params} for custom_id, params in requests.items()
+        ]
+        batch = self.governor.call(
+            lambda: self.client.messages.batches.create(requests=batch_requests)
+        )
+        print(f"[MessageBatchRunner] Submitted {batch.id} with {len(requests)} request(s)")
+        return batch.id
+
+    def wait(self, batch_id: str):
+        """Poll until the batch has ended, cancelling it once the timeout passes"""
+        deadline = time.monotonic() + self.timeout
+        cancelled = False
+        while True:
+            batch = self.governor.call(lambda: self.client.messages.batches.retrieve(batch_id))
+            if batch.processing_status == "ended":
+                counts = batch.request_counts
+                print(f"[MessageBatchRunner] {batch_id} ended: {counts.succeeded} succeeded, "
+                      f"{counts.errored} errored, {counts.canceled} canceled, "
+                      f"{counts.expired} expired")
+                return batch
+            if not cancelled and time.monotonic() >= deadline:
+                print(f"[MessageBatchRunner] {batch_id} timed out, cancelling")
+                self.governor.call(lambda: self.client.messages.batches.cancel(batch_id))
+                cancelled = True
+            time.sleep(self.poll_interval)
+
+    def results(self, batch_id: str) -> Dict[str, Optional[Any]]:
+        """Messages of an ended batch by custom_id (None for unsuccessful requests)"""
+        messages = {}
+        failures: List[str] = []
+        # Read the whole stream inside the call so a dropped download is retried too
+        items = self.governor.call(lambda: list(self.client.messages.batches.results(batch_id)))
+        for item in items:
+            if item.result.type == "succeeded":
+                messages[item.custom_id] = item.result.message
+            else:
+                messages[item.custom_id] = None
+                failures.append(f"{item.custom_id} ({item.result.type})")
+        if failures:
+            print(f"[MessageBatchRunner] {batch_id} unsuccessful: {', '.join(failures)}")
+        return messages
@@ -0,0 +1,307 @@
+"""
+Client-side rate governor for Claude calls
+
+Without one, every agent call fires immediately and a single 429 or 529
+fails the whole ticket. A RequestGovernor sits in front of every
+messages.create call in the process and:
+
+- Paces calls with token buckets for requests and tokens per minute, so
+  sustained load stays under the organisation's quota instead of hitting it
+- Retries rate-limit (429), overload (529), 5xx and connection errors with
+  full-jitter exponential backoff, honouring retry-after when the API sends it
+- Pauses every caller, not just the one that got the 429, until retry-after
+  has passed, so agents don't stampede back in together
+- Opens a circuit breaker after repeated overload/server failures; while
+  open, calls fail fast instead of queueing up behind a struggling API
+
+The governor owns retries: build clients with max_retries=0, or the SDK's
+own retries multiply with these.
+
+Configure the shared instance with CLAUDE_REQUESTS_PER_MINUTE and
+CLAUDE_TOKENS_PER_MINUTE (unset = no pacing, retries and breaker only).
+"""
+
+import asyncio
+import random
+import threading
+import time
+from os import getenv
+from typing import Any, Callable, Dict, Optional
+
+import anthropic
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that hands out reservations
+
+    reserve() always succeeds and returns how long the caller must wait for
+    its reservation to be covered, so sync and async callers can share one
+    bucket and sleep their own way.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens; returns seconds until they are available"""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return unused tokens (a negative amount takes more)"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed -> open after `failure_threshold` failures in a row; open ->
+    half-open once `reset_timeout` seconds pass, letting a single probe
+    call through; the probe's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go out now"""
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("Claude API circuit is open")
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open":
+                if self._probing:
+                    raise CircuitOpenError("Claude API circuit is half-open, probe in flight")
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a call that says nothing about API health"""
+        with self._lock:
+            self._probing = False
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Transient errors worth another attempt"""
+    if isinstance(exc, anthropic.APIConnectionError):
+        return True
+    if isinstance(exc, anthropic.APIStatusError):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """Seconds the API asked us to wait, if it said"""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        if "retry-after-ms" in response.headers:
+            return float(response.headers["retry-after-ms"]) / 1000.0
+        return float(response.headers["retry-after"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RequestGovernor:
+    """Paces, retries and circuit-breaks Claude calls shared by all agents"""
+
+    DEFAULT_MAX_RETRIES = 4
+    DEFAULT_BASE_DELAY = 1.0
+    DEFAULT_MAX_DELAY = 60.0
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Args:
+            requests_per_minute: Request quota to pace to (None = unpaced)
+            tokens_per_minute: Input + output token quota (None = unpaced)
+            max_retries: Retries per call after the first attempt
+            base_delay: Backoff cap for the first retry, doubling each time
+            max_delay: Upper bound on any single backoff
+            breaker: CircuitBreaker (default: 5 failures, 30s reset)
+        """
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "rate_limited": 0, "circuit_rejections": 0,
+                       "throttled_seconds": 0.0}
+
+    def call(self, send: Callable[[], Any], estimated_tokens: int = 0):
+        """
+        Run send() under the governor's pacing, retries and breaker
+
+        Args:
+            send: Zero-argument callable making one API request
+            estimated_tokens: Expected input tokens, reserved up front
+
+        Raises:
+            CircuitOpenError: If the breaker rejects the call
+            anthropic.APIError: The last error once retries are exhausted,
+                                or any non-retryable error
+        """
+        for attempt in range(self.max_retries + 1):
+            self._sleep(self._admit(estimated_tokens))
+            try:
+                response = send()
+            except Exception as exc:
+                self._sleep(self._after_error(exc, attempt, estimated_tokens))
+                continue
+            self._after_success(response, estimated_tokens)
+            return response
+
+    async def acall(self, send: Callable[[], Any], estimated_tokens: int = 0):
+        """Async counterpart of call(); send() returns an awaitable"""
+        for attempt in range(self.max_retries + 1):
+            await self._async_sleep(self._admit(estimated_tokens))
+            try:
+                response = await send()
+            except Exception as exc:
+                await self._async_sleep(self._after_error(exc, attempt, estimated_tokens))
+                continue
+            self._after_success(response, estimated_tokens)
+            return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the circuit breaker state"""
+        with self._lock:
+            return {**self._stats, "circuit": self.breaker.state}
+
+    def _count(self, counter: str, amount=1) -> None:
+        with self._lock:
+            self._stats[counter] += amount
+
+    def _admit(self, estimated_tokens: int) -> float:
+        """Check the breaker and reserve quota; returns seconds to wait"""
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._count("circuit_rejections")
+            raise
+        self._count("calls")
+        delay = max(0.0, self._paused_until - time.monotonic())
+        if self.request_bucket:
+            delay = max(delay, self.request_bucket.reserve(1))
+        if self.token_bucket and estimated_tokens:
+            delay = max(delay, self.token_bucket.reserve(estimated_tokens))
+        if delay:
+            self._count("throttled_seconds", delay)
+        return delay
+
+    def _after_success(self, response, estimated_tokens: int) -> None:
+        self.breaker.record_success()
+        usage = getattr(response, "usage", None)
+        if self.token_bucket and usage is not None:
+            used = (usage.input_tokens or 0) + (usage.output_tokens or 0)
+            self.token_bucket.refund(estimated_tokens - used)
+
+    def _after_error(self, exc: Exception, attempt: int, estimated_tokens: int) -> float:
+        """Record a failed attempt; returns the backoff or re-raises if giving up"""
+        if self.token_bucket and estimated_tokens:
+            self.token_bucket.refund(estimated_tokens)
+        if not is_retryable(exc):
+            # The API answered; this says nothing about its health
+            self.breaker.release()
+            raise exc
+
+        wait = retry_after(exc)
+        if isinstance(exc, anthropic.RateLimitError):
+            # Over quota, not unhealthy: hold every caller until retry-after
+            self.breaker.release()
+            self._count("rate_limited")
+            if wait:
+                with self._lock:
+                    self._paused_until = max(self._paused_until, time.monotonic() + wait)
+        else:
+            self.breaker.record_failure()
+
+        if attempt >= self.max_retries or self.breaker.state == "open":
+            raise exc
+        self._count("retries")
+        if wait is not None and isinstance(exc, anthropic.RateLimitError):
+            # _admit waits out the shared pause
+            return 0.0
+        if wait is None:
+            # Full jitter: spread retries over [0, cap] so callers don't sync up
+            wait = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return min(wait, self.max_delay)
+
+    @staticmethod
+    def _sleep(seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    @staticmethod
+    async def _async_sleep(seconds: float) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+
+_shared_governor: Optional[RequestGovernor] = None
+_shared_lock = threading.Lock()
+
+
+def shared_governor() -> RequestGovernor:
+    """Process-wide governor used by agents that aren't given their own"""
+    global _shared_governor
+    with _shared_lock:
+        if _shared_governor is None:
+            rpm = getenv("CLAUDE_REQUESTS_PER_MINUTE")
+            tpm = getenv("CLAUDE_TOKENS_PER_MINUTE")
+            _shared_governor = RequestGovernor(
+                requests_per_minute=float(rpm) if rpm else None,
+                tokens_per_minute=float(tpm) if tpm else None
+            )
+        return _shared_governor
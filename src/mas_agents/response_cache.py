@@ -0,0 +1,158 @@
+"""
+Content-addressed cache for Claude responses
+
+During outages the same ticket ("printer on 3rd floor down") arrives many
+times in a burst and every copy would otherwise pay for identical Claude
+calls. Responses are keyed by a hash of the full request (model, max_tokens,
+temperature, system prompt and messages), so any change to the prompt or
+input is a different entry.
+
+Two tiers:
+- In-memory LRU (per process, always on)
+- Redis via RedisDB (optional, shared between web and worker processes)
+
+Redis values carry the (wall-clock) time they expire, so an entry
+promoted into another process's memory tier expires when the Redis copy
+does rather than living a fresh TTL longer.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ResponseCache:
+    """Two-tier LRU + Redis cache for Claude response text"""
+
+    # Default TTL: 1 hour (in seconds); agents pass their own (AgentConfig.cache_ttl)
+    DEFAULT_TTL = 60 * 60
+    DEFAULT_MAX_ENTRIES = 1024
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        redis_db=None,
+        default_ttl: int = DEFAULT_TTL,
+        max_temperature: Optional[float] = None
+    ):
+        """
+        Args:
+            max_entries: Size of the in-memory LRU tier
+            redis_db: RedisDB instance for the shared tier (None = memory only)
+            default_ttl: Seconds to keep entries stored without a TTL
+            max_temperature: Bypass the cache for calls above this temperature
+                             (None = cache every temperature)
+        """
+        self.max_entries = max_entries
+        self.redis_db = redis_db
+        self.default_ttl = default_ttl
+        self.max_temperature = max_temperature
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "redis_hits": 0, "bypassed": 0}
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Hash messages.create kwargs into a stable cache key"""
+        encoded = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def should_bypass(self, params: Dict[str, Any]) -> bool:
+        """True if this request's temperature is too random to reuse"""
+        if self.max_temperature is None:
+            return False
+        return params.get("temperature", 1.0) > self.max_temperature
+
+    def lookup(self, params: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a cached response for a request
+
+        Args:
+            params: messages.create keyword arguments
+
+        Returns:
+            (key, text): key is None when the request bypasses the cache,
+            text is None on a miss
+        """
+        if self.should_bypass(params):
+            self._count("bypassed")
+            return None, None
+
+        key = self.make_key(params)
+        text = self._memory_get(key)
+        if text is not None:
+            self._count("hits", "memory_hits")
+            return key, text
+
+        if self.redis_db is not None:
+            value = self.redis_db.get_cached_response(key)
+            if value is not None:
+                text, ttl = self._decode(value)
+                if ttl > 0:
+                    # Promote so the next duplicate skips the round trip
+                    self._memory_set(key, text, ttl)
+                    self._count("hits", "redis_hits")
+                    return key, text
+
+        self._count("misses")
+        return key, None
+
+    def store(self, key: str, text: str, ttl: Optional[int] = None) -> None:
+        """Cache a successful response under the key returned by lookup() for `ttl` seconds"""
+        if ttl is None:
+            ttl = self.default_ttl
+        self._memory_set(key, text, ttl)
+        if self.redis_db is not None:
+            value = json.dumps({"text": text, "expires_at": time.time() + ttl})
+            self.redis_db.cache_response(key, value, ttl)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (Redis entries expire on their own)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current size and hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _decode(self, value: str) -> Tuple[str, float]:
+        """(text, seconds left) of a Redis value; entries stored as bare text get default_ttl"""
+        try:
+            data = json.loads(value)
+        except ValueError:
+            return value, self.default_ttl
+        if isinstance(data, dict) and set(data) == {"text", "expires_at"}:
+            return data["text"], data["expires_at"] - time.time()
+        return value, self.default_ttl
+
+    def _count(self, *counters: str) -> None:
+        with self._lock:
+            for counter in counters:
+                self._stats[counter] += 1
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, text = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def _memory_set(self, key: str, text: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -1,22 +1,7 @@
-from .base_agent import BaseAgent
+from .base_agent import AsyncBaseAgent, BaseAgent
 import json
 
-#Agent used to generate solutions based on diagnosis and fetched data
-class SolutionAgent(BaseAgent):
-    def __init__(self, client):
-        super().__init__(client, name="SolutionAgent")
-    
-    def process(self, diagnosis, fetched_data):
-        """
-        Generate solution based on diagnosis and past solutions
-        
-        Args:
-            diagnosis: Output from DiagnosticAgent
-            fetched_data: Output from FetchAgent with past solutions
-        """
-        self.log_action("Generating solution")
-        
-        system_prompt = """
+SOLUTION_SYSTEM_PROMPT = """
 You are a Solution Agent for IT support. Based on the diagnosis and fetched data, provide a comprehensive solution.
 
 IMPORTANT: Return ONLY valid JSON. For multi-line text, use \\n for newlines.
@@ -29,17 +14,32 @@ Return this exact JSON structure:
     "confidence": "high|medium|low"
 }
 """
+
+
+#Agent used to generate solutions based on diagnosis and fetched data
+class SolutionAgent(BaseAgent):
+    def __init__(self, client, cache=None):
+        super().__init__(client, name="SolutionAgent", cache=cache)
+    
+    def build_request(self, diagnosis, fetched_data):
+        """
+        Generate solution based on diagnosis and past solutions
+        
+        Args:
+            diagnosis: Output from DiagnosticAgent
+            fetched_data: Output from FetchAgent with past solutions
+        """
+        self.log_action("Generating solution")
+        
         messages = [
             {
                 "role": "user", 
                 "content": f"Diagnosis: {json.dumps(diagnosis)}\n\nFetched Data: {json.dumps(fetched_data)}"
             }
         ]
-        response = self.call_claude(messages, system_prompt)
-        if not response:
-            self.log_action("Failed to get response from Claude")
-            return None
-        
+        return {"messages": messages, "system_prompt": SOLUTION_SYSTEM_PROMPT}
+    
+    def parse_response(self, response):
         try:
             solution = json.loads(response)
             self.log_action("Successfully generated solution")
@@ -47,4 +47,8 @@ Return this exact JSON structure:
         except json.JSONDecodeError as e:
             self.log_action(f"Failed to parse JSON: {e}")
             self.log_action(f"Raw response: {response}")
-            return None
\ No newline at end of file
+            return None
+
+
+class AsyncSolutionAgent(AsyncBaseAgent, SolutionAgent):
+    """SolutionAgent driven by an AsyncAnthropic client"""
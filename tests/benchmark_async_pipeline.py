@@ -0,0 +1,102 @@
+"""
+Benchmark: sync Overseer vs AsyncOverseer against a local fake Messages API.
+
+No API key or network needed. Assignment is stubbed so no database is needed.
+
+    python tests/benchmark_async_pipeline.py --tickets 100 --concurrency 50 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add backend folder to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import overseer as overseer_module
+from overseer import AsyncOverseer, Overseer
+from fake_messages_api import FakeMessagesAPI
+from mas_agents.clients import create_async_client, create_client
+
+
+def make_tickets(count):
+    return [{"user_email": f"user{i}@company.com", "subject": "printer broken!!!",
+             "description": "cant print on 3rd floor"} for i in range(count)]
+
+
+def run_sync_threaded(base_url, tickets, concurrency):
+    """One OS thread per in-flight ticket (plus the Overseer's stage threads)"""
+    client = create_client(api_key="bench", base_url=base_url, max_connections=concurrency)
+    overseer = Overseer(client, redis_client=None)
+    peak_threads = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(overseer.process_ticket, t) for t in tickets]
+        while not all(f.done() for f in futures):
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(0.01)
+        results = [f.result() for f in futures]
+    return time.perf_counter() - start, results, peak_threads
+
+
+def run_async(base_url, tickets, concurrency):
+    """All tickets on one event loop, bounded by a semaphore"""
+    client = create_async_client(api_key="bench", base_url=base_url, max_connections=concurrency)
+    overseer = AsyncOverseer(client, redis_client=None, max_concurrency=concurrency)
+
+    async def main():
+        peak_threads = 0
+        task = asyncio.ensure_future(overseer.process_many(tickets))
+        start = time.perf_counter()
+        while not task.done():
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.01)
+        return time.perf_counter() - start, task.result(), peak_threads
+
+    return asyncio.run(main())
+
+
+def report(label, elapsed, results, peak_threads):
+    ok = sum(1 for r in results if r.get("status") == "solution_generated")
+    print(f"{label:<14} {elapsed:7.2f}s  {len(results) / elapsed:7.1f} tickets/s  "
+          f"ok={ok}/{len(results)}  peak threads={peak_threads}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickets", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="Simulated seconds per Claude call")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "fake-model")
+    overseer_module.assign_ticket = (
+        lambda intake, classification: {'primary': None, 'secondary': None}
+    )
+
+    # Keep agent logging from drowning the report
+    real_stdout = sys.stdout
+    tickets = make_tickets(args.tickets)
+    with FakeMessagesAPI(latency=args.latency) as api:
+        sys.stdout = open(os.devnull, "w")
+        try:
+            sync_stats = run_sync_threaded(api.base_url, tickets, args.concurrency)
+            async_stats = run_async(api.base_url, tickets, args.concurrency)
+        finally:
+            sys.stdout.close()
+            sys.stdout = real_stdout
+
+    print(f"{args.tickets} tickets, concurrency {args.concurrency}, "
+          f"{args.latency * 1000:.0f}ms per Claude call")
+    report("sync/threads", *sync_stats)
+    report("asyncio", *async_stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: query plans and timings for hot lookups before and after the
+hot-column indexes (src/backend/migrate_db_indexes.py).
+
+Seeds a throwaway SQLite database, so no Postgres is needed:
+
+    python tests/benchmark_query_plans.py --tickets 50000 --users 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add backend folder to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+from flask import Flask
+from sqlalchemy import text
+
+import migrate_db_indexes
+from assignment import OPEN_STATUSES
+from models import db, Ticket, TicketAssignments, TicketStatus, User, Workflow_log
+
+SPECIALIZATIONS = ["phones", "printers", "network", "hardware", "software", "database", "general"]
+TIERS = ["tier1", "tier2", "tier3"]
+
+
+def seed(ticket_count, user_count):
+    rng = random.Random(1)
+    db.session.execute(db.insert(User), [
+        {"email": f"staff{i}@company.com", "name": f"Staff {i}", "tier_level": rng.choice(TIERS),
+         "specialization": rng.choice(SPECIALIZATIONS), "building": f"building{rng.randint(1, 5)}"}
+        for i in range(user_count)
+    ])
+    statuses = list(TicketStatus)
+    tickets, assignments, logs = [], [], []
+    for i in range(ticket_count):
+        ticket_id = f"TKT-{i:08d}"
+        tickets.append({"id": ticket_id, "user_email": "user@company.com", "subject": f"Issue {i}",
+                        "description": "d", "status": rng.choice(statuses)})
+        for role in ("primary", "secondary"):
+            assignments.append({"ticket_id": ticket_id, "user_id": rng.randint(1, user_count),
+                                "role": role})
+        logs.append({"ticket_id": ticket_id, "log_entries": []})
+    db.session.execute(db.insert(Ticket), tickets)
+    db.session.execute(db.insert(TicketAssignments), assignments)
+    db.session.execute(db.insert(Workflow_log), logs)
+    db.session.commit()
+
+
+def hot_queries(ticket_id):
+    """Statements the API and assignment engine run per request"""
+    return {
+        "ticket assignments": (
+            db.select(TicketAssignments).where(TicketAssignments.ticket_id == ticket_id)
+        ),
+        "workflow log": db.select(Workflow_log).where(Workflow_log.ticket_id == ticket_id),
+        "open workload": (
+            db.select(TicketAssignments.user_id, db.func.count(TicketAssignments.id))
+            .where(TicketAssignments.ticket_id.in_(
+                db.select(Ticket.id).where(Ticket.status.in_(OPEN_STATUSES))
+            ))
+            .group_by(TicketAssignments.user_id)
+        ),
+        "user workload": db.select(db.func.count()).select_from(TicketAssignments)
+                           .where(TicketAssignments.user_id == 7),
+        "tickets by status": (
+            db.select(Ticket.id).where(Ticket.status == TicketStatus.IN_PROGRESS).limit(20)
+        ),
+        "dashboard page": (
+            db.select(Ticket).order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(20)
+        ),
+        "staff lookup": db.select(User).where(User.specialization == "network",
+                                              User.tier_level == "tier3",
+                                              User.building == "building2"),
+    }
+
+
+def measure(queries, repeat):
+    results = {}
+    for name, statement in queries.items():
+        sql = str(statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+        plan = [row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            db.session.execute(statement).all()
+        results[name] = (plan, (time.perf_counter() - start) / repeat * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            # Start from the pre-migration schema
+            with db.engine.begin() as connection:
+                migrate_db_indexes.downgrade(connection)
+            print(f"Seeding {args.tickets} tickets, {args.users} users...")
+            seed(args.tickets, args.users)
+            queries = hot_queries(f"TKT-{args.tickets // 2:08d}")
+
+            before = measure(queries, args.repeat)
+            with db.engine.begin() as connection:
+                migrate_db_indexes.upgrade(connection)
+            db.session.execute(text("ANALYZE"))
+            after = measure(queries, args.repeat)
+
+    for name in queries:
+        (plan_before, ms_before), (plan_after, ms_after) = before[name], after[name]
+        print(f"\n{name}: {ms_before:.2f} ms -> {ms_after:.2f} ms")
+        print("  before: " + "; ".join(plan_before))
+        print("  after:  " + "; ".join(plan_after))
+
+
+if __name__ == "__main__":
+    main()
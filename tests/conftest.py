@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures for the offline (SQLite) backend tests.
+"""
+
+import sys
+import os
+
+# Add backend folder (and src, for mas_agents) to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
+
+import pytest
+from flask import Flask
+from models import db
+
+
+@pytest.fixture
+def app():
+    """Create a throwaway app bound to in-memory SQLite."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,248 @@
+"""
+Local stand-in for the Anthropic Messages API.
+
+Serves POST /v1/messages on a random localhost port with a fixed latency so
+agents and the Overseer can be exercised (and benchmarked) without network
+access or API spend. The Message Batches endpoints are served too; batches
+end after a configurable number of status checks. GET /v1/models answers
+client warm-ups. Point a client at it with:
+
+    Anthropic(api_key="test", base_url=server.base_url)
+"""
+
+import asyncio
+import json
+import threading
+
+# One JSON document that satisfies every agent's expected output keys
+DEFAULT_REPLY = {
+    "user_email": "john@company.com",
+    "subject": "Printer not working on 3rd floor",
+    "description": "Cannot print to the 3rd floor printer",
+    "category": "hardware",
+    "urgency": "medium",
+    "expertise_level": "tier1",
+    "reasoning": "Printer issue with workarounds available",
+    "diagnosis": "Printer driver crashed",
+    "potential_causes": ["Driver crashed", "Spooler stopped"],
+    "recommended_tests": ["Restart spooler", "Reinstall driver"],
+    "solution": "Step 1: Restart the print spooler\nStep 2: Reinstall the driver",
+    "tools_needed": ["Admin credentials"],
+    "estimated_time": "15 minutes",
+    "confidence": "high"
+}
+
+
+class FakeMessagesAPI:
+    """
+    Minimal HTTP/1.1 keep-alive server answering Messages API calls
+
+    Runs its own event loop on one background thread, so simulated latency
+    costs no threads and hundreds of concurrent calls don't starve the
+    client of the GIL.
+    """
+
+    def __init__(self, latency: float = 0.05, reply: dict = None, batch_polls: int = 1):
+        self.latency = latency
+        self.reply = reply or DEFAULT_REPLY
+        # "max_tokens" simulates a reply cut off at the output cap
+        self.stop_reason = "end_turn"
+        self.requests = []
+        self.model_requests = 0
+        self.connections_opened = 0
+        # Message Batches: a batch ends after `batch_polls` status checks
+        self.batches = {}
+        self.batch_polls = batch_polls
+        self.batch_errors = set()
+        # Status codes to answer the next Message Batches calls with
+        self.batch_failures = []
+        # Status codes (e.g. 429, 529) to answer the next Messages calls with
+        self.failures = []
+        self.retry_after = None
+        self._cached_prompts = set()
+        self._connections = set()
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(self._start())
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    async def _start(self):
+        return await asyncio.start_server(self._serve, "127.0.0.1", 0, backlog=1024)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        async def stop():
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(stop(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    async def _serve(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        self.connections_opened += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                method, path = lines[0].split(" ")[:2]
+                headers = dict(line.split(":", 1) for line in lines[1:] if ":" in line)
+                length = int({k.lower(): v for k, v in headers.items()}.get("content-length", 0))
+                body = json.loads(await reader.readexactly(length)) if length else {}
+
+                if path.startswith("/v1/models"):
+                    self.model_requests += 1
+                    status, content_type, payload = self._json({
+                        "data": [{"type": "model", "id": "fake-model", "display_name": "Fake",
+                                  "created_at": "2025-01-01T00:00:00Z"}],
+                        "has_more": False, "first_id": "fake-model", "last_id": "fake-model"
+                    })
+                elif path.startswith("/v1/messages/batches") and self.batch_failures:
+                    status, content_type, payload = self._failure(self.batch_failures.pop(0))
+                elif path.startswith("/v1/messages/batches"):
+                    status, content_type, payload = self._batch_route(
+                        method, path.split("?")[0], body
+                    )
+                elif self.failures:
+                    self.requests.append(body)
+                    status, content_type, payload = self._failure(self.failures.pop(0))
+                else:
+                    self.requests.append(body)
+                    await asyncio.sleep(self.latency)
+                    status, content_type = "200 OK", "application/json"
+                    payload = json.dumps(self._message(body)).encode()
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n".encode()
+                    + (f"Retry-After: {self.retry_after}\r\n".encode()
+                       if self.retry_after and not status.startswith("200") else b"")
+                    + f"Content-Type: {content_type}\r\n".encode()
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+            self._connections.discard(task)
+
+    def _failure(self, status_code: int):
+        """Error response the real API sends when rate limited (429) or overloaded (529)"""
+        error_types = {429: "rate_limit_error", 529: "overloaded_error"}
+        error_type = error_types.get(status_code, "api_error")
+        error = {"type": error_type, "message": error_type}
+        payload = json.dumps({"type": "error", "error": error}).encode()
+        return f"{status_code} Error", "application/json", payload
+
+    def _batch_route(self, method: str, path: str, body: dict):
+        """Message Batches endpoints: create, retrieve, results and cancel"""
+        parts = path[len("/v1/messages/batches"):].strip("/").split("/")
+        if method == "POST" and parts == [""]:
+            return self._json(self._create_batch(body["requests"]))
+
+        batch = self.batches.get(parts[0])
+        if batch is None:
+            return "404 Not Found", "application/json", json.dumps(
+                {"type": "error", "error": {"type": "not_found_error", "message": "No such batch"}}
+            ).encode()
+        if method == "GET" and len(parts) == 1:
+            batch["polls"] += 1
+            return self._json(self._batch_object(batch))
+        if method == "GET" and parts[1:] == ["results"]:
+            lines = [json.dumps({"custom_id": custom_id, "result": result})
+                     for custom_id, result in self._batch_results(batch)]
+            return "200 OK", "application/binary", "\n".join(lines).encode()
+        # POST .../cancel
+        batch["cancelled"] = True
+        return self._json(self._batch_object(batch))
+
+    def _json(self, document: dict):
+        return "200 OK", "application/json", json.dumps(document).encode()
+
+    def _create_batch(self, requests: list) -> dict:
+        batch_id = f"msgbatch_fake_{len(self.batches) + 1}"
+        self.batches[batch_id] = {"id": batch_id, "requests": requests, "polls": 0,
+                                  "cancelled": False}
+        return self._batch_object(self.batches[batch_id])
+
+    def _batch_ended(self, batch: dict) -> bool:
+        return batch["cancelled"] or batch["polls"] > self.batch_polls
+
+    def _batch_results(self, batch: dict) -> list:
+        """(custom_id, result) pairs of an ended batch, built once"""
+        if "results" not in batch:
+            batch["results"] = []
+            for number, request in enumerate(batch["requests"], start=1):
+                custom_id = request["custom_id"]
+                if batch["cancelled"]:
+                    result = {"type": "canceled"}
+                elif custom_id in self.batch_errors:
+                    error = {"type": "invalid_request_error", "message": "Bad request"}
+                    result = {"type": "errored", "error": {"type": "error", "error": error}}
+                else:
+                    message = self._message(request["params"])
+                    message["id"] = f"{batch['id']}_{number}"
+                    result = {"type": "succeeded", "message": message}
+                batch["results"].append((custom_id, result))
+        return batch["results"]
+
+    def _batch_object(self, batch: dict) -> dict:
+        ended = self._batch_ended(batch)
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        if ended:
+            for _, result in self._batch_results(batch):
+                counts[result["type"]] += 1
+        else:
+            counts["processing"] = len(batch["requests"])
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": counts,
+            "created_at": "2025-01-01T00:00:00Z",
+            "expires_at": "2025-01-02T00:00:00Z",
+            "ended_at": "2025-01-01T00:05:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": (
+                f"{self.base_url}/v1/messages/batches/{batch['id']}/results" if ended else None
+            )
+        }
+
+    def _message(self, body: dict) -> dict:
+        return {
+            "id": f"msg_fake_{len(self.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model") or "fake-model",
+            "content": [{"type": "text", "text": json.dumps(self.reply)}],
+            "stop_reason": self.stop_reason,
+            "stop_sequence": None,
+            "usage": self._usage(body.get("system"))
+        }
+
+    def _usage(self, system) -> dict:
+        """Token counts, reporting a prompt-cache write then reads for cacheable system blocks"""
+        usage = {"input_tokens": 100, "output_tokens": 50,
+                 "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+        if isinstance(system, list) and any("cache_control" in block for block in system):
+            prompt = "".join(block["text"] for block in system)
+            tokens = len(prompt) // 4
+            if prompt in self._cached_prompts:
+                usage["cache_read_input_tokens"] = tokens
+            else:
+                self._cached_prompts.add(prompt)
+                usage["cache_creation_input_tokens"] = tokens
+        return usage
@@ -0,0 +1,97 @@
+"""
+In-process stand-in for the redis-py client.
+
+Implements the hash, list, stream and expiry commands RedisJobQueue and
+RedisDB.publish_ticket_events use, plus pipelines, so Redis-backed code
+can be tested without a server. Values are stored as strings, as with
+decode_responses=True. Attach it to a RedisDB without connecting:
+
+    redis_db = RedisDB.__new__(RedisDB)
+    redis_db.client = FakeRedis()
+"""
+
+import time
+
+
+class FakeRedis:
+    """Dict-backed subset of redis.Redis"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.lists = {}
+        self.streams = {}
+        self.expiry = {}
+
+    def _live(self, key):
+        expires_at = self.expiry.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.hashes.pop(key, None)
+            self.expiry.pop(key)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hset(self, key, mapping):
+        self._live(key)
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+        return len(mapping)
+
+    def hget(self, key, field):
+        self._live(key)
+        return self.hashes.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        self._live(key)
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key, seconds):
+        self.expiry[key] = time.time() + seconds
+        return True
+
+    def ttl(self, key):
+        self._live(key)
+        if key not in self.expiry:
+            return -1
+        return round(self.expiry[key] - time.time())
+
+    def lpush(self, key, *values):
+        items = self.lists.setdefault(key, [])
+        for value in values:
+            items.insert(0, value)
+        return len(items)
+
+    def rpop(self, key):
+        items = self.lists.get(key)
+        return items.pop() if items else None
+
+    def brpop(self, key, timeout=0):
+        # Never blocks: an empty list times out straight away
+        value = self.rpop(key)
+        return (key, value) if value is not None else None
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        entries = self.streams.setdefault(name, [])
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append((entry_id, dict(fields)))
+        return entry_id
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute()"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 
 # Add backend folder to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'backend'))
@@ -30,4 +31,54 @@ print("\nFetching software resolutions...")
 results = redis_client.fetch_similar_resolutions("software", limit=5)
 print(f"Found {len(results)} software resolutions:")
 for r in results:
-    print(f"  - {r['id']}: {r['solution']}")
\ No newline at end of file
+    print(f"  - {r['id']}: {r['solution']}")
+# Test newest-first ordering from the sorted category index
+print("\nChecking newest-first ordering...")
+redis_client.store_resolution("TKT-004", "hardware", "Swap toner", False)
+results = redis_client.fetch_similar_resolutions("hardware", limit=2)
+print(f"Newest hardware resolutions: {[r['id'] for r in results]} "
+      f"(expected ['TKT-004', 'TKT-002'])")
+
+results = redis_client.fetch_similar_resolutions("hardware", limit=5, only_successful=True)
+print(f"Successful hardware resolutions: {[r['id'] for r in results]} "
+      f"(expected ['TKT-002', 'TKT-001'])")
+
+# Test migration of a legacy set-based index
+print("\nMigrating legacy set index...")
+redis_client.client.delete("category:legacy")
+redis_client.client.sadd("category:legacy", "TKT-001", "TKT-003", "TKT-EXPIRED")
+migrated = redis_client.migrate_category_indexes()
+print(f"Migrated {migrated} index(es); "
+      f"category:legacy is now a {redis_client.client.type('category:legacy')}")
+print(f"Members: {redis_client.client.zrevrange('category:legacy', 0, -1)} "
+      f"(expired TKT-EXPIRED dropped)")
+redis_client.client.delete("category:legacy", "category:legacy:successful")
+
+# Test stale index cleanup
+print("\nChecking stale index cleanup...")
+redis_client.store_resolution("TKT-SHORT", "network", "Restart router", True, ttl=1)
+time.sleep(2)
+results = redis_client.fetch_similar_resolutions("network", limit=5)
+print(f"Network resolutions after expiry: {len(results)}; "
+      f"index size {redis_client.client.zcard('category:network')} (expected 0)")
+
+short_retention = RedisDB(os.getenv('REDIS_URL'), index_retention=1)
+short_retention.store_resolution("TKT-OLD", "access", "Reset password", True)
+time.sleep(2)
+short_retention.store_resolution("TKT-NEW", "access", "Unlock account", True)
+access_index = short_retention.client.zrange('category:access', 0, -1)
+print(f"Access index after retention trim: {access_index} (expected ['TKT-NEW'])")
+
+# Test the ticket change-feed stream
+print("\nChecking ticket change-feed stream...")
+redis_client.client.delete(RedisDB.TICKET_EVENTS_STREAM)
+print(f"Empty stream bounds: {redis_client.ticket_events_bounds()} (expected (None, None))")
+first_id = redis_client.publish_ticket_events([{"ticket_id": "TKT-001", "event": "created"}])
+redis_client.publish_ticket_events([{"ticket_id": "TKT-002", "event": "created"},
+                                    {"ticket_id": "TKT-001", "event": "processed"}])
+events = redis_client.read_ticket_events(first_id, count=10)
+print(f"Events after first: {[(e['ticket_id'], e['event']) for _, e in events]} "
+      f"(expected [('TKT-002', 'created'), ('TKT-001', 'processed')])")
+bounds = redis_client.ticket_events_bounds()
+print(f"Stream bounds: {bounds} (first {first_id}, last {events[-1][0]})")
+redis_client.client.delete(RedisDB.TICKET_EVENTS_STREAM)
@@ -0,0 +1,81 @@
+"""
+Tests for the per-agent model / max_tokens / temperature registry.
+"""
+
+import pytest
+from anthropic import Anthropic
+
+import overseer as overseer_module
+from overseer import Overseer
+from fake_messages_api import FakeMessagesAPI
+from mas_agents import agent_config as agent_config_module
+from mas_agents.agent_config import AGENT_CONFIGS, AgentConfig, configure_agent
+from mas_agents.classifier_agent import CLASSIFIER_SYSTEM_PROMPT
+from mas_agents.diagnostic_agent import DIAGNOSTIC_SYSTEM_PROMPT
+from mas_agents.intake_agent import INTAKE_SYSTEM_PROMPT, IntakeAgent
+from mas_agents.solution_agent import SOLUTION_SYSTEM_PROMPT, SolutionAgent
+
+TICKET = {"user_email": "john@company.com", "subject": "printer broken",
+          "description": "cant print"}
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    """Keep configure_agent changes local to each test"""
+    monkeypatch.setattr(agent_config_module, "AGENT_CONFIGS", dict(AGENT_CONFIGS))
+    monkeypatch.setenv("MODEL", "large-model")
+    monkeypatch.setenv("FAST_MODEL", "small-model")
+
+
+def test_pipeline_routes_stages_to_model_tiers(monkeypatch):
+    """Test that intake and classification use the fast tier and later stages the default."""
+    monkeypatch.setattr(overseer_module, "assign_ticket",
+                        lambda intake, classification: {'primary': None, 'secondary': None})
+    with FakeMessagesAPI(latency=0) as api:
+        overseer = Overseer(Anthropic(api_key="test", base_url=api.base_url), redis_client=None)
+        assert overseer.process_ticket(TICKET)["status"] == "solution_generated"
+
+    sent = {request["system"][0]["text"]: request for request in api.requests}
+    intake, classifier = sent[INTAKE_SYSTEM_PROMPT], sent[CLASSIFIER_SYSTEM_PROMPT]
+    diagnostic, solution = sent[DIAGNOSTIC_SYSTEM_PROMPT], sent[SOLUTION_SYSTEM_PROMPT]
+    assert intake["model"] == classifier["model"] == "small-model"
+    assert diagnostic["model"] == solution["model"] == "large-model"
+    assert classifier["max_tokens"] == 512 and classifier["temperature"] == 0.2
+    assert "stop_sequences" not in intake
+
+
+def test_fast_tier_falls_back_to_default_model(monkeypatch):
+    """Test that the fast tier uses MODEL when FAST_MODEL is unset."""
+    monkeypatch.delenv("FAST_MODEL")
+
+    assert IntakeAgent(client=None).model == "large-model"
+
+
+def test_model_resolved_once_per_agent(monkeypatch):
+    """Test that an agent keeps the model resolved at construction."""
+    agent = SolutionAgent(client=None)
+    monkeypatch.setenv("MODEL", "other-model")
+
+    assert agent._request_params([], "prompt")["model"] == "large-model"
+
+
+def test_configure_agent_and_call_overrides():
+    """Test that configure_agent changes apply to new agents and calls can override temperature."""
+    configure_agent("IntakeAgent", model="pinned-model", max_tokens=300, stop_sequences=["\n\n\n"],
+                    timeout=12.0)
+    agent = IntakeAgent(client=None)
+    assert agent.timeout.read == 12.0
+
+    params = agent._request_params([], "prompt")
+    assert params["model"] == "pinned-model"
+    assert params["max_tokens"] == 300
+    assert params["stop_sequences"] == ["\n\n\n"]
+    assert agent._request_params([], "prompt", temperature=0.9)["temperature"] == 0.9
+    # Unregistered agents get the defaults
+    assert agent_config_module.agent_config("NewAgent").max_tokens == 4096
+
+
+def test_unknown_tier_is_rejected():
+    """Test that an unknown model tier raises ValueError."""
+    with pytest.raises(ValueError):
+        AgentConfig(tier="huge")
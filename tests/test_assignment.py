@@ -0,0 +1,351 @@
+"""
+Tests for AssignmentEngine rules resolving against the in-memory staff roster.
+"""
+
+import time
+
+from sqlalchemy import event
+
+import assignment
+import overseer as overseer_module
+from assignment import ANY, AssignmentEngine, AssignmentRule, StaffRoster
+from models import db, Ticket, TicketAssignments, TicketStatus, User
+
+
+STAFF = [
+    # email, name, tier, specialization, building
+    ("phones@company.com", "Phone Tech", "tier2", "phones", "building1"),
+    ("printers@company.com", "Printer Tech", "tier1", "printers", None),
+    ("network2@company.com", "Network Mid", "tier2", "network", None),
+    ("network3@company.com", "Network Senior", "tier3", "network", None),
+    ("general1@company.com", "General One", "tier1", "general", "building1"),
+    ("general3@company.com", "General Three", "tier2", "general", "building3"),
+]
+
+
+def seed_staff():
+    for email, name, tier, specialization, building in STAFF:
+        db.session.add(User(email=email, name=name, tier_level=tier,
+                            specialization=specialization, building=building))
+    db.session.commit()
+
+
+def ticket(device_type=None, location=None):
+    return {"user_email": "user@company.com", "subject": "s", "description": "d",
+            "extracted_info": {"device_type": device_type, "location": location}}
+
+
+def classification(category="other", urgency="low", expertise_level="tier1"):
+    return {"category": category, "urgency": urgency, "expertise_level": expertise_level}
+
+
+def count_queries(func):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+def names(result):
+    return tuple(result[role]["name"] if result[role] else None
+                 for role in ("primary", "secondary"))
+
+
+def test_rules_resolve_against_roster(app):
+    """Test that each rule picks the expected staff member from the roster."""
+    seed_staff()
+
+    def assign(intake, classification_result):
+        # Fresh engine each time so earlier picks don't shift workload
+        return names(AssignmentEngine().assign_ticket(intake, classification_result))
+
+    assert assign(ticket("phone", "building 1"), classification()) == ("Phone Tech", "General One")
+    # Printer tech is tier1, so a tier3 printer ticket falls through to category
+    assert assign(ticket("printer"), classification("network", expertise_level="tier3")) == \
+        ("Network Mid", None)
+    assert assign(ticket(), classification("database", urgency="critical")) == ("Phone Tech", None)
+    assert assign(ticket(location="3rd floor"), classification(expertise_level="tier2")) == \
+        ("General Three", None)
+    assert assign(ticket(location="1st floor"), classification(expertise_level="tier3")) == \
+        ("General One", None)
+
+
+def test_urgency_escalation_prefers_most_senior(app):
+    """Test that urgent tickets escalate to the most senior matching user."""
+    seed_staff()
+    engine = AssignmentEngine()
+
+    rule = engine.primary_rules[2]
+    engine.roster.refresh()
+    data = {"classification": classification("network", urgency="high")}
+    assert rule.get_user(data, engine.roster).name == "Network Senior"
+
+
+def test_assignment_queries_database_once(app):
+    """Test that repeated assignments reuse the cached roster without querying."""
+    seed_staff()
+    engine = AssignmentEngine()
+
+    _, first = count_queries(lambda: engine.assign_ticket(ticket("phone"), classification()))
+    _, later = count_queries(lambda: [
+        engine.assign_ticket(ticket(location="building 3"),
+                             classification("network", urgency="high"))
+        for _ in range(10)
+    ])
+
+    # Roster + open workload counts, then nothing until a reload is due
+    assert first == 2
+    assert later == 0
+
+
+def test_roster_reloads_after_user_changes(app):
+    """Test that adding a user invalidates the cached roster."""
+    seed_staff()
+    engine = AssignmentEngine()
+    assert names(engine.assign_ticket(ticket(), classification("hardware"))) == \
+        ("General One", None)
+
+    db.session.add(User(email="hw@company.com", name="Hardware Tech", tier_level="tier1",
+                        specialization="hardware"))
+    db.session.commit()
+
+    assert names(engine.assign_ticket(ticket(), classification("hardware"))) == \
+        ("Hardware Tech", None)
+
+
+def test_roster_reloads_after_ttl(app, monkeypatch):
+    """Test that changes made by other processes are picked up after the TTL."""
+    seed_staff()
+    roster = StaffRoster(ttl=60)
+    roster.refresh()
+    assert not roster.is_stale()
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert roster.is_stale()
+
+
+def test_least_loaded_user_is_picked(app):
+    """Test that matching tickets spread across peers instead of piling on one."""
+    seed_staff()
+    engine = AssignmentEngine()
+
+    picks = [names(engine.assign_ticket(ticket(), classification(expertise_level="tier3")))[0]
+             for _ in range(4)]
+
+    assert picks == ["General One", "General Three", "General One", "General Three"]
+
+
+def test_full_users_are_skipped_then_overflow(app):
+    """Test that users at capacity are skipped until everyone is full."""
+    seed_staff()
+    engine = AssignmentEngine(StaffRoster(capacity={"tier1": 1, "tier2": 1, "tier3": 1}))
+    network_ticket = classification("network")
+
+    picks = [names(engine.assign_ticket(ticket(), network_ticket))[0] for _ in range(3)]
+
+    # Both network engineers full after one ticket each; falls through to general IT
+    assert picks == ["Network Mid", "Network Senior", "General One"]
+
+    full = AssignmentEngine(StaffRoster(capacity={"tier1": 0, "tier2": 0, "tier3": 0}))
+    assert names(full.assign_ticket(ticket(), network_ticket))[0] == "Network Mid"
+
+
+def seed_open_ticket(ticket_id, user_id):
+    db.session.add(Ticket(id=ticket_id, user_email="user@company.com", subject="s",
+                          description="d"))
+    db.session.add(TicketAssignments(ticket_id=ticket_id, user_id=user_id, role="primary"))
+    db.session.commit()
+
+
+def test_workload_follows_ticket_status(app):
+    """Test that open-ticket counts track status changes and ignore rollbacks."""
+    seed_staff()
+    user_id = User.query.filter_by(name="General One").one().user_id
+    seed_open_ticket("TKT-1", user_id)
+    seed_open_ticket("TKT-2", user_id)
+    roster = StaffRoster()
+    roster.refresh()
+    assert roster.load(user_id) == 2
+
+    ticket_row = db.session.get(Ticket, "TKT-1")
+    ticket_row.status = TicketStatus.RESOLVED
+    db.session.flush()
+    db.session.rollback()
+    assert roster.load(user_id) == 2
+
+    ticket_row = db.session.get(Ticket, "TKT-1")
+    ticket_row.status = TicketStatus.RESOLVED
+    db.session.commit()
+    assert roster.load(user_id) == 1
+
+    ticket_row.status = TicketStatus.IN_PROGRESS
+    db.session.commit()
+    assert roster.load(user_id) == 2
+
+
+def test_picks_become_workload_only_when_saved(app):
+    """Test that a pick counts as a claim until its assignment commits or rolls back."""
+    seed_staff()
+    engine = AssignmentEngine()
+    user_id = User.query.filter_by(name="General One").one().user_id
+
+    engine.assign_ticket(ticket(), classification())
+    assert engine.roster.load(user_id) == 1
+    db.session.add(Ticket(id="TKT-1", user_email="user@company.com", subject="s", description="d"))
+    db.session.execute(db.insert(TicketAssignments), [{"ticket_id": "TKT-1", "user_id": user_id,
+                                                       "role": "primary"}])
+    db.session.rollback()
+    assert engine.roster.load(user_id) == 0
+
+    engine.assign_ticket(ticket(), classification())
+    db.session.add(Ticket(id="TKT-1", user_email="user@company.com", subject="s", description="d"))
+    db.session.execute(db.insert(TicketAssignments), [{"ticket_id": "TKT-1", "user_id": user_id,
+                                                       "role": "primary"}])
+    db.session.commit()
+    assert engine.roster.load(user_id) == 1
+    assert engine.roster._claims[user_id] == 0
+
+
+class StubAgent:
+    def __init__(self, result):
+        self.result = result
+
+    def process(self, *args):
+        return self.result
+
+
+def test_failed_pipeline_releases_picks_made_after_the_failure(app, monkeypatch):
+    """Test that claims are released when diagnosis fails before assignment returns."""
+    seed_staff()
+    engine = AssignmentEngine()
+    monkeypatch.setattr(assignment, "_assignment_engine", engine)
+    user_id = User.query.filter_by(name="General One").one().user_id
+
+    def slow_assign(intake_result, classification_result):
+        time.sleep(0.1)
+        return assignment.assign_ticket(intake_result, classification_result)
+
+    monkeypatch.setattr(overseer_module, "assign_ticket", slow_assign)
+    overseer = overseer_module.Overseer(client=None, redis_client=None)
+    overseer.intake_agent = StubAgent(ticket())
+    overseer.classifier_agent = StubAgent(classification())
+    overseer.diagnostic_agent = StubAgent(None)
+    overseer.fetch_agent = StubAgent({"past_solutions": []})
+
+    for _ in range(3):
+        assert overseer.process_ticket({})["error"] == "Diagnostic failed"
+
+    assert engine.roster.load(user_id) == 0
+
+
+def test_roster_reload_drops_unsettled_claims(app):
+    """Test that a reload clears claims that were never committed or released."""
+    seed_staff()
+    engine = AssignmentEngine()
+    user_id = User.query.filter_by(name="General One").one().user_id
+    engine.assign_ticket(ticket(), classification())
+    assert engine.roster.load(user_id) == 1
+
+    engine.roster.invalidate()
+    engine.roster.refresh()
+
+    assert engine.roster.load(user_id) == 0
+
+
+def test_assign_batch_balances_and_bulk_inserts(app):
+    """Test that a batch spreads load and inserts assignments in one statement."""
+    seed_staff()
+    tickets = []
+    for i in range(200):
+        ticket_id = f"TKT-{i:04d}"
+        db.session.add(Ticket(id=ticket_id, user_email="user@company.com", subject="s",
+                              description="d"))
+        tickets.append({"ticket_id": ticket_id, "intake_result": ticket(location="building 3"),
+                        "classification": classification("network")})
+    db.session.commit()
+    engine = AssignmentEngine(StaffRoster(capacity={}))
+
+    results, queries = count_queries(lambda: engine.assign_batch(tickets))
+    db.session.commit()
+
+    # Roster + workload load, then a single executemany INSERT
+    assert queries == 3
+    primaries = [results[t["ticket_id"]]["primary"]["name"] for t in tickets]
+    assert primaries.count("Network Mid") == primaries.count("Network Senior") == 100
+    assert all(results[t["ticket_id"]]["secondary"]["name"] == "General Three" for t in tickets)
+    assert TicketAssignments.query.count() == 400
+    assert TicketAssignments.query.filter_by(ticket_id="TKT-0000", role="secondary").count() == 1
+
+
+def test_assign_batch_dry_run_leaves_workload_unchanged(app):
+    """Test that persist=False balances picks within the batch but claims nothing."""
+    seed_staff()
+    tickets = [{"ticket_id": f"TKT-{i}", "intake_result": ticket(),
+                "classification": classification("network")} for i in range(4)]
+    engine = AssignmentEngine(StaffRoster(capacity={}))
+
+    results = engine.assign_batch(tickets, persist=False)
+
+    primaries = [results[t["ticket_id"]]["primary"]["name"] for t in tickets]
+    assert primaries.count("Network Mid") == primaries.count("Network Senior") == 2
+    assert sum(engine.roster._claims.values()) == 0
+    assert TicketAssignments.query.count() == 0
+
+
+def test_decision_table_is_precompiled():
+    """Test that known keys map to precompiled rule plans at construction."""
+    engine = AssignmentEngine()
+
+    plan = engine._decision_table[("printer", "network", "high", "tier2")]
+
+    assert [rule.__class__.__name__ for rule, _ in plan] == [
+        "DeviceSpecialistRule", "CategorySpecialistRule", "UrgencyEscalationRule", "GeneralITRule"
+    ]
+    assert plan[0][1] == (("printers", ("tier2", "tier2", "tier3"), ANY),)
+    assert len(engine._decision_table) == 3 * 4 * 4 * 3
+
+
+def test_unseen_key_is_planned_without_growing_table(app):
+    """Test that an unknown key is still assigned but not cached."""
+    seed_staff()
+    db.session.add(User(email="db@company.com", name="DB Senior", tier_level="tier3",
+                        specialization="database"))
+    db.session.commit()
+    engine = AssignmentEngine()
+
+    result = engine.assign_ticket(ticket(), classification("database", urgency="critical"))
+
+    assert names(result) == ("DB Senior", None)
+    assert (None, "database", "critical", "tier1") not in engine._decision_table
+    assert len(engine._decision_table) == 3 * 4 * 4 * 3
+
+
+def test_custom_rules_keep_subclass_api(app):
+    """Test that rules outside the table key run per ticket in priority order."""
+    seed_staff()
+
+    class SeniorForCeoRule(AssignmentRule):
+        def __init__(self):
+            super().__init__(priority=0)
+
+        def matches(self, ticket_data):
+            return ticket_data.get("user_email", "").startswith("ceo@")
+
+        def get_user(self, ticket_data, roster):
+            return roster.pick("network", tiers=["tier3"])
+
+    engine = AssignmentEngine()
+    engine.primary_rules.insert(0, SeniorForCeoRule())
+    engine.compile_rules()
+
+    ceo_ticket = {**ticket("phone"), "user_email": "ceo@company.com"}
+    assert names(engine.assign_ticket(ceo_ticket, classification()))[0] == "Network Senior"
+    assert names(engine.assign_ticket(ticket("phone"), classification()))[0] == "Phone Tech"
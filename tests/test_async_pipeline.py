@@ -0,0 +1,108 @@
+"""
+Tests for the asyncio agent pipeline against a local fake Messages API.
+"""
+
+import asyncio
+import time
+
+import pytest
+from anthropic import Anthropic, AsyncAnthropic
+
+import overseer as overseer_module
+from overseer import AsyncOverseer
+from fake_messages_api import FakeMessagesAPI
+from mas_agents.intake_agent import AsyncIntakeAgent, IntakeAgent
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setenv("MODEL", "fake-model")
+    monkeypatch.setattr(overseer_module, "assign_ticket",
+                        lambda intake, classification: {'primary': None, 'secondary': None})
+    with FakeMessagesAPI(latency=0.05) as api:
+        yield api
+
+
+def test_async_agent_matches_sync_agent_output(fake_api):
+    """Test that the async agent reuses the sync agent's prompt and parsing."""
+    ticket = {"user_email": "john@company.com", "subject": "printer broken!!!",
+              "description": "cant print on 3rd floor"}
+
+    sync_result = IntakeAgent(Anthropic(api_key="test", base_url=fake_api.base_url)).process(ticket)
+    async_agent = AsyncIntakeAgent(AsyncAnthropic(api_key="test", base_url=fake_api.base_url))
+    async_result = asyncio.run(async_agent.process(ticket))
+
+    assert async_result == sync_result
+    assert fake_api.requests[0]["system"] == fake_api.requests[1]["system"]
+
+
+def test_async_overseer_processes_many_tickets_concurrently(fake_api):
+    """Test that 20 pipelines finish in far less than 20x one pipeline's latency."""
+    client = AsyncAnthropic(api_key="test", base_url=fake_api.base_url)
+    overseer = AsyncOverseer(client, redis_client=None, max_concurrency=20)
+    tickets = [{"user_email": f"user{i}@company.com", "subject": "printer", "description": "down"}
+               for i in range(20)]
+
+    async def run():
+        start = asyncio.get_running_loop().time()
+        results = await overseer.process_many(tickets)
+        return results, asyncio.get_running_loop().time() - start
+
+    results, elapsed = asyncio.run(run())
+
+    assert all(r["status"] == "solution_generated" for r in results)
+    assert len(fake_api.requests) == 20 * 4
+    # Critical path is 4 Claude calls; serial processing would need 80
+    assert elapsed < 0.05 * 80 / 2
+
+
+def test_async_overseer_bounds_concurrency(fake_api):
+    """Test that max_concurrency caps the number of in-flight pipelines."""
+    client = AsyncAnthropic(api_key="test", base_url=fake_api.base_url)
+    overseer = AsyncOverseer(client, redis_client=None, max_concurrency=2)
+    in_flight = []
+    peak = []
+
+    original = overseer._run_stages
+
+    async def tracked(results, workflow_log):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        try:
+            return await original(results, workflow_log)
+        finally:
+            in_flight.pop()
+
+    overseer._run_stages = tracked
+    asyncio.run(overseer.process_many([{"subject": "s", "description": "d"}] * 6))
+
+    assert max(peak) == 2
+
+
+def test_async_overseer_failure_waits_for_blocking_stages(fake_api, monkeypatch):
+    """Test that a failed run waits for threaded stages instead of abandoning them."""
+    finished = []
+
+    def slow_assign(intake, classification):
+        time.sleep(0.2)
+        finished.append("assignments")
+        return {'primary': None, 'secondary': None}
+
+    class FailingAgent:
+        async def process(self, *args):
+            return None
+
+    monkeypatch.setattr(overseer_module, "assign_ticket", slow_assign)
+    client = AsyncAnthropic(api_key="test", base_url=fake_api.base_url)
+    overseer = AsyncOverseer(client, redis_client=None)
+    overseer.diagnostic_agent = FailingAgent()
+
+    async def run():
+        result = await overseer.process_ticket({"subject": "s", "description": "d"})
+        # Checked before asyncio.run joins the default executor
+        return result, list(finished)
+
+    result, finished_on_return = asyncio.run(run())
+
+    assert result["error"] == "Diagnostic failed"
+    assert finished_on_return == ["assignments"]
@@ -0,0 +1,152 @@
+"""
+Tests for the ticket change feed (Redis stream with database fallback).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from change_feed import decode_feed_cursor, fetch_changes, start_cursor
+from models import db, Ticket
+
+BASE = datetime(2025, 12, 1, 9, 0, 0)
+FIELDS = ["id", "subject"]
+
+
+class FakeRedisDB:
+    """Stands in for RedisDB's change-feed stream methods"""
+
+    def __init__(self):
+        self.events = []
+        self.sequence = 0
+        self.available = True
+
+    def publish_ticket_events(self, events):
+        for event in events:
+            self.sequence += 1
+            self.events.append((f"{self.sequence}-0", dict(event)))
+        return self.events[-1][0]
+
+    def read_ticket_events(self, after_id, count):
+        if not self.available:
+            return None
+        after = int(after_id.split("-")[0])
+        return [e for e in self.events if int(e[0].split("-")[0]) > after][:count]
+
+    def ticket_events_bounds(self):
+        if not self.available:
+            return None
+        if not self.events:
+            return None, None
+        return self.events[0][0], self.events[-1][0]
+
+
+def add_ticket(ticket_id, minutes, redis_db=None):
+    stamp = BASE + timedelta(minutes=minutes)
+    db.session.add(Ticket(id=ticket_id, user_email="user@company.com",
+                          subject=f"Subject {ticket_id}", description="d",
+                          created_at=stamp, updated_at=stamp))
+    db.session.commit()
+    if redis_db is not None:
+        redis_db.publish_ticket_events([{"ticket_id": ticket_id, "event": "created"}])
+
+
+def changes(cursor, redis_db=None, limit=100):
+    return fetch_changes(cursor, FIELDS, set(), limit=limit, redis_db=redis_db)
+
+
+def ids(result):
+    return [ticket["id"] for ticket in result["tickets"]]
+
+
+def test_stream_returns_only_new_tickets(app):
+    """Test that the stream returns tickets changed after the cursor, each once."""
+    redis_db = FakeRedisDB()
+    add_ticket("TKT-OLD", 0, redis_db)
+    cursor = start_cursor(redis_db)
+
+    add_ticket("TKT-1", 1, redis_db)
+    add_ticket("TKT-2", 2, redis_db)
+    # Processing TKT-1 again moves it after TKT-2
+    redis_db.publish_ticket_events([{"ticket_id": "TKT-1", "event": "processed"}])
+
+    result = changes(cursor, redis_db)
+    assert ids(result) == ["TKT-2", "TKT-1"]
+    assert result["tickets"][0] == {"id": "TKT-2", "subject": "Subject TKT-2"}
+    assert not result["has_more"]
+    assert decode_feed_cursor(result["cursor"])[0] == "4-0"
+
+    assert ids(changes(result["cursor"], redis_db)) == []
+
+
+def test_stream_pages_by_event_count(app):
+    """Test that stream reads are paged by event count and report has_more."""
+    redis_db = FakeRedisDB()
+    cursor = start_cursor(redis_db)
+    add_ticket("TKT-0", 0, redis_db)
+    # Empty stream at start: the first call catches up from the database
+    result = changes(cursor, redis_db)
+    assert ids(result) == ["TKT-0"]
+
+    for i in range(1, 4):
+        add_ticket(f"TKT-{i}", i, redis_db)
+    first = changes(result["cursor"], redis_db, limit=2)
+    second = changes(first["cursor"], redis_db, limit=2)
+
+    assert ids(first) == ["TKT-1", "TKT-2"] and first["has_more"]
+    assert ids(second) == ["TKT-3"] and not second["has_more"]
+
+
+def test_falls_back_to_database_without_redis(app):
+    """Test that the feed pages from the database when Redis isn't configured."""
+    add_ticket("TKT-OLD", 0)
+    cursor = start_cursor()
+    add_ticket("TKT-1", 1)
+    add_ticket("TKT-2", 2)
+
+    first = changes(cursor, limit=1)
+    second = changes(first["cursor"], limit=1)
+    assert ids(first) == ["TKT-1"] and first["has_more"]
+    assert ids(second) == ["TKT-2"] and not second["has_more"]
+
+    ticket = db.session.get(Ticket, "TKT-1")
+    ticket.updated_at = BASE + timedelta(minutes=5)
+    db.session.commit()
+    assert ids(changes(second["cursor"])) == ["TKT-1"]
+
+
+def test_trimmed_stream_catches_up_from_database_then_resumes(app):
+    """Test that a cursor behind a trimmed stream catches up from the database."""
+    redis_db = FakeRedisDB()
+    add_ticket("TKT-0", 0, redis_db)
+    cursor = start_cursor(redis_db)
+    add_ticket("TKT-1", 1, redis_db)
+    add_ticket("TKT-2", 2, redis_db)
+    # Stream trimmed past the client's position
+    del redis_db.events[:2]
+
+    caught_up = changes(cursor, redis_db)
+    assert ids(caught_up) == ["TKT-1", "TKT-2"]
+    assert decode_feed_cursor(caught_up["cursor"])[0] == "3-0"
+
+    add_ticket("TKT-3", 3, redis_db)
+    assert ids(changes(caught_up["cursor"], redis_db)) == ["TKT-3"]
+
+
+def test_redis_outage_uses_database(app):
+    """Test that a Redis outage falls back to the database."""
+    redis_db = FakeRedisDB()
+    cursor = start_cursor(redis_db)
+    add_ticket("TKT-1", 1, redis_db)
+    redis_db.available = False
+
+    result = changes(cursor, redis_db)
+
+    assert ids(result) == ["TKT-1"]
+    assert decode_feed_cursor(result["cursor"])[0] is None
+
+
+def test_invalid_cursor_raises_value_error(app):
+    """Test that a malformed cursor raises ValueError."""
+    with pytest.raises(ValueError):
+        changes("not-a-cursor")
@@ -0,0 +1,91 @@
+"""
+Tests for the shared Anthropic client factory.
+"""
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from fake_messages_api import FakeMessagesAPI
+from mas_agents import clients
+from mas_agents.clients import (
+    async_warm_up, create_async_client, create_client, get_client, warm_up
+)
+from mas_agents.agent_config import AGENT_CONFIGS
+from mas_agents.intake_agent import IntakeAgent
+from mas_agents.solution_agent import SolutionAgent
+from mas_agents.request_governor import RequestGovernor
+
+TICKET = {"user_email": "john@company.com", "subject": "printer broken",
+          "description": "cant print"}
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setenv("MODEL", "fake-model")
+    with FakeMessagesAPI(latency=0) as api:
+        yield api
+
+
+def test_client_is_tuned_for_pooling():
+    """Test that the client disables SDK retries and keeps every pooled connection alive."""
+    client = create_client(api_key="test", max_connections=8)
+
+    assert client.max_retries == 0
+    assert client.timeout.connect == clients.CONNECT_TIMEOUT
+    pool = client._client._transport._pool
+    assert pool._max_connections == 8 and pool._max_keepalive_connections == 8
+    assert pool._keepalive_expiry == clients.KEEPALIVE_EXPIRY
+
+
+def test_shared_client_is_created_once(monkeypatch):
+    """Test that get_client returns the same client each time."""
+    monkeypatch.setattr(clients, "_clients", {})
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+
+    assert get_client() is get_client()
+
+
+def test_warm_up_connection_is_reused(fake_api):
+    """Test that agent calls reuse the connection opened by warm_up."""
+    client = create_client(api_key="test", base_url=fake_api.base_url)
+
+    assert warm_up(client)
+    agent = IntakeAgent(client)
+    for _ in range(3):
+        assert agent.process(TICKET)
+
+    assert fake_api.model_requests == 1
+    assert fake_api.connections_opened == 1
+
+
+def test_warm_up_failure_is_reported_not_raised():
+    """Test that warm_up returns False when the API is unreachable."""
+    client = create_client(api_key="test", base_url="http://127.0.0.1:9")
+
+    assert warm_up(client) is False
+
+
+def test_async_warm_up_opens_requested_connections(fake_api):
+    """Test that async_warm_up sends one request per requested connection."""
+    async def run():
+        client = create_async_client(api_key="test", base_url=fake_api.base_url)
+        return await async_warm_up(client, connections=4)
+
+    assert asyncio.run(run())
+    assert fake_api.model_requests == 4
+
+
+def test_agent_read_timeout_budget(fake_api, monkeypatch):
+    """Test that an agent's read timeout comes from its AgentConfig."""
+    assert SolutionAgent(client=None).timeout.read == AGENT_CONFIGS["SolutionAgent"].timeout
+    assert SolutionAgent(client=None).timeout.connect == clients.CONNECT_TIMEOUT
+
+    monkeypatch.setitem(AGENT_CONFIGS, "IntakeAgent",
+                        replace(AGENT_CONFIGS["IntakeAgent"], timeout=0.05))
+    fake_api.latency = 0.5
+    agent = IntakeAgent(create_client(api_key="test", base_url=fake_api.base_url))
+    agent.governor = RequestGovernor(max_retries=0)
+
+    assert agent.process(TICKET) is None
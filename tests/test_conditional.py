@@ -0,0 +1,133 @@
+"""
+Tests for ETag / Last-Modified validators on ticket responses.
+"""
+
+from datetime import datetime
+
+from conditional import conditional_response, listing_validators, ticket_validators
+from models import db, Ticket, Classifications, TicketAssignments, User
+
+CREATED = datetime(2025, 12, 22, 14, 48, 41, 123000)
+
+
+def seed_ticket(ticket_id="TKT-1"):
+    db.session.add(Ticket(id=ticket_id, user_email="user@company.com", subject="Printer",
+                          description="Cannot print", created_at=CREATED, updated_at=CREATED))
+    db.session.commit()
+
+
+def respond(app, etag, last_modified, headers=None):
+    calls = []
+
+    def build_body():
+        calls.append(1)
+        return {"id": "TKT-1"}
+
+    with app.test_request_context(headers=headers or {}):
+        response = conditional_response(build_body, etag, last_modified)
+    return response, len(calls)
+
+
+def test_ticket_etag_changes_with_pipeline_rows(app):
+    """Test that the detail ETag changes whenever the ticket or its output changes."""
+    seed_ticket()
+    etag, last_modified = ticket_validators("TKT-1")
+    assert last_modified == CREATED
+    assert ticket_validators("TKT-1") == (etag, last_modified)
+
+    later = datetime(2025, 12, 22, 15, 0, 0)
+    db.session.add(Classifications(ticket_id="TKT-1", category="hardware", urgency="low",
+                                   expertise_level="tier1", reasoning="r", updated_at=later))
+    db.session.commit()
+    after_classification = ticket_validators("TKT-1")
+    assert after_classification[0] != etag
+    assert after_classification[1] == later
+
+    user = User(email="tech@company.com", name="Tech")
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(TicketAssignments(ticket_id="TKT-1", user_id=user.user_id, role="primary",
+                                     assigned_at=later))
+    db.session.commit()
+    after_assignment = ticket_validators("TKT-1")
+    assert after_assignment[0] != after_classification[0]
+
+    # assigned_people shows the user's name, so renaming them is a new version
+    user.name = "Tech Renamed"
+    db.session.commit()
+    assert ticket_validators("TKT-1")[0] != after_assignment[0]
+
+    assert ticket_validators("TKT-MISSING") is None
+
+
+def test_matching_if_none_match_skips_body(app):
+    """Test that a matching If-None-Match returns 304 without building the body."""
+    seed_ticket()
+    etag, last_modified = ticket_validators("TKT-1")
+
+    response, built = respond(app, etag, last_modified)
+    assert response.status_code == 200 and built == 1
+    assert response.headers["ETag"] == f'W/"{etag}"'
+    assert response.headers["Last-Modified"] == "Mon, 22 Dec 2025 14:48:41 GMT"
+
+    response, built = respond(app, etag, last_modified, {"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304 and built == 0
+    assert response.get_data() == b""
+
+    response, built = respond(app, etag, last_modified, {"If-None-Match": 'W/"stale"'})
+    assert response.status_code == 200 and built == 1
+
+
+def test_if_modified_since_used_without_etag(app):
+    """Test that If-Modified-Since applies only when no If-None-Match is sent."""
+    seed_ticket()
+    etag, last_modified = ticket_validators("TKT-1")
+
+    response, _ = respond(app, etag, last_modified,
+                          {"If-Modified-Since": "Mon, 22 Dec 2025 14:48:41 GMT"})
+    assert response.status_code == 304
+
+    response, _ = respond(app, etag, last_modified,
+                          {"If-Modified-Since": "Mon, 22 Dec 2025 14:48:40 GMT"})
+    assert response.status_code == 200
+
+    # If-None-Match takes precedence
+    response, _ = respond(app, etag, last_modified,
+                          {"If-None-Match": 'W/"stale"',
+                           "If-Modified-Since": "Mon, 22 Dec 2025 14:48:41 GMT"})
+    assert response.status_code == 200
+
+
+def test_listing_etag_depends_on_rows_and_shape(app):
+    """Test that the listing ETag tracks the rows and the requested fields."""
+    seed_ticket("TKT-1")
+    seed_ticket("TKT-2")
+    tickets = Ticket.with_details().order_by(Ticket.id).all()
+    relations = {"classification", "diagnostic", "solution", "assignments"}
+
+    etag, last_modified = listing_validators(tickets, relations, ["id"])
+
+    assert last_modified == CREATED
+    assert listing_validators(tickets, relations, ["id"])[0] == etag
+    assert listing_validators(tickets, relations, ["id", "subject"])[0] != etag
+    assert listing_validators(tickets[:1], relations, ["id"])[0] != etag
+
+    tickets[0].updated_at = datetime(2025, 12, 23)
+    assert listing_validators(tickets, relations, ["id"])[0] != etag
+
+
+def test_listing_etag_covers_assigned_users(app):
+    """Test that editing an assigned user's email changes the listing ETag."""
+    seed_ticket()
+    user = User(email="tech@company.com", name="Tech")
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(TicketAssignments(ticket_id="TKT-1", user_id=user.user_id, role="primary"))
+    db.session.commit()
+    relations = {"assignments"}
+
+    etag, _ = listing_validators(Ticket.with_details(relations).all(), relations)
+    user.email = "tech2@company.com"
+    db.session.commit()
+
+    assert listing_validators(Ticket.with_details(relations).all(), relations)[0] != etag
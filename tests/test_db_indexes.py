@@ -0,0 +1,68 @@
+"""
+Tests for the hot-column index migration.
+"""
+
+from sqlalchemy import text
+
+import migrate_db_indexes
+from models import db
+
+
+def index_names():
+    names = set()
+    for table in ("tickets", "users", "ticket_assignments", "workflow_log"):
+        names.update(index["name"] for index in db.inspect(db.engine).get_indexes(table))
+    return names
+
+
+def test_models_declare_every_migrated_index(app):
+    """Test that create_all builds every index the migration manages."""
+    assert set(migrate_db_indexes.INDEXES) <= index_names()
+
+
+def column_names(table):
+    return {column["name"] for column in db.inspect(db.engine).get_columns(table)}
+
+
+def test_upgrade_restores_indexes_and_is_repeatable(app):
+    """Test that upgrade recreates dropped indexes and can run twice."""
+    with db.engine.begin() as connection:
+        migrate_db_indexes.downgrade(connection)
+    assert not set(migrate_db_indexes.INDEXES) & index_names()
+
+    for _ in range(2):
+        with db.engine.begin() as connection:
+            migrate_db_indexes.upgrade(connection)
+
+    assert set(migrate_db_indexes.INDEXES) <= index_names()
+
+
+def test_upgrade_adds_columns_to_existing_tables(app):
+    """Test that upgrade adds duplicate_of and its foreign key to an old tickets table."""
+    with db.engine.begin() as connection:
+        # tickets as created before duplicate_of existed
+        connection.exec_driver_sql("DROP TABLE tickets")
+        connection.exec_driver_sql(
+            "CREATE TABLE tickets (id VARCHAR PRIMARY KEY, user_email VARCHAR NOT NULL, "
+            "subject VARCHAR NOT NULL, description VARCHAR NOT NULL, status VARCHAR(11), "
+            "created_at DATETIME, updated_at DATETIME)"
+        )
+    assert "duplicate_of" not in column_names("tickets")
+
+    for _ in range(2):
+        with db.engine.begin() as connection:
+            migrate_db_indexes.upgrade(connection)
+
+    assert "duplicate_of" in column_names("tickets")
+    foreign_keys = db.inspect(db.engine).get_foreign_keys("tickets")
+    assert [(fk["constrained_columns"], fk["referred_table"]) for fk in foreign_keys] == \
+        [(["duplicate_of"], "tickets")]
+
+
+def test_assignment_lookup_uses_index(app):
+    """Test that the assignment lookup is answered from the covering index."""
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT user_id FROM ticket_assignments WHERE ticket_id = 'TKT-1'"
+    )).all()
+
+    assert "COVERING INDEX ix_ticket_assignments_ticket_id_user_id" in plan[0][-1]
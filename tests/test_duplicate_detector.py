@@ -0,0 +1,199 @@
+"""
+Tests for near-duplicate ticket detection and its reuse in the Overseer.
+"""
+
+import json
+import time
+
+import overseer as overseer_module
+from duplicate_detector import DuplicateDetector, shingles
+from overseer import Overseer
+
+
+PRINTER = {
+    "user_email": "john@company.com",
+    "subject": "Printer on 3rd floor down",
+    "description": ("Cannot print anything from my laptop, "
+                    "the printer on the 3rd floor shows offline.")
+}
+PRINTER_REWORDED = {
+    "user_email": "jane@company.com",
+    "subject": "printer on 3rd floor down!!",
+    "description": "Can't print anything from my laptop, the printer on the 3rd floor shows offline"
+}
+# Shares LSH bands with PRINTER_REWORDED but is below the threshold
+PRINTER_ELSEWHERE = {
+    "user_email": "ann@company.com",
+    "subject": "Printer on 3rd floor down",
+    "description": ("Cannot print anything from my desktop, "
+                    "the printer on the 2nd floor shows an error.")
+}
+VPN = {
+    "user_email": "bob@company.com",
+    "subject": "VPN keeps disconnecting",
+    "description": "Cannot connect to the VPN from home since this morning."
+}
+
+PIPELINE_RESULT = {
+    "intake_result": {**PRINTER,
+                      "extracted_info": {"device_type": "printer", "location": "3rd floor"}},
+    "classification": {"category": "hardware", "urgency": "high",
+                       "expertise_level": "tier1", "reasoning": "r"},
+    "diagnosis": {"diagnosis": "Printer offline", "potential_causes": [], "recommended_tests": []},
+    "fetched_data": {"past_solutions": []},
+    "solution": {"solution": "Power cycle the printer", "tools_needed": [],
+                 "estimated_time": "5m", "confidence": "high"},
+    "duplicate_of": None
+}
+
+
+class FakeRedisDB:
+    """Stands in for RedisDB's signature index methods"""
+
+    def __init__(self):
+        self.signatures = {}
+        self.bands = {}
+
+    def store_ticket_signature(self, ticket_id, bands, data, ttl):
+        self.signatures[ticket_id] = data
+        for band in bands:
+            self.bands.setdefault(band, set()).add(ticket_id)
+        return True
+
+    def fetch_signature_candidates(self, bands):
+        ids = set().union(*(self.bands.get(band, set()) for band in bands))
+        return {tid: self.signatures[tid] for tid in ids if tid in self.signatures}
+
+
+class CountingAgent:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def process(self, *args):
+        self.calls += 1
+        return self.result
+
+
+def test_shingles_ignore_case_and_punctuation():
+    """Test that shingling ignores case and punctuation."""
+    assert shingles("Printer DOWN!!") == shingles("printer down")
+
+
+def test_reworded_ticket_is_a_duplicate():
+    """Test that a reworded ticket matches the original above the threshold."""
+    detector = DuplicateDetector()
+    detector.remember("TKT-1", PRINTER, PIPELINE_RESULT)
+
+    match = detector.find(PRINTER_REWORDED)
+
+    assert match["ticket_id"] == "TKT-1"
+    assert match["similarity"] >= detector.threshold
+    assert match["results"]["solution"]["solution"] == "Power cycle the printer"
+
+
+def test_unrelated_ticket_is_not_a_duplicate():
+    """Test that an unrelated ticket finds no match."""
+    detector = DuplicateDetector()
+    detector.remember("TKT-1", PRINTER, PIPELINE_RESULT)
+
+    assert detector.find(VPN) is None
+
+
+def test_expired_entries_are_not_reused():
+    """Test that entries past their TTL are ignored."""
+    detector = DuplicateDetector(ttl=0)
+    detector.remember("TKT-1", PRINTER, PIPELINE_RESULT)
+
+    assert detector.find(PRINTER) is None
+
+
+def test_memory_index_is_bounded():
+    """Test that the in-memory index evicts the oldest entry when full."""
+    detector = DuplicateDetector(max_entries=1)
+    detector.remember("TKT-1", PRINTER, PIPELINE_RESULT)
+    detector.remember("TKT-2", VPN, PIPELINE_RESULT)
+
+    assert detector.find(PRINTER) is None
+    assert detector.find(VPN)["ticket_id"] == "TKT-2"
+
+
+def test_redis_index_is_shared_between_detectors():
+    """Test that a worker finds duplicates indexed by another worker."""
+    redis_db = FakeRedisDB()
+    DuplicateDetector(redis_db=redis_db).remember("TKT-1", PRINTER, PIPELINE_RESULT)
+
+    stored = json.loads(redis_db.signatures["TKT-1"])
+    assert set(stored["results"]) == set(DuplicateDetector.REUSED_STAGES) | {"extracted_info"}
+
+    other_worker = DuplicateDetector(redis_db=redis_db)
+    assert other_worker.find(PRINTER_REWORDED)["ticket_id"] == "TKT-1"
+
+
+def test_local_near_miss_does_not_hide_shared_duplicate():
+    """Test that Redis candidates are scored even when the memory tier has some."""
+    redis_db = FakeRedisDB()
+    DuplicateDetector(redis_db=redis_db).remember("TKT-1", PRINTER, PIPELINE_RESULT)
+    detector = DuplicateDetector(redis_db=redis_db)
+    detector._memory_add("TKT-2", detector.signature(PRINTER_ELSEWHERE),
+                         detector.band_keys(detector.signature(PRINTER_ELSEWHERE)), {})
+
+    assert detector.find(PRINTER_REWORDED)["ticket_id"] == "TKT-1"
+
+
+def test_promoted_signatures_keep_remaining_ttl(monkeypatch):
+    """Test that an entry promoted from Redis expires with the Redis copy."""
+    redis_db = FakeRedisDB()
+    DuplicateDetector(redis_db=redis_db, ttl=100).remember("TKT-1", PRINTER, PIPELINE_RESULT)
+
+    wall_clock, now = time.time(), time.monotonic()
+    monkeypatch.setattr(time, "time", lambda: wall_clock + 60)
+    detector = DuplicateDetector(redis_db=redis_db, ttl=100)
+    assert detector.find(PRINTER)["ticket_id"] == "TKT-1"
+    redis_db.signatures.clear()
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 30)
+    assert detector.find(PRINTER)["ticket_id"] == "TKT-1"
+    monkeypatch.setattr(time, "monotonic", lambda: now + 45)
+    assert detector.find(PRINTER) is None
+
+
+def test_overseer_reuses_duplicate_results(monkeypatch):
+    """Test that a duplicate skips every Claude stage but is still assigned."""
+    assigned = []
+
+    def fake_assign(intake_result, classification_result):
+        assigned.append((intake_result["user_email"], intake_result["extracted_info"]))
+        return {'primary': None, 'secondary': None}
+
+    monkeypatch.setattr(overseer_module, "assign_ticket", fake_assign)
+
+    overseer = Overseer(client=None, redis_client=None, duplicate_detector=DuplicateDetector())
+    agents = {
+        "intake_agent": CountingAgent(PIPELINE_RESULT["intake_result"]),
+        "classifier_agent": CountingAgent(PIPELINE_RESULT["classification"]),
+        "diagnostic_agent": CountingAgent(PIPELINE_RESULT["diagnosis"]),
+        "fetch_agent": CountingAgent(PIPELINE_RESULT["fetched_data"]),
+        "solution_agent": CountingAgent(PIPELINE_RESULT["solution"]),
+    }
+    for name, agent in agents.items():
+        setattr(overseer, name, agent)
+
+    first = overseer.process_ticket(PRINTER)
+    overseer.remember("TKT-1", PRINTER, first)
+    second = overseer.process_ticket(PRINTER_REWORDED)
+
+    assert first["duplicate_of"] is None
+    assert second["duplicate_of"] == "TKT-1"
+    assert second["status"] == "solution_generated"
+    assert second["solution"] == first["solution"]
+    assert second["intake_result"]["user_email"] == "jane@company.com"
+    assert all(agent.calls == 1 for agent in agents.values())
+    # The duplicate is routed on the original's device and location
+    extracted_info = PIPELINE_RESULT["intake_result"]["extracted_info"]
+    assert assigned == [("john@company.com", extracted_info), ("jane@company.com", extracted_info)]
+    assert [e["stage"] for e in second["workflow_log"]] == ["duplicate_check", "assignments"]
+
+    # Duplicates are not indexed themselves, so later ones link to the original
+    overseer.remember("TKT-2", PRINTER_REWORDED, second)
+    assert overseer.process_ticket(PRINTER)["duplicate_of"] == "TKT-1"
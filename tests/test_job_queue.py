@@ -0,0 +1,269 @@
+"""
+Tests for asynchronous ticket submission: in-process job queue and worker.
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from fake_redis import FakeRedis
+from models import db, Ticket, Classifications, TicketAssignments, User, Workflow_log
+from job_queue import InMemoryJobQueue, JobStatus, RedisJobQueue
+from redis_client import RedisDB
+from worker import EventLoopOverseer, process_job, process_jobs
+
+
+class FakeOverseer:
+    """Returns a canned pipeline result instead of calling Claude."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+        self.remembered = []
+
+    def process_ticket(self, raw_ticket):
+        self.calls.append(raw_ticket)
+        return self.result
+
+    def process_many(self, raw_tickets):
+        return [self.process_ticket(raw_ticket) for raw_ticket in raw_tickets]
+
+    def remember(self, ticket_id, raw_ticket, overseer_result):
+        self.remembered.append(ticket_id)
+
+
+def pipeline_result(primary_user_id=None):
+    return {
+        "intake_result": {
+            "user_email": "john@company.com",
+            "subject": "Printer not working on 3rd floor",
+            "description": "Cannot print to the 3rd floor printer"
+        },
+        "classification": {
+            "category": "hardware", "urgency": "medium",
+            "expertise_level": "tier1", "reasoning": "Printer issue"
+        },
+        "assignments": {
+            "primary": {"user_id": primary_user_id} if primary_user_id else None,
+            "secondary": None
+        },
+        "diagnosis": {
+            "diagnosis": "Driver crashed", "potential_causes": ["driver"],
+            "recommended_tests": ["reinstall"]
+        },
+        "fetched_data": {"past_solutions": []},
+        "solution": {
+            "solution": "Reinstall the printer driver", "tools_needed": [],
+            "estimated_time": "10 minutes", "confidence": "high"
+        },
+        "workflow_log": ["IntakeAgent: Successfully processed"],
+        "status": "solution_generated"
+    }
+
+
+def submit(job_queue):
+    """Mimic POST /api/tickets: persist the raw ticket and enqueue it."""
+    raw = {"user_email": "john@company.com", "subject": "printer broken!!!",
+           "description": "cant print on 3rd floor"}
+    ticket = Ticket(id=Ticket.generate_id(), **raw)
+    db.session.add(ticket)
+    db.session.commit()
+    return ticket.id, job_queue.enqueue({"ticket_id": ticket.id, "ticket": raw})
+
+
+def test_in_memory_queue_enqueue_dequeue_round_trip():
+    """Test that a queued payload is handed to the next dequeue."""
+    job_queue = InMemoryJobQueue()
+    job_id = job_queue.enqueue({"ticket_id": "TKT-1", "ticket": {}})
+
+    assert job_queue.get_status(job_id)["status"] == JobStatus.QUEUED
+    assert job_queue.dequeue(timeout=1) == (job_id, {"ticket_id": "TKT-1", "ticket": {}})
+    assert job_queue.dequeue(timeout=0.01) is None
+
+
+def test_in_memory_queue_unknown_job_returns_none():
+    """Test that polling an unknown job id returns None."""
+    assert InMemoryJobQueue().get_status("JOB-MISSING") is None
+
+
+def redis_job_queue(ttl=RedisJobQueue.DEFAULT_TTL):
+    redis_db = RedisDB.__new__(RedisDB)
+    redis_db.client = FakeRedis()
+    return RedisJobQueue(redis_db, ttl=ttl)
+
+
+def test_redis_queue_dequeue_batch_is_fifo():
+    """Test that the Redis queue hands out jobs oldest first and never waits for more."""
+    job_queue = redis_job_queue()
+    job_ids = [job_queue.enqueue({"ticket_id": f"TKT-{i}", "ticket": {"n": i}}) for i in range(3)]
+
+    first = job_queue.dequeue_batch(2, timeout=1)
+    assert first == [(job_ids[0], {"ticket_id": "TKT-0", "ticket": {"n": 0}}),
+                     (job_ids[1], {"ticket_id": "TKT-1", "ticket": {"n": 1}})]
+    assert [job_id for job_id, _ in job_queue.dequeue_batch(5, timeout=1)] == job_ids[2:]
+    assert job_queue.dequeue_batch(5, timeout=1) == []
+
+
+def test_redis_queue_status_round_trip_and_expiry(monkeypatch):
+    """Test that job records decode results, hide payloads and expire after the TTL."""
+    job_queue = redis_job_queue(ttl=60)
+    job_id = job_queue.enqueue({"ticket_id": "TKT-1", "ticket": {}})
+    assert job_queue.client.ttl(f"{RedisJobQueue.JOB_PREFIX}{job_id}") == 60
+
+    job_queue.set_status(job_id, JobStatus.COMPLETED, result={"category": "hardware"})
+    job = job_queue.get_status(job_id)
+    assert job["status"] == JobStatus.COMPLETED
+    assert job["ticket_id"] == "TKT-1"
+    assert job["result"] == {"category": "hardware"}
+    assert "payload" not in job
+
+    expired_job_id = job_queue.enqueue({"ticket_id": "TKT-2", "ticket": {}})
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert job_queue.get_status(job_id) is None
+    # Expired jobs are still listed but workers skip them
+    assert job_queue.dequeue_batch(5, timeout=1) == []
+    assert job_queue.get_status(expired_job_id) is None
+
+
+def test_process_job_success_saves_results(app):
+    """Test that a worker run persists pipeline output and completes the job."""
+    user = User(email="tech@company.com", name="Tech", specialization="printers")
+    db.session.add(user)
+    db.session.commit()
+
+    job_queue = InMemoryJobQueue()
+    ticket_id, job_id = submit(job_queue)
+    overseer = FakeOverseer(pipeline_result(primary_user_id=user.user_id))
+
+    queued_job_id, payload = job_queue.dequeue(timeout=1)
+    assert process_job(queued_job_id, payload, overseer, None, job_queue)
+
+    job = job_queue.get_status(job_id)
+    assert job["status"] == JobStatus.COMPLETED
+    assert job["result"]["category"] == "hardware"
+
+    ticket = db.session.get(Ticket, ticket_id)
+    assert ticket.subject == "Printer not working on 3rd floor"
+    assert db.session.get(Classifications, ticket_id).urgency == "medium"
+    assert TicketAssignments.query.filter_by(ticket_id=ticket_id, role="primary").count() == 1
+    assert Workflow_log.query.filter_by(ticket_id=ticket_id).count() == 1
+    assert overseer.remembered == [ticket_id]
+
+
+def test_process_job_pipeline_error_marks_failed(app):
+    """Test that an Overseer error leaves the raw ticket and fails the job."""
+    job_queue = InMemoryJobQueue()
+    ticket_id, job_id = submit(job_queue)
+    overseer = FakeOverseer({"error": "Classification failed", "workflow_log": []})
+
+    assert not process_job(*job_queue.dequeue(timeout=1), overseer, None, job_queue)
+
+    job = job_queue.get_status(job_id)
+    assert job["status"] == JobStatus.FAILED
+    assert job["error"] == "Classification failed"
+    assert db.session.get(Classifications, ticket_id) is None
+
+
+def test_in_memory_queue_dequeue_batch_takes_only_waiting_jobs():
+    """Test that dequeue_batch returns at most max_jobs and doesn't wait for more."""
+    job_queue = InMemoryJobQueue()
+    job_ids = [job_queue.enqueue({"ticket_id": f"TKT-{i}", "ticket": {}}) for i in range(3)]
+
+    assert [job_id for job_id, _ in job_queue.dequeue_batch(2, timeout=1)] == job_ids[:2]
+    assert [job_id for job_id, _ in job_queue.dequeue_batch(5, timeout=1)] == job_ids[2:]
+    assert job_queue.dequeue_batch(5, timeout=0.01) == []
+
+
+def test_process_jobs_saves_batch_with_one_statement_per_table(app):
+    """Test that a batch is written in one transaction regardless of its size."""
+    user = User(email="tech@company.com", name="Tech", specialization="printers")
+    db.session.add(user)
+    db.session.commit()
+
+    job_queue = InMemoryJobQueue()
+    for _ in range(25):
+        submit(job_queue)
+    jobs = job_queue.dequeue_batch(25, timeout=1)
+    overseer = FakeOverseer(pipeline_result(primary_user_id=user.user_id))
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        assert process_jobs(jobs, overseer, None, job_queue) == 25
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    # Ticket lookup, ticket UPDATE, five INSERTs
+    assert len(statements) == 7
+    assert Classifications.query.count() == 25
+    assert TicketAssignments.query.filter_by(role="primary").count() == 25
+    assert Workflow_log.query.count() == 25
+    assert all(job_queue.get_status(job_id)["status"] == JobStatus.COMPLETED for job_id, _ in jobs)
+    assert Ticket.query.filter_by(subject="Printer not working on 3rd floor").count() == 25
+
+
+def test_process_jobs_keeps_going_past_failed_tickets(app):
+    """Test that a missing ticket fails its own job without blocking the rest."""
+    job_queue = InMemoryJobQueue()
+    ticket_id, job_id = submit(job_queue)
+    missing_job_id = job_queue.enqueue({"ticket_id": "TKT-MISSING", "ticket": {}})
+    jobs = job_queue.dequeue_batch(2, timeout=1)
+
+    assert process_jobs(jobs, FakeOverseer(pipeline_result()), None, job_queue) == 1
+
+    assert job_queue.get_status(job_id)["status"] == JobStatus.COMPLETED
+    assert job_queue.get_status(missing_job_id)["error"] == "Ticket not found"
+    assert db.session.get(Classifications, ticket_id) is not None
+
+
+def test_process_jobs_saves_tickets_singly_after_batch_failure(app):
+    """Test that a result the database rejects fails only its own job."""
+    job_queue = InMemoryJobQueue()
+    submitted = [submit(job_queue) for _ in range(3)]
+    jobs = job_queue.dequeue_batch(3, timeout=1)
+
+    bad_result = pipeline_result()
+    bad_result["solution"] = dict(bad_result["solution"], estimated_time=None)
+    overseer = FakeOverseer(pipeline_result())
+    overseer.process_many = lambda raw_tickets: [pipeline_result(), bad_result, pipeline_result()]
+
+    assert process_jobs(jobs, overseer, None, job_queue) == 2
+
+    statuses = [job_queue.get_status(job_id) for _, job_id in submitted]
+    assert [job["status"] for job in statuses] == [
+        JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.COMPLETED
+    ]
+    assert statuses[1]["error"] == "Database error"
+    assert Classifications.query.count() == 2
+    assert overseer.remembered == [submitted[0][0], submitted[2][0]]
+
+
+def test_process_jobs_drives_async_overseer_on_one_loop(app):
+    """Test that an async overseer's batches all run on the worker's event loop."""
+    loops = []
+
+    class FakeAsyncOverseer(FakeOverseer):
+        async def process_many(self, raw_tickets):
+            loops.append(asyncio.get_running_loop())
+            return [self.process_ticket(raw_ticket) for raw_ticket in raw_tickets]
+
+    job_queue = InMemoryJobQueue()
+    async_overseer = FakeAsyncOverseer(pipeline_result())
+    loop = asyncio.new_event_loop()
+    try:
+        overseer = EventLoopOverseer(async_overseer, loop)
+        for _ in range(2):
+            submit(job_queue)
+            jobs = job_queue.dequeue_batch(5, timeout=1)
+            assert process_jobs(jobs, overseer, None, job_queue) == 1
+    finally:
+        loop.close()
+
+    assert loops == [loop, loop]
+    assert len(async_overseer.remembered) == 2
@@ -0,0 +1,64 @@
+"""
+Tests for free-text location parsing used by BuildingSupportRule.
+"""
+
+import pytest
+
+from assignment import BuildingSupportRule
+from location_parser import parse_location
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("3rd floor", (None, 3)),
+    ("floor 12", (None, 12)),
+    ("12th fl", (None, 12)),
+    ("fl. 3", (None, 3)),
+    ("level 4", (None, 4)),
+    ("lvl two", (None, 2)),
+    ("L3", (None, 3)),
+    ("ground floor", (None, 0)),
+    ("building 3", ("building3", None)),
+    ("Bldg 2, 3rd floor", ("building2", 3)),
+    ("Building-7 Floor #4", ("building7", 4)),
+    ("building one", ("building1", None)),
+    ("second floor of building B", ("buildingb", 2)),
+    ("bldg b, floor 2", ("buildingb", 2)),
+    ("building a new lab on 3rd floor", (None, 3)),
+    ("Building One", ("building1", None)),
+    ("2nd building, ground floor", ("building2", 0)),
+    ("building 3 floor 2", ("building3", 2)),
+    ("HQ 5th fl", ("building1", 5)),
+    ("Main Building lobby", ("building1", None)),
+    ("room 301", (None, None)),
+    ("building tenant office", (None, None)),
+    ("", (None, None)),
+    (None, (None, None)),
+])
+def test_parse_location(location, expected):
+    """Test that free-text locations normalize to (building, floor)."""
+    assert parse_location(location) == expected
+
+
+def test_repeated_locations_hit_cache():
+    """Test that a repeated location is parsed once and then served from cache."""
+    parse_location.cache_clear()
+    for _ in range(5):
+        parse_location("Bldg 2, 3rd floor")
+
+    info = parse_location.cache_info()
+    assert info.misses == 1
+    assert info.hits == 4
+
+
+def test_rule_matches_only_parseable_locations():
+    """Test that BuildingSupportRule only matches locations that resolve."""
+    rule = BuildingSupportRule()
+
+    def data(location):
+        return {"extracted_info": {"location": location}}
+
+    assert rule.matches(data("floor 12"))
+    assert rule.matches(data("HQ"))
+    # Old substring check matched this but could not resolve a building
+    assert not rule.matches(data("building lobby"))
+    assert not rule.matches({"extracted_info": {}})
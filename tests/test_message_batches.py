@@ -0,0 +1,139 @@
+"""
+Tests for Message Batches mode against the local fake Messages API.
+"""
+
+import pytest
+from anthropic import Anthropic
+
+import overseer as overseer_module
+from overseer import BatchOverseer
+from fake_messages_api import FakeMessagesAPI
+from mas_agents.intake_agent import IntakeAgent
+from mas_agents.message_batches import MessageBatchRunner
+from mas_agents.request_governor import RequestGovernor
+from mas_agents.response_cache import ResponseCache
+
+TICKETS = [{"user_email": f"user{i}@company.com", "subject": "printer", "description": f"down {i}"}
+           for i in range(3)]
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setenv("MODEL", "fake-model")
+    monkeypatch.setattr(overseer_module, "assign_ticket",
+                        lambda intake, classification: {'primary': None, 'secondary': None})
+    with FakeMessagesAPI(latency=0, batch_polls=2) as api:
+        yield api
+
+
+def make_runner(api, **kwargs):
+    client = Anthropic(api_key="test", base_url=api.base_url)
+    return client, MessageBatchRunner(client, poll_interval=0, **kwargs)
+
+
+def params(text):
+    return {"model": "fake-model", "max_tokens": 100,
+            "messages": [{"role": "user", "content": text}]}
+
+
+def test_runner_splits_polls_and_maps_results(fake_api):
+    """Test that large inputs are split into batches and results map back by custom_id."""
+    _, runner = make_runner(fake_api, max_requests=2)
+    fake_api.batch_errors = {"c"}
+
+    messages = runner.run({"a": params("1"), "b": params("2"), "c": params("3")})
+
+    assert len(fake_api.batches) == 2
+    assert all(batch["polls"] > fake_api.batch_polls for batch in fake_api.batches.values())
+    assert set(messages) == {"a", "b", "c"}
+    assert messages["a"].content[0].text and messages["b"].content[0].text
+    assert messages["c"] is None
+    # Nothing went through the per-message endpoint
+    assert fake_api.requests == []
+
+
+def test_runner_cancels_after_timeout(fake_api):
+    """Test that a batch still running at the timeout is cancelled."""
+    _, runner = make_runner(fake_api, timeout=0)
+
+    messages = runner.run({"a": params("1")})
+
+    assert messages == {"a": None}
+    assert next(iter(fake_api.batches.values()))["cancelled"]
+
+
+def test_runner_retries_transient_errors(fake_api):
+    """Test that a 429 or 529 while submitting or polling is retried, not raised."""
+    client = Anthropic(api_key="test", base_url=fake_api.base_url, max_retries=0)
+    governor = RequestGovernor(base_delay=0.01)
+    runner = MessageBatchRunner(client, poll_interval=0, governor=governor)
+    fake_api.retry_after = 0
+    submit = runner.submit
+
+    def submit_then_fail_poll(requests):
+        batch_id = submit(requests)
+        fake_api.batch_failures = [429]
+        return batch_id
+
+    # Fails the create call, then the first poll
+    runner.submit = submit_then_fail_poll
+    fake_api.batch_failures = [529]
+
+    messages = runner.run({"a": params("1")})
+
+    assert messages["a"].content[0].text
+    assert len(fake_api.batches) == 1
+    assert governor.stats()["retries"] == 2
+
+
+def test_agent_process_batch_uses_cache_and_keeps_order(fake_api):
+    """Test that cached inputs stay out of the batch and outputs keep input order."""
+    client, runner = make_runner(fake_api)
+    cache = ResponseCache()
+    agent = IntakeAgent(client, cache=cache)
+    agent.process(TICKETS[1])
+
+    outputs = agent.process_batch([(ticket,) for ticket in TICKETS], runner)
+
+    assert len(outputs) == 3 and all(output["subject"] for output in outputs)
+    # The cached ticket stays out of the batch
+    batch = next(iter(fake_api.batches.values()))
+    custom_ids = [request["custom_id"] for request in batch["requests"]]
+    assert custom_ids == ["IntakeAgent-0", "IntakeAgent-2"]
+    assert batch["requests"][0]["params"]["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert agent.get_usage()["calls"] == 3
+
+
+def test_batch_overseer_runs_one_batch_per_claude_stage(fake_api):
+    """Test that each Claude stage is one batch and failures stay per ticket."""
+    client, runner = make_runner(fake_api)
+    overseer = BatchOverseer(client, redis_client=None, batch_runner=runner)
+    fake_api.batch_errors = {"ClassifierAgent-1"}
+
+    results = overseer.process_many(TICKETS)
+
+    assert [len(batch["requests"]) for batch in fake_api.batches.values()] == [3, 3, 2, 2]
+    assert results[0]["status"] == results[2]["status"] == "solution_generated"
+    assert results[1]["error"] == "Classification failed"
+    stages = [entry["stage"] for entry in results[1]["workflow_log"]]
+    assert stages == ["intake_result", "classification"]
+    assert [entry["stage"] for entry in results[0]["workflow_log"]] == [
+        "intake_result", "classification", "assignments", "diagnosis", "fetched_data", "solution"
+    ]
+
+
+def test_batch_overseer_fails_stage_when_batch_cannot_be_submitted(fake_api):
+    """Test that a batch that can't be submitted fails the stage for its tickets."""
+    client = Anthropic(api_key="test", base_url=fake_api.base_url, max_retries=0)
+
+    class BrokenRunner(MessageBatchRunner):
+        def submit(self, requests):
+            raise RuntimeError("quota exceeded")
+
+    overseer = BatchOverseer(client, redis_client=None,
+                             batch_runner=BrokenRunner(client, poll_interval=0))
+
+    results = overseer.process_many(TICKETS[:2])
+
+    assert all(result["error"] == "intake_result failed" for result in results)
+    assert results[0]["workflow_log"][0]["message"] == "intake_result raised: quota exceeded"
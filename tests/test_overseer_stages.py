@@ -0,0 +1,106 @@
+"""
+Tests for the Overseer stage graph using fake agents (no Claude/Redis needed).
+"""
+
+import time
+from datetime import datetime
+
+import overseer as overseer_module
+from overseer import Overseer
+
+STAGE_DELAY = 0.2
+
+
+class FakeAgent:
+    """Agent stub that sleeps to simulate an LLM round trip."""
+
+    def __init__(self, result, delay=STAGE_DELAY):
+        self.result = result
+        self.delay = delay
+
+    def process(self, *args):
+        time.sleep(self.delay)
+        return self.result
+
+
+def build_overseer(monkeypatch, **overrides):
+    def fake_assign(intake_result, classification_result):
+        time.sleep(STAGE_DELAY)
+        return {'primary': {'name': 'Tech', 'user_id': 1}, 'secondary': None}
+
+    monkeypatch.setattr(overseer_module, "assign_ticket", fake_assign)
+
+    overseer = Overseer(client=None, redis_client=None)
+    overseer.intake_agent = FakeAgent({"user_email": "a@company.com", "subject": "s",
+                                       "description": "d"})
+    overseer.classifier_agent = FakeAgent({"category": "hardware", "urgency": "medium",
+                                           "expertise_level": "tier1", "reasoning": "r"})
+    overseer.diagnostic_agent = FakeAgent({"diagnosis": "d", "potential_causes": [],
+                                           "recommended_tests": []})
+    overseer.fetch_agent = FakeAgent({"past_solutions": []})
+    overseer.solution_agent = FakeAgent({"solution": "fix", "tools_needed": [],
+                                         "estimated_time": "5m", "confidence": "high"})
+    for name, agent in overrides.items():
+        setattr(overseer, name, agent)
+    return overseer
+
+
+def test_process_ticket_runs_independent_stages_in_parallel(monkeypatch):
+    """Test that assign/diagnose/fetch overlap, saving two stage delays."""
+    overseer = build_overseer(monkeypatch)
+
+    start = time.perf_counter()
+    result = overseer.process_ticket({"user_email": "a@company.com", "subject": "s",
+                                      "description": "d"})
+    elapsed = time.perf_counter() - start
+
+    assert result["status"] == "solution_generated"
+    assert result["assignments"]["primary"]["name"] == "Tech"
+    # Sequential would be 6 delays; the graph's critical path is 4
+    assert elapsed < STAGE_DELAY * 5
+
+    entries = {entry["stage"]: entry for entry in result["workflow_log"]}
+    assert set(entries) == {"intake_result", "classification", "assignments",
+                            "diagnosis", "fetched_data", "solution"}
+    diagnosis_start = datetime.fromisoformat(entries["diagnosis"]["started_at"])
+    fetch_end = datetime.fromisoformat(entries["fetched_data"]["ended_at"])
+    assert diagnosis_start < fetch_end
+
+
+def test_process_ticket_records_stage_timings(monkeypatch):
+    """Test that every workflow_log entry carries start/end times and duration."""
+    result = build_overseer(monkeypatch).process_ticket({})
+    for entry in result["workflow_log"]:
+        assert entry["status"] == "completed"
+        assert entry["started_at"] <= entry["ended_at"]
+        assert entry["duration_ms"] >= STAGE_DELAY * 1000 * 0.9
+
+
+def test_process_ticket_stage_failure_returns_error(monkeypatch):
+    """Test that a failed stage aborts the run and skips dependent stages."""
+    overseer = build_overseer(monkeypatch, diagnostic_agent=FakeAgent(None, delay=0))
+
+    result = overseer.process_ticket({})
+
+    assert result["error"] == "Diagnostic failed"
+    stages = [entry["stage"] for entry in result["workflow_log"]]
+    assert "solution" not in stages
+    assert result["workflow_log"][-1]["status"] == "failed"
+
+
+def test_process_ticket_failure_waits_for_running_stages(monkeypatch):
+    """Test that a failed run returns only after in-flight stages have finished."""
+    finished = []
+
+    def slow_assign(intake_result, classification_result):
+        time.sleep(STAGE_DELAY)
+        finished.append("assignments")
+        return {'primary': None, 'secondary': None}
+
+    overseer = build_overseer(monkeypatch, diagnostic_agent=FakeAgent(None, delay=0))
+    monkeypatch.setattr(overseer_module, "assign_ticket", slow_assign)
+
+    result = overseer.process_ticket({})
+
+    assert result["error"] == "Diagnostic failed"
+    assert finished == ["assignments"]
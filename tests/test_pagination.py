@@ -0,0 +1,105 @@
+"""
+Tests for keyset pagination and field projection of the ticket listing.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from models import db, Ticket
+from pagination import (
+    LIST_FIELDS, decode_cursor, encode_cursor, paginate_tickets, parse_fields, parse_limit,
+    relations_for, stream_tickets_ndjson
+)
+
+
+def seed_tickets(count):
+    """Insert `count` tickets, several sharing a created_at to exercise the id tiebreak."""
+    base = datetime(2025, 12, 1, 9, 0, 0)
+    for i in range(count):
+        db.session.add(Ticket(id=f"TKT-{i:08d}", user_email="user@company.com",
+                              subject=f"Issue {i}", description="Details",
+                              created_at=base + timedelta(minutes=i // 3)))
+    db.session.commit()
+
+
+def test_encode_cursor_round_trips():
+    """Test that a cursor decodes back to the ticket sort key."""
+    ticket = Ticket(id="TKT-ABCDEF12", created_at=datetime(2025, 12, 22, 14, 48, 41, 123000))
+    assert decode_cursor(encode_cursor(ticket)) == (ticket.created_at, ticket.id)
+
+
+def test_decode_cursor_garbage_raises_value_error():
+    """Test that a malformed cursor is rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_parse_limit_rejects_non_integers():
+    """Test that a missing limit is None and a non-integer limit raises ValueError."""
+    assert parse_limit(None) is None
+    assert parse_limit("25") == 25
+    for value in ("abc", "", "2.5"):
+        with pytest.raises(ValueError):
+            parse_limit(value)
+
+
+def test_paginate_tickets_walks_every_ticket_once(app):
+    """Test that following next_cursor visits all tickets newest first without repeats."""
+    seed_tickets(23)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = paginate_tickets(Ticket.query, limit=5, cursor=cursor)
+        seen.extend(t.id for t in page)
+        if cursor is None:
+            break
+
+    expected = [t.id for t in Ticket.query.order_by(Ticket.created_at.desc(), Ticket.id.desc())]
+    assert seen == expected
+    assert len(seen) == 23
+
+
+def test_paginate_tickets_last_page_has_no_cursor(app):
+    """Test that an exactly full final page does not advertise another page."""
+    seed_tickets(5)
+    page, cursor = paginate_tickets(Ticket.query, limit=5)
+    assert len(page) == 5
+    assert cursor is None
+
+
+def test_parse_fields_default_returns_all_fields():
+    """Test that omitting ?fields= selects the full payload."""
+    assert parse_fields(None) == list(LIST_FIELDS)
+
+
+def test_parse_fields_keeps_response_order():
+    """Test that projected fields follow the canonical order."""
+    assert parse_fields("status, subject,id") == ["id", "subject", "status"]
+
+
+def test_parse_fields_unknown_field_raises_value_error():
+    """Test that unknown projection fields are rejected."""
+    with pytest.raises(ValueError):
+        parse_fields("id,password")
+
+
+def test_relations_for_summary_fields_loads_nothing():
+    """Test that summary-only projections skip relationship loading."""
+    assert relations_for(["id", "subject", "status"]) == set()
+    assert relations_for(["id", "assigned_people"]) == {"assignments"}
+
+
+def test_stream_tickets_ndjson_emits_one_line_per_ticket(app):
+    """Test that the exporter yields every ticket oldest first across batches."""
+    seed_tickets(12)
+
+    lines = list(stream_tickets_ndjson(Ticket.query, ["id", "status"], batch_size=5))
+    assert len(lines) == 12
+    assert all(line.endswith("\n") for line in lines)
+
+    rows = [json.loads(line) for line in lines]
+    expected = [t.id for t in Ticket.query.order_by(Ticket.created_at, Ticket.id)]
+    assert [r["id"] for r in rows] == expected
+    assert rows[0] == {"id": expected[0], "status": "open"}
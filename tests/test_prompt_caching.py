@@ -0,0 +1,89 @@
+"""
+Tests for prompt caching of agent system prompts and per-agent token usage.
+"""
+
+import asyncio
+
+import pytest
+from anthropic import Anthropic, AsyncAnthropic
+
+from fake_messages_api import FakeMessagesAPI
+from mas_agents.classifier_agent import (
+    CLASSIFIER_SYSTEM_PROMPT, AsyncClassifierAgent, ClassifierAgent
+)
+from mas_agents.classifier_agent_lite import CLASSIFIER_LITE_SYSTEM_PROMPT, ClassifierAgentLite
+from mas_agents.intake_agent import IntakeAgent
+
+TICKET = {"user_email": "john@company.com", "subject": "printer broken",
+          "description": "cant print"}
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setenv("MODEL", "fake-model")
+    with FakeMessagesAPI(latency=0) as api:
+        yield api
+
+
+def test_system_prompt_sent_as_cacheable_block(fake_api):
+    """Test that the system prompt is sent as a cache_control text block."""
+    agent = ClassifierAgent(Anthropic(api_key="test", base_url=fake_api.base_url))
+
+    agent.process(TICKET)
+
+    assert fake_api.requests[0]["system"] == [
+        {"type": "text", "text": CLASSIFIER_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_system_prompts_are_module_constants():
+    """Test that agents reuse their module-level system prompt."""
+    agent = ClassifierAgent(client=None)
+    first = agent.build_request(TICKET)["system_prompt"]
+    second = agent.build_request({"subject": "other"})["system_prompt"]
+
+    assert first is second is CLASSIFIER_SYSTEM_PROMPT
+    lite_prompt = ClassifierAgentLite(client=None)._build_optimized_prompt()
+    assert lite_prompt is CLASSIFIER_LITE_SYSTEM_PROMPT
+
+
+def test_usage_counts_cache_writes_then_reads(fake_api):
+    """Test that usage records one cache write followed by cache reads."""
+    agent = IntakeAgent(Anthropic(api_key="test", base_url=fake_api.base_url))
+
+    for _ in range(3):
+        agent.process(TICKET)
+
+    usage = agent.get_usage()
+    prompt_tokens = usage["cache_creation_input_tokens"]
+    assert usage["calls"] == 3
+    assert usage["input_tokens"] == 300 and usage["output_tokens"] == 150
+    assert prompt_tokens > 0
+    assert usage["cache_read_input_tokens"] == 2 * prompt_tokens
+    assert usage["cache_read_ratio"] == pytest.approx(2 * prompt_tokens / (300 + 3 * prompt_tokens))
+
+
+def test_async_agent_records_usage(fake_api):
+    """Test that async agents record token usage too."""
+    agent = AsyncClassifierAgent(AsyncAnthropic(api_key="test", base_url=fake_api.base_url))
+
+    async def run():
+        await agent.process(TICKET)
+        await agent.process(TICKET)
+
+    asyncio.run(run())
+
+    usage = agent.get_usage()
+    assert usage["calls"] == 2
+    assert usage["cache_read_input_tokens"] == usage["cache_creation_input_tokens"] > 0
+
+
+def test_uncached_agent_sends_plain_system_prompt(fake_api):
+    """Test that disabling caching sends the system prompt as a plain string."""
+    agent = IntakeAgent(Anthropic(api_key="test", base_url=fake_api.base_url))
+    agent.cache_system_prompt = False
+
+    agent.process(TICKET)
+
+    assert isinstance(fake_api.requests[0]["system"], str)
+    assert agent.get_usage()["cache_read_ratio"] == 0.0
@@ -0,0 +1,149 @@
+"""
+Tests for the request governor: token buckets, retries and the circuit breaker.
+"""
+
+import asyncio
+import time
+
+import anthropic
+import httpx
+import pytest
+from anthropic import Anthropic, AsyncAnthropic
+
+from fake_messages_api import FakeMessagesAPI
+from mas_agents.intake_agent import AsyncIntakeAgent, IntakeAgent
+from mas_agents.request_governor import (
+    CircuitBreaker, CircuitOpenError, RequestGovernor, TokenBucket
+)
+
+TICKET = {"user_email": "john@company.com", "subject": "printer broken",
+          "description": "cant print"}
+
+
+def api_error(status_code, headers=None):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    error_class = {429: anthropic.RateLimitError, 400: anthropic.BadRequestError}.get(
+        status_code, anthropic.InternalServerError
+    )
+    return error_class(f"HTTP {status_code}", response=response, body=None)
+
+
+def flaky(*outcomes):
+    """send() that raises or returns each outcome in turn"""
+    calls = []
+
+    def send():
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return send, calls
+
+
+def test_token_bucket_reservations():
+    """Test that reservations beyond capacity wait and refunds shorten the wait."""
+    bucket = TokenBucket(per_minute=60)  # one token per second
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(2) == pytest.approx(2.0, abs=0.05)
+    bucket.refund(2)
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_retries_honour_retry_after():
+    """Test that retries wait at least the server's retry-after."""
+    governor = RequestGovernor(base_delay=0.01)
+    send, calls = flaky(api_error(429, {"retry-after": "0.05"}), api_error(529), "ok")
+
+    start = time.monotonic()
+    assert governor.call(send) == "ok"
+
+    assert len(calls) == 3
+    assert time.monotonic() - start >= 0.05
+    assert governor.stats()["retries"] == 2 and governor.stats()["rate_limited"] == 1
+
+
+def test_rate_limit_pauses_other_callers():
+    """Test that a 429 pauses later calls on the same governor."""
+    governor = RequestGovernor(max_retries=0)
+    send, _ = flaky(api_error(429, {"retry-after": "0.1"}))
+    with pytest.raises(anthropic.RateLimitError):
+        governor.call(send)
+
+    start = time.monotonic()
+    governor.call(lambda: "other")
+    assert time.monotonic() - start >= 0.09
+
+
+def test_non_retryable_and_exhausted_errors_are_raised():
+    """Test that client errors and exhausted retries are raised."""
+    governor = RequestGovernor(max_retries=2, base_delay=0.001)
+
+    send, calls = flaky(api_error(400))
+    with pytest.raises(anthropic.BadRequestError):
+        governor.call(send)
+    assert len(calls) == 1
+
+    send, calls = flaky(api_error(500), api_error(500), api_error(500))
+    with pytest.raises(anthropic.InternalServerError):
+        governor.call(send)
+    assert len(calls) == 3
+
+
+def test_circuit_opens_then_probes():
+    """Test that the breaker opens after repeated failures and closes after a probe."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    governor = RequestGovernor(max_retries=5, base_delay=0.001, breaker=breaker)
+    send, calls = flaky(api_error(529), api_error(529))
+
+    with pytest.raises(anthropic.InternalServerError):
+        governor.call(send)
+    assert len(calls) == 2 and breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        governor.call(lambda: "never sent")
+
+    time.sleep(0.06)
+    assert governor.call(lambda: "probe") == "probe"
+    assert breaker.state == "closed"
+
+
+def test_agent_recovers_from_overload(monkeypatch):
+    """Test that an agent retries through 529 and 429 responses."""
+    monkeypatch.setenv("MODEL", "fake-model")
+    governor = RequestGovernor(base_delay=0.01)
+    with FakeMessagesAPI(latency=0) as api:
+        api.failures = [529, 429]
+        client = Anthropic(api_key="test", base_url=api.base_url, max_retries=0)
+        agent = IntakeAgent(client)
+        agent.governor = governor
+
+        assert agent.process(TICKET)["subject"]
+        assert len(api.requests) == 3
+
+
+def test_async_agent_uses_governor(monkeypatch):
+    """Test that async agents are paced and retried by the governor."""
+    monkeypatch.setenv("MODEL", "fake-model")
+    governor = RequestGovernor(requests_per_minute=600, base_delay=0.01)
+    governor.request_bucket = TokenBucket(per_minute=600, capacity=1)
+    with FakeMessagesAPI(latency=0) as api:
+        api.failures = [429]
+        api.retry_after = 0
+        client = AsyncAnthropic(api_key="test", base_url=api.base_url, max_retries=0)
+        agent = AsyncIntakeAgent(client)
+        agent.governor = governor
+
+        async def run():
+            return await asyncio.gather(agent.process(TICKET), agent.process(TICKET))
+
+        start = time.monotonic()
+        results = asyncio.run(run())
+
+    assert all(result["subject"] for result in results)
+    # Three requests through a 10/s bucket holding one: paced by ~0.2s
+    assert time.monotonic() - start >= 0.15
+    assert governor.stats()["rate_limited"] == 1
@@ -0,0 +1,210 @@
+"""
+Tests for the Claude response cache and its use in BaseAgent.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from anthropic import Anthropic, AsyncAnthropic
+
+from fake_messages_api import FakeMessagesAPI
+from mas_agents.agent_config import AGENT_CONFIGS
+from mas_agents.intake_agent import AsyncIntakeAgent, IntakeAgent
+from mas_agents.request_governor import RequestGovernor
+from mas_agents.response_cache import ResponseCache
+
+
+TICKET = {"user_email": "john@company.com", "subject": "printer on 3rd floor down",
+          "description": "cant print"}
+
+
+class FakeRedisDB:
+    """Stands in for RedisDB's cache methods"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get_cached_response(self, key):
+        return self.entries.get(key, (None, None))[0]
+
+    def cache_response(self, key, text, ttl):
+        self.entries[key] = (text, ttl)
+        return True
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setenv("MODEL", "fake-model")
+    with FakeMessagesAPI(latency=0) as api:
+        yield api
+
+
+def params(content="hello", temperature=1.0):
+    return {"model": "m", "max_tokens": 10, "temperature": temperature,
+            "system": "s", "messages": [{"role": "user", "content": content}]}
+
+
+def test_key_covers_every_request_field():
+    """Test that the key is stable and changes with any request field."""
+    base = ResponseCache.make_key(params())
+
+    assert ResponseCache.make_key(params()) == base
+    assert ResponseCache.make_key(params(content="other")) != base
+    assert ResponseCache.make_key(params(temperature=0.2)) != base
+    assert ResponseCache.make_key({**params(), "system": "other"}) != base
+
+
+def test_lru_evicts_least_recently_used():
+    """Test that the memory tier evicts the least recently used entry."""
+    cache = ResponseCache(max_entries=2)
+    keys = []
+    for content in ("a", "b"):
+        key, _ = cache.lookup(params(content))
+        cache.store(key, content)
+        keys.append(key)
+
+    cache.lookup(params("a"))  # touch a so b is the eviction candidate
+    key_c, _ = cache.lookup(params("c"))
+    cache.store(key_c, "c")
+
+    assert cache.lookup(params("a"))[1] == "a"
+    assert cache.lookup(params("b"))[1] is None
+
+
+def test_entries_expire_per_agent_ttl(monkeypatch):
+    """Test that entries expire on the TTL their agent stored them with."""
+    cache = ResponseCache()
+    intake_key, _ = cache.lookup(params("intake"))
+    solution_key, _ = cache.lookup(params("solution"))
+    cache.store(intake_key, "intake", 10)
+    cache.store(solution_key, "solution", 1)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+
+    assert cache.lookup(params("intake"))[1] == "intake"
+    assert cache.lookup(params("solution"))[1] is None
+
+
+def test_bypass_above_max_temperature():
+    """Test that calls above max_temperature skip the cache."""
+    cache = ResponseCache(max_temperature=0.5)
+
+    assert cache.lookup(params(temperature=1.0)) == (None, None)
+    assert cache.lookup(params(temperature=0.2))[0] is not None
+    assert cache.stats()["bypassed"] == 1
+
+
+def test_redis_tier_is_shared_and_promoted():
+    """Test that a second process's cache hits entries written by the first."""
+    redis_db = FakeRedisDB()
+    writer = ResponseCache(redis_db=redis_db)
+    key, _ = writer.lookup(params())
+    writer.store(key, "shared", 120)
+
+    value, ttl = redis_db.entries[key]
+    assert ttl == 120
+    assert json.loads(value)["text"] == "shared"
+
+    reader = ResponseCache(redis_db=redis_db)
+    assert reader.lookup(params())[1] == "shared"
+    redis_db.entries.clear()
+    assert reader.lookup(params())[1] == "shared"
+    assert reader.stats()["redis_hits"] == 1
+    assert reader.stats()["memory_hits"] == 1
+
+
+def test_promoted_entries_keep_remaining_ttl(monkeypatch):
+    """Test that an entry promoted from Redis expires with the Redis copy, not a fresh TTL."""
+    redis_db = FakeRedisDB()
+    writer = ResponseCache(redis_db=redis_db, default_ttl=10)
+    key, _ = writer.lookup(params())
+    writer.store(key, "shared", 100)
+    # Entries written before expiry times were stored alongside the text
+    legacy_key, _ = writer.lookup(params("legacy"))
+    redis_db.entries[legacy_key] = ('{"subject": "legacy"}', 10)
+
+    # Promoted 60s into the entry's 100s TTL
+    wall_clock, now = time.time(), time.monotonic()
+    monkeypatch.setattr(time, "time", lambda: wall_clock + 60)
+    reader = ResponseCache(redis_db=redis_db, default_ttl=10)
+    assert reader.lookup(params())[1] == "shared"
+    assert reader.lookup(params("legacy"))[1] == '{"subject": "legacy"}'
+    redis_db.entries.clear()
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+    assert reader.lookup(params())[1] == "shared"
+    assert reader.lookup(params("legacy"))[1] == '{"subject": "legacy"}'
+    monkeypatch.setattr(time, "monotonic", lambda: now + 45)
+    assert reader.lookup(params())[1] is None
+    assert reader.lookup(params("legacy"))[1] is None
+
+
+def test_agents_store_with_their_configured_ttl(fake_api):
+    """Test that an agent caches responses for its AgentConfig.cache_ttl."""
+    redis_db = FakeRedisDB()
+    client = Anthropic(api_key="test", base_url=fake_api.base_url)
+    IntakeAgent(client, cache=ResponseCache(redis_db=redis_db)).process(TICKET)
+
+    assert [ttl for _, ttl in redis_db.entries.values()] == [AGENT_CONFIGS["IntakeAgent"].cache_ttl]
+
+
+def test_duplicate_tickets_call_claude_once(fake_api):
+    """Test that an identical ticket is answered from the cache."""
+    cache = ResponseCache()
+    agent = IntakeAgent(Anthropic(api_key="test", base_url=fake_api.base_url), cache=cache)
+
+    first = agent.process(TICKET)
+    second = agent.process(dict(TICKET))
+
+    assert first == second
+    assert len(fake_api.requests) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_async_agent_shares_cache_with_sync_agent(fake_api):
+    """Test that async and sync agents share cached responses."""
+    cache = ResponseCache()
+    IntakeAgent(Anthropic(api_key="test", base_url=fake_api.base_url), cache=cache).process(TICKET)
+
+    async_agent = AsyncIntakeAgent(AsyncAnthropic(api_key="test", base_url=fake_api.base_url),
+                                   cache=cache)
+    result = asyncio.run(async_agent.process(TICKET))
+
+    assert result["subject"]
+    assert len(fake_api.requests) == 1
+
+
+def test_failed_calls_are_not_cached(monkeypatch):
+    """Test that failed calls leave nothing in the cache."""
+    monkeypatch.setenv("MODEL", "fake-model")
+    cache = ResponseCache()
+    # Nothing listens on port 9; the call fails fast
+    client = Anthropic(api_key="test", base_url="http://127.0.0.1:9", max_retries=0)
+    agent = IntakeAgent(client, cache=cache)
+    agent.governor = RequestGovernor(max_retries=0)
+
+    assert agent.process(TICKET) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_truncated_and_unparsed_responses_are_not_cached(fake_api):
+    """Test that replies cut off at max_tokens or failing to parse are not cached."""
+    cache = ResponseCache()
+    agent = IntakeAgent(Anthropic(api_key="test", base_url=fake_api.base_url), cache=cache)
+    async_agent = AsyncIntakeAgent(AsyncAnthropic(api_key="test", base_url=fake_api.base_url),
+                                   cache=cache)
+
+    fake_api.stop_reason = "max_tokens"
+    agent.process(TICKET)
+    asyncio.run(async_agent.process(TICKET))
+    assert cache.stats()["size"] == 0
+
+    fake_api.stop_reason = "end_turn"
+    agent.parse_response = lambda text: None
+    assert agent.process(TICKET) is None
+    assert cache.stats()["size"] == 0
+    assert len(fake_api.requests) == 3
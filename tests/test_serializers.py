@@ -0,0 +1,99 @@
+"""
+Tests for the shared ticket serializers and the orjson-backed JSON provider.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from flask import Flask
+
+import serializers
+from models import db, Ticket, Classifications, Diagnostics, TicketAssignments, User, Workflow_log
+from serializers import (
+    LIST_FIELDS, OrjsonProvider, dumps, serialize_list_item, serialize_ticket_detail
+)
+
+CREATED = datetime(2025, 12, 22, 14, 48, 41, 123000)
+
+
+def seed_ticket():
+    user = User(email="tech@company.com", name="Tech", tier_level="tier2",
+                specialization="printers")
+    db.session.add(user)
+    db.session.add(Ticket(id="TKT-1", user_email="user@company.com", subject="Printer",
+                          description="Cannot print", created_at=CREATED, updated_at=CREATED))
+    db.session.add(Classifications(ticket_id="TKT-1", category="hardware", urgency="medium",
+                                   expertise_level="tier1", reasoning="Printer issue",
+                                   created_at=CREATED, updated_at=CREATED))
+    db.session.add(Diagnostics(ticket_id="TKT-1", diagnosis="Driver crashed",
+                               potential_causes=["driver"], recommended_tests=["reinstall"]))
+    db.session.flush()
+    db.session.add(TicketAssignments(ticket_id="TKT-1", user_id=user.user_id, role="primary",
+                                     assigned_at=CREATED))
+    db.session.add(Workflow_log(ticket_id="TKT-1", log_entries=["IntakeAgent: ok"]))
+    db.session.commit()
+    db.session.expunge_all()
+    return Ticket.with_details().filter(Ticket.id == "TKT-1").one()
+
+
+def test_list_item_projects_requested_fields(app):
+    """Test that list items contain only the requested fields, in order."""
+    ticket = seed_ticket()
+
+    item = serialize_list_item(ticket, list(LIST_FIELDS))
+
+    assert list(item) == list(LIST_FIELDS)
+    assert item["status"] == "open"
+    assert item["created_at"] == "2025-12-22T14:48:41.123000"
+    assert item["classification"] == {"category": "hardware", "urgency": "medium",
+                                      "expertise_level": "tier1", "reasoning": "Printer issue"}
+    assert item["solution"] is None
+    assert item["assigned_people"] == [{
+        "role": "primary", "name": "Tech", "email": "tech@company.com",
+        "specialization": "printers", "tier_level": "tier2",
+        "assigned_at": "2025-12-22T14:48:41.123000"
+    }]
+    assert serialize_list_item(ticket, ["id", "status"]) == {"id": "TKT-1", "status": "open"}
+
+
+def test_detail_adds_stage_timestamps_and_log(app):
+    """Test that the detail view includes stage timestamps and the workflow log."""
+    ticket = seed_ticket()
+    log = Workflow_log.query.filter_by(ticket_id="TKT-1").first()
+
+    detail = serialize_ticket_detail(ticket, log)
+
+    assert detail["duplicate_of"] is None
+    assert detail["classification"]["created_at"] == "2025-12-22T14:48:41.123000"
+    assert detail["diagnosis"]["potential_causes"] == ["driver"]
+    assert detail["solution"] is None
+    assert detail["workflow_log"] == ["IntakeAgent: ok"]
+    assert serialize_ticket_detail(ticket, None)["workflow_log"] == []
+
+
+@dataclass
+class Point:
+    x: int
+
+
+def test_orjson_provider_matches_default_provider():
+    """Test that the orjson provider renders the same JSON as Flask's default."""
+    default_app, orjson_app = Flask("default"), Flask("orjson")
+    orjson_app.json = OrjsonProvider(orjson_app)
+    payload = {"b": 1, "a": [CREATED, Point(2)], "nested": {"é": None}}
+
+    with default_app.app_context():
+        expected = json.loads(default_app.json.response(payload).get_data())
+    with orjson_app.app_context():
+        response = orjson_app.json.response(payload)
+
+    assert json.loads(response.get_data()) == expected
+    assert orjson_app.json.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test_dumps_falls_back_to_stdlib(monkeypatch):
+    """Test that dumps uses the json module when orjson is missing."""
+    monkeypatch.setattr(serializers, "orjson", None)
+
+    assert dumps({"a": [1, "é"]}) == json.dumps({"a": [1, "é"]}, separators=(",", ":"))
@@ -0,0 +1,102 @@
+"""
+Tests for the ticket API: submission, job polling and listing parameters.
+"""
+
+import importlib
+
+import pytest
+import redis
+
+import redis_client as redis_client_module
+from fake_redis import FakeRedis
+from job_queue import JobStatus, RedisJobQueue
+from models import db, Ticket
+
+TICKET = {"user_email": "john@company.com", "subject": "printer broken!!!",
+          "description": "cant print on 3rd floor"}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Flask test client for app.py with SQLite and an in-process Redis."""
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.setattr(redis_client_module.RedisDB, "test_connection", lambda self: None)
+    app_module = importlib.import_module("app")
+
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(app_module.redis_client, "client", fake_redis)
+    job_queue = RedisJobQueue(app_module.redis_client)
+    monkeypatch.setattr(app_module, "job_queue", job_queue)
+    with app_module.app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app_module.app.test_client(), fake_redis, job_queue
+        db.session.remove()
+
+
+def test_post_ticket_queues_job_and_returns_202(api):
+    """Test that a submission is saved, queued and answered with a status URL."""
+    client, fake_redis, _ = api
+
+    response = client.post("/api/tickets", json=TICKET)
+
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["success"] and body["status"] == JobStatus.QUEUED
+    assert body["status_url"] == f"/api/jobs/{body['job_id']}"
+    assert db.session.get(Ticket, body["ticket_id"]).subject == TICKET["subject"]
+    assert fake_redis.lists[RedisJobQueue.PENDING_KEY] == [body["job_id"]]
+    assert fake_redis.streams["ticket_events"][0][1] == {"ticket_id": body["ticket_id"],
+                                                          "event": "created"}
+
+
+def test_job_status_is_polled_until_completed(api):
+    """Test that GET /api/jobs/<id> reports the worker's progress and 404s for unknown jobs."""
+    client, _, job_queue = api
+    body = client.post("/api/tickets", json=TICKET).get_json()
+
+    queued = client.get(body["status_url"])
+    assert queued.status_code == 200
+    assert queued.get_json()["status"] == JobStatus.QUEUED
+    assert queued.get_json()["ticket_id"] == body["ticket_id"]
+
+    job_queue.set_status(body["job_id"], JobStatus.COMPLETED, result={"category": "hardware"})
+    completed = client.get(body["status_url"]).get_json()
+    assert completed["status"] == JobStatus.COMPLETED
+    assert completed["result"] == {"category": "hardware"}
+
+    assert client.get("/api/jobs/JOB-MISSING").status_code == 404
+
+
+def test_post_ticket_rejects_invalid_input(api):
+    """Test that a submission missing required fields gets 400 and queues nothing."""
+    client, fake_redis, _ = api
+
+    response = client.post("/api/tickets", json={"subject": "no email"})
+
+    assert response.status_code == 400
+    assert RedisJobQueue.PENDING_KEY not in fake_redis.lists
+
+
+def test_post_ticket_reports_queue_outage(api, monkeypatch):
+    """Test that a ticket saved while the queue is down gets 503 with its ticket_id."""
+    client, fake_redis, _ = api
+
+    def fail(*args):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(fake_redis, "lpush", fail)
+    response = client.post("/api/tickets", json=TICKET)
+
+    assert response.status_code == 503
+    assert db.session.get(Ticket, response.get_json()["ticket_id"]) is not None
+
+
+def test_non_integer_limit_is_rejected(api):
+    """Test that ?limit=abc gets 400 instead of falling back to the full listing."""
+    client, _, _ = api
+
+    assert client.get("/api/tickets?limit=abc").status_code == 400
+    assert client.get("/api/tickets/changes?limit=abc").status_code == 400
+    assert client.get("/api/tickets?limit=5").get_json() == {"tickets": [], "next_cursor": None}
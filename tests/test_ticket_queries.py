@@ -0,0 +1,87 @@
+"""
+Query-count regression tests for ticket listing.
+
+Runs against in-memory SQLite so no Postgres/Redis/Claude is required:
+    python -m pytest tests/test_ticket_queries.py
+"""
+
+from sqlalchemy import event
+from models import (
+    db, Ticket, User, Classifications, Diagnostics, Solutions, TicketAssignments
+)
+
+
+def seed_users():
+    """Insert the two staff members every seeded ticket is assigned to."""
+    primary = User(email="primary@company.com", name="Primary", tier_level="tier2",
+                   specialization="printers", building="building1")
+    secondary = User(email="secondary@company.com", name="Secondary", tier_level="tier1",
+                     specialization="general", building="building3")
+    db.session.add_all([primary, secondary])
+    db.session.commit()
+    return primary.user_id, secondary.user_id
+
+
+def seed_tickets(count, users, prefix="TKT-"):
+    """Insert `count` fully processed tickets with two assignments each."""
+    primary_id, secondary_id = users
+    for i in range(count):
+        ticket_id = f"{prefix}{i:08d}"
+        db.session.add(Ticket(id=ticket_id, user_email="user@company.com",
+                              subject=f"Printer {i}", description="Cannot print"))
+        db.session.add(Classifications(ticket_id=ticket_id, category="hardware", urgency="medium",
+                                       expertise_level="tier1", reasoning="Printer issue"))
+        db.session.add(Diagnostics(ticket_id=ticket_id, diagnosis="Driver crashed",
+                                   potential_causes=["driver"], recommended_tests=["reinstall"]))
+        db.session.add(Solutions(ticket_id=ticket_id, solution="Reinstall driver",
+                                 tools_needed=[], estimated_time="10 minutes", confidence="high"))
+        db.session.add(TicketAssignments(ticket_id=ticket_id, user_id=primary_id, role="primary"))
+        db.session.add(TicketAssignments(ticket_id=ticket_id, user_id=secondary_id,
+                                         role="secondary"))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def count_listing_queries():
+    """Load the listing and touch every field the endpoint serializes."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        tickets = Ticket.with_details().order_by(Ticket.created_at.desc()).all()
+        for ticket in tickets:
+            assert ticket.classification.category == "hardware"
+            assert ticket.diagnostic.diagnosis
+            assert ticket.solution.solution
+            assert [a.user.name for a in ticket.assignments] == ["Primary", "Secondary"]
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_with_details_listing_uses_constant_queries(app):
+    """Test that listing cost does not grow with the number of tickets."""
+    users = seed_users()
+    seed_tickets(3, users)
+    small = count_listing_queries()
+
+    seed_tickets(40, users, prefix="TKT-X")
+
+    large = count_listing_queries()
+    assert large == small
+    assert large <= 2
+
+
+def test_with_details_handles_unprocessed_ticket(app):
+    """Test that tickets without pipeline output load with empty relations."""
+    db.session.add(Ticket(id="TKT-EMPTY000", user_email="user@company.com",
+                          subject="Pending", description="Not processed yet"))
+    db.session.commit()
+
+    ticket = Ticket.with_details().filter(Ticket.id == "TKT-EMPTY000").first()
+    assert ticket.classification is None
+    assert ticket.solution is None
+    assert ticket.assignments == []